@@ -0,0 +1,44 @@
+import threading
+from django.apps import AppConfig
+from django.conf import settings
+
+_warm_start_lock = threading.Lock()
+_warm_start_thread = None
+
+
+class A2SLConfig(AppConfig):
+    name = 'A2SL'
+    verbose_name = 'Audio Speech To Sign Language'
+
+    def ready(self):
+        # Build the clip index once at startup so requests never probe the filesystem
+        from .clip_index import get_clip_index
+        index = get_clip_index()
+        index.start_watcher(getattr(settings, 'CLIP_INDEX_REFRESH_INTERVAL', 0))
+
+
+def warm_start_in_background():
+    """
+    Load the Whisper model (or start the worker pool) on a background thread
+    when WHISPER_WARM_START is set.
+
+    Called from the WSGI and ASGI entry points rather than ready(), so only
+    processes that serve requests pay for the model: runserver's child (not
+    its autoreloader), daphne, gunicorn and uvicorn, but never migrate,
+    collectstatic or other management commands.
+    """
+    global _warm_start_thread
+    if not getattr(settings, 'WHISPER_WARM_START', False):
+        return
+    with _warm_start_lock:
+        if _warm_start_thread is not None:
+            return
+        if getattr(settings, 'TRANSCRIBE_WORKERS', 0):
+            # The pool's forkserver loads the model once; each worker warms itself up
+            from .worker_pool import get_pool
+            target = get_pool
+        else:
+            from .transcribe import warm_start
+            target = warm_start
+        _warm_start_thread = threading.Thread(target=target, name='whisper-warm-start', daemon=True)
+        _warm_start_thread.start()
@@ -2,6 +2,8 @@
 ASGI config for A2SL project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django; WebSocket connections are routed through Channels
+(see A2SL/routing.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
@@ -13,4 +15,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SL.settings')
 
-application = get_asgi_application()
+# Initialize Django before importing anything that touches models or settings
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
+from .routing import websocket_urlpatterns
+from .apps import warm_start_in_background
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    # Only accept WebSocket connections from pages served by an allowed host
+    'websocket': AllowedHostsOriginValidator(URLRouter(websocket_urlpatterns)),
+})
+
+# Only processes that serve requests load the model (see A2SL.apps)
+warm_start_in_background()
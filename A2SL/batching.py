@@ -0,0 +1,154 @@
+import time
+import queue
+import threading
+import logging
+from collections import Counter
+from concurrent.futures import Future
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Whisper's own thresholds for treating a window as silence
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+# Samples in one 30 second Whisper window (whisper.audio.N_SAMPLES)
+WINDOW_SAMPLES = 30 * 16000
+
+
+class _Request:
+    __slots__ = ('samples', 'future', 'enqueued_at')
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchScheduler:
+    """
+    Micro-batching front end for the shared Whisper model.
+
+    Requests that arrive within ``max_wait_ms`` of the first queued request
+    (up to ``max_batch_size`` of them) are decoded together in one batched
+    mel + encoder/decoder pass. Each clip must fit in a single 30 second
+    Whisper window.
+    """
+
+    def __init__(self, get_model, max_batch_size=8, max_wait_ms=30):
+        self._get_model = get_model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._requests = 0
+        self._total_wait = 0.0
+        self._max_wait_seen = 0.0
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='whisper-batcher', daemon=True)
+                    self._thread.start()
+
+    def submit(self, samples):
+        """
+        Queue a clip for transcription.
+
+        Args:
+            samples (numpy.ndarray): 16 kHz mono float32 audio, at most 30 seconds
+
+        Returns:
+            concurrent.futures.Future: Resolves to the transcribed text
+        """
+        if len(samples) > WINDOW_SAMPLES:
+            raise ValueError("Audio longer than one Whisper window cannot be batched")
+        self._ensure_started()
+        request = _Request(samples)
+        self._queue.put(request)
+        return request.future
+
+    def transcribe(self, samples, timeout=None):
+        """Transcribe a clip through the scheduler and wait for the text."""
+        return self.submit(samples).result(timeout=timeout)
+
+    def _collect(self):
+        """Block for the first request, then gather more until the batch is full or the window closes."""
+        batch = [self._queue.get()]
+        deadline = batch[0].enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Past the deadline (requests that queued up while the model
+                # was busy), still take whatever is already waiting
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            self._record(batch, started)
+            try:
+                texts = self._decode([request.samples for request in batch])
+            except Exception as e:
+                logger.error(f"Batched transcription failed: {str(e)}", exc_info=True)
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            for request, text in zip(batch, texts):
+                request.future.set_result(text)
+            logger.info(f"Decoded batch of {len(batch)} in {time.perf_counter() - started:.3f}s")
+
+    def _decode(self, clips):
+        """Run one batched decode over the clips and return their texts."""
+        import torch
+        import whisper
+
+        model = self._get_model()
+        n_mels = model.dims.n_mels
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(clip)), n_mels=n_mels)
+            for clip in clips
+        ]).to(model.device)
+        options = whisper.DecodingOptions(language="en", fp16=False, without_timestamps=True)
+        results = whisper.decode(model, mels, options)
+
+        texts = []
+        for result in results:
+            if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+                texts.append('')
+            else:
+                texts.append(result.text.strip())
+        return texts
+
+    def _record(self, batch, started):
+        with self._stats_lock:
+            self._batch_sizes[len(batch)] += 1
+            self._requests += len(batch)
+            for request in batch:
+                wait = started - request.enqueued_at
+                self._total_wait += wait
+                self._max_wait_seen = max(self._max_wait_seen, wait)
+
+    def stats(self):
+        """Return batch size and queue wait metrics."""
+        with self._stats_lock:
+            batches = sum(self._batch_sizes.values())
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0,
+                'batches': batches,
+                'requests': self._requests,
+                'queued': self._queue.qsize(),
+                'avg_batch_size': self._requests / batches if batches else 0.0,
+                'batch_size_histogram': dict(sorted(self._batch_sizes.items())),
+                'avg_queue_wait_ms': 1000.0 * self._total_wait / self._requests if self._requests else 0.0,
+                'max_queue_wait_ms': 1000.0 * self._max_wait_seen,
+            }
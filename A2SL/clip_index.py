@@ -0,0 +1,216 @@
+import os
+import time
+import threading
+import logging
+from collections import namedtuple
+from .clip_store import ClipStore, CLIP_STORE_DIRECTORY, CLIP_STORE_URL, MANIFEST_NAME, fingerprint
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Directories (relative to the project base directory) that hold sign clips,
+# in lookup priority order.
+CLIP_DIRECTORIES = ('assets', 'static')
+
+CLIP_EXTENSION = '.mp4'
+
+# Loose clips are served as /clip/<directory>/<fingerprint>/<file name>; the
+# fingerprint changes with the content, so responses can be cached forever
+CLIP_URL = '/clip/'
+FINGERPRINT_LENGTH = 16
+
+
+def fingerprinted_url(root, path):
+    """Return the content-fingerprinted URL of a file under a served root."""
+    return f"{CLIP_URL}{root}/{fingerprint(path)[:FINGERPRINT_LENGTH]}/{os.path.basename(path)}"
+
+# A sign clip on disk. ``name`` is the file name without extension exactly as
+# it is stored (e.g. "Hello" or "HELLO"), ``url`` is the URL it is served from.
+Clip = namedtuple('Clip', ['name', 'directory', 'path', 'url'])
+
+
+def normalize_key(word):
+    """Return the case-insensitive lookup key for a word or clip name."""
+    return ' '.join(word.split()).lower()
+
+
+def _case_rank(name):
+    """Rank clip names the way the old per-word probing did: title case first, then upper case."""
+    if name == name.title():
+        return 0
+    if name == name.upper():
+        return 1
+    return 2
+
+
+class ClipIndex:
+    """
+    In-memory, case-insensitive map from words to sign clips.
+
+    The index is built once from the content-addressed clip store (when one
+    has been imported) and the clip directories, and replaced atomically on
+    refresh, so lookups never touch the filesystem. Store entries take
+    priority, so aliases of one clip share a single URL.
+    """
+
+    def __init__(self, base_dir, directories=CLIP_DIRECTORIES, store_directory=CLIP_STORE_DIRECTORY):
+        self.base_dir = str(base_dir)
+        self.directories = tuple(directories)
+        self.store_root = os.path.join(self.base_dir, store_directory) if store_directory else None
+        self._clips = {}
+        self._signature = None
+        self._refresh_lock = threading.Lock()
+        self._watcher = None
+        self.version = 0
+        self.refresh()
+
+    def _directory_signature(self):
+        """Modification times of the clip directories; changes when clips are added or removed."""
+        paths = [os.path.join(self.base_dir, directory) for directory in self.directories]
+        if self.store_root:
+            paths.append(os.path.join(self.store_root, MANIFEST_NAME))
+        signature = []
+        for path in paths:
+            try:
+                signature.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _scan(self):
+        """Scan the clip directories and build a fresh lookup table."""
+        candidates = {}
+        if self.store_root:
+            store = ClipStore(self.store_root)
+            for name, digest in store.names.items():
+                clip = Clip(
+                    name=name,
+                    directory=CLIP_STORE_DIRECTORY,
+                    path=store.object_path(digest),
+                    url=f"{CLIP_STORE_URL}{digest}.mp4",
+                )
+                # Store entries win over loose files of the same name
+                rank = (-1, _case_rank(name))
+                key = normalize_key(name)
+                current = candidates.get(key)
+                if current is None or rank < current[0]:
+                    candidates[key] = (rank, clip)
+        for dir_rank, directory in enumerate(self.directories):
+            full_dir = os.path.join(self.base_dir, directory)
+            try:
+                entries = list(os.scandir(full_dir))
+            except OSError as e:
+                logger.warning(f"Clip directory not available: {full_dir} ({e})")
+                continue
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                if ext.lower() != CLIP_EXTENSION or not entry.is_file():
+                    continue
+                rank = (_case_rank(stem), dir_rank)
+                key = normalize_key(stem)
+                current = candidates.get(key)
+                if current is None or rank < current[0]:
+                    clip = Clip(
+                        name=stem,
+                        directory=directory,
+                        path=entry.path,
+                        url=fingerprinted_url(directory, entry.path),
+                    )
+                    candidates[key] = (rank, clip)
+        return {key: clip for key, (rank, clip) in candidates.items()}
+
+    def refresh(self, force=True):
+        """
+        Rebuild the index from disk.
+
+        Args:
+            force (bool): Rebuild even if the clip directories look unchanged
+
+        Returns:
+            bool: True if the index was rebuilt
+        """
+        with self._refresh_lock:
+            signature = self._directory_signature()
+            if not force and signature == self._signature:
+                return False
+            clips = self._scan()
+            # Swap in the new table with a single assignment so readers always
+            # see either the old or the new index, never a partial one.
+            self._clips = clips
+            self._signature = signature
+            self.version += 1
+        logger.info(f"Clip index built with {len(clips)} clips (version {self.version})")
+        return True
+
+    def lookup(self, word):
+        """
+        Find the clip for a word, ignoring case.
+
+        Args:
+            word (str): Word or phrase to look up
+
+        Returns:
+            Clip or None: The matching clip, if any
+        """
+        return self._clips.get(normalize_key(word))
+
+    def __contains__(self, word):
+        return normalize_key(word) in self._clips
+
+    def __len__(self):
+        return len(self._clips)
+
+    def clips(self):
+        """Return all indexed clips."""
+        return list(self._clips.values())
+
+    def start_watcher(self, interval):
+        """
+        Start a daemon thread that refreshes the index when clips are added.
+
+        Args:
+            interval (float): Seconds between directory checks
+        """
+        if self._watcher is not None or not interval or interval <= 0:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh(force=False)
+                except Exception as e:
+                    logger.error(f"Error refreshing clip index: {str(e)}")
+
+        self._watcher = threading.Thread(target=watch, name='clip-index-watcher', daemon=True)
+        self._watcher.start()
+
+
+# One index per base directory, built on first use
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_clip_index(base_dir=None):
+    """
+    Return the shared clip index, building it on first use.
+
+    Args:
+        base_dir (str): Project base directory; defaults to settings.BASE_DIR
+
+    Returns:
+        ClipIndex: The clip index for that directory
+    """
+    if base_dir is None:
+        from django.conf import settings
+        base_dir = settings.BASE_DIR
+    key = os.path.abspath(str(base_dir))
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = ClipIndex(key)
+                _indexes[key] = index
+    return index
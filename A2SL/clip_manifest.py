@@ -0,0 +1,80 @@
+import os
+import json
+import hashlib
+import threading
+import logging
+from .clip_index import get_clip_index
+from .clip_store import fingerprint
+from .mp4 import read_metadata
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ClipManifest:
+    """
+    Metadata for every clip in the index, with compact integer IDs.
+
+    IDs are positions in the manifest's clip list and are only meaningful
+    together with the manifest ``version`` they came from.
+    """
+
+    def __init__(self, clips):
+        entries = []
+        for clip in sorted(clips, key=lambda clip: clip.name):
+            try:
+                metadata = read_metadata(clip.path)
+                entries.append({
+                    'id': len(entries),
+                    'name': clip.name,
+                    'url': clip.url,
+                    'duration': round(metadata['duration'], 3),
+                    'width': metadata['width'],
+                    'height': metadata['height'],
+                    'bytes': os.path.getsize(clip.path),
+                    'hash': fingerprint(clip.path),
+                })
+            except (OSError, ValueError) as e:
+                logger.warning(f"Leaving {clip.path} out of the clip manifest: {str(e)}")
+        body = json.dumps(entries, separators=(',', ':'), sort_keys=True)
+        self.version = hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]
+        self.entries = entries
+        self.by_url = {entry['url']: entry for entry in entries}
+        self.content = json.dumps({'version': self.version, 'clips': entries}, separators=(',', ':')).encode('utf-8')
+
+    def compact(self, urls):
+        """
+        Replace clip URLs with (id, duration) pairs.
+
+        Args:
+            urls (list): Clip URLs, '' where a word has no clip
+
+        Returns:
+            tuple: (ids, durations), with None for URLs not in the manifest
+        """
+        entries = [self.by_url.get(url) for url in urls]
+        return (
+            [entry['id'] if entry else None for entry in entries],
+            [entry['duration'] if entry else None for entry in entries],
+        )
+
+
+# Manifest for the current clip index version, rebuilt when clips change
+_manifest = None
+_manifest_index_version = None
+_manifest_lock = threading.Lock()
+
+
+def get_clip_manifest():
+    """Return the manifest for the shared clip index, building it if clips changed."""
+    global _manifest, _manifest_index_version
+    index = get_clip_index()
+    if _manifest is None or _manifest_index_version != index.version:
+        with _manifest_lock:
+            if _manifest is None or _manifest_index_version != index.version:
+                version = index.version
+                _manifest = ClipManifest(index.clips())
+                _manifest_index_version = version
+                logger.info(f"Built clip manifest {_manifest.version} with {len(_manifest.entries)} clips")
+    return _manifest
@@ -0,0 +1,194 @@
+import os
+import re
+import mimetypes
+import logging
+from django.conf import settings
+from django.http import HttpResponse, FileResponse, StreamingHttpResponse
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache-Control for URLs whose content can never change
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    Parse a single byte range.
+
+    Args:
+        header (str): Range header value, e.g. "bytes=0-1023"
+        size (int): File size
+
+    Returns:
+        tuple: (start, end) inclusive, None to serve the whole file (no,
+            multiple or malformed ranges) or False if the range can't be
+            satisfied
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    start, end = match.groups()
+    if start == '':
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _etag_matches(header, etag):
+    """True if an If-None-Match header matches ``etag``."""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = [tag.strip() for tag in header.split(',')]
+    return etag in [tag[2:] if tag.startswith('W/') else tag for tag in candidates]
+
+
+def _read_range(f, start, length):
+    """Yield ``length`` bytes of an open file from ``start``, closing it when done."""
+    with f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _sendfile_response(path):
+    """Hand the file off to the front-end server, or return None if offloading is off."""
+    header = getattr(settings, 'CLIP_SENDFILE_HEADER', None)
+    if not header:
+        return None
+    response = HttpResponse()
+    if header == 'X-Accel-Redirect':
+        # nginx wants an internal URI, mapped onto the project directory
+        relative = os.path.relpath(path, settings.BASE_DIR).replace(os.sep, '/')
+        response[header] = settings.CLIP_SENDFILE_PREFIX.rstrip('/') + '/' + relative
+    else:
+        response[header] = path
+    return response
+
+
+def serve_content(request, content, content_type, etag, cache_control):
+    """
+    Serve an in-memory document with a strong ETag, answering 304 when the client has it.
+
+    Args:
+        request (HttpRequest): The request
+        content (bytes): Response body
+        content_type (str): MIME type
+        etag (str): Strong validator for ``content`` (unquoted)
+        cache_control (str): Cache-Control header value
+    """
+    etag = f'"{etag}"'
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(content, content_type=content_type)
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def serve_file(request, path, etag, cache_control=IMMUTABLE, file=None):
+    """
+    Serve a file with conditional GET and byte-range support.
+
+    Args:
+        request (HttpRequest): The request
+        path (str): File to serve
+        etag (str): Strong validator for the file's content (unquoted)
+        cache_control (str): Cache-Control header value
+        file (file): ``path`` already opened in binary mode, for files that
+            may be deleted at any time (e.g. by cache eviction). It is served
+            directly, never offloaded, and always closed.
+
+    Returns:
+        HttpResponse: 200, 206, 304, 404 or 416
+    """
+    try:
+        return _serve_file(request, path, etag, cache_control, file)
+    except BaseException:
+        if file is not None:
+            file.close()
+        raise
+
+
+def _serve_file(request, path, etag, cache_control, file):
+    if request.method not in ('GET', 'HEAD'):
+        if file is not None:
+            file.close()
+        response = HttpResponse(status=405)
+        response['Allow'] = 'GET, HEAD'
+        return response
+
+    etag = f'"{etag}"'
+    headers = {
+        'ETag': etag,
+        'Cache-Control': cache_control,
+        'Accept-Ranges': 'bytes',
+    }
+
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        if file is not None:
+            file.close()
+        response = HttpResponse(status=304)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+    response = _sendfile_response(path) if file is None else None
+    if response is not None:
+        # The front-end server handles ranges itself
+        response['Content-Type'] = content_type
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    if file is None:
+        try:
+            file = open(path, 'rb')
+        except OSError:
+            return HttpResponse(status=404)
+    size = os.fstat(file.fileno()).st_size
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    # A stale If-Range means the client's partial copy is outdated: send it all
+    if not if_range or if_range.strip() == etag:
+        byte_range = parse_range(request.headers.get('Range'), size)
+
+    if byte_range is False:
+        file.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(file, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    for name, value in headers.items():
+        response[name] = value
+    return response
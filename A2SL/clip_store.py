@@ -0,0 +1,195 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+import logging
+from collections import defaultdict
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Store location relative to the project base directory
+CLIP_STORE_DIRECTORY = 'clip_store'
+# URL prefix the stored objects are served under
+CLIP_STORE_URL = '/clips/'
+
+MANIFEST_NAME = 'manifest.json'
+OBJECTS_DIRECTORY = 'objects'
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Return the sha256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Content hashes of files, keyed by (path, size, mtime) so unchanged files are hashed once
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+def fingerprint(path):
+    """
+    Return the sha256 of a file's contents, cached until the file changes.
+
+    Args:
+        path (str): File to fingerprint
+
+    Returns:
+        str: Hex digest
+    """
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _fingerprints.get(key)
+    if digest is None:
+        digest = hash_file(path)
+        with _fingerprints_lock:
+            # Forget older versions of the same file
+            for stale in [k for k in _fingerprints if k[0] == path]:
+                del _fingerprints[stale]
+            _fingerprints[key] = digest
+    return digest
+
+
+class ClipStore:
+    """
+    Content-addressed storage for sign clips.
+
+    Every unique clip is stored once as ``objects/<sha256>.mp4``; a manifest
+    maps clip names (including aliases) to content hashes, so any number of
+    names can share one file.
+    """
+
+    def __init__(self, root):
+        self.root = str(root)
+        self.objects_dir = os.path.join(self.root, OBJECTS_DIRECTORY)
+        self.manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self.names = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return dict(json.load(f)['clips'])
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable clip store manifest {self.manifest_path}: {str(e)}")
+            return {}
+
+    def exists(self):
+        """True if the store has a manifest on disk."""
+        return os.path.exists(self.manifest_path)
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, f"{digest}.mp4")
+
+    def path_for(self, name):
+        """Return the object path for a clip name, or None."""
+        digest = self.names.get(name)
+        return self.object_path(digest) if digest else None
+
+    def add_file(self, path, name):
+        """
+        Store a clip file under ``name``, keeping a single copy per unique content.
+
+        Args:
+            path (str): Clip file to import
+            name (str): Clip name, e.g. "Hello"
+
+        Returns:
+            tuple: (content hash, True if a new object was written)
+        """
+        digest = hash_file(path)
+        object_path = self.object_path(digest)
+        created = False
+        if not os.path.exists(object_path):
+            os.makedirs(self.objects_dir, exist_ok=True)
+            temp_path = f"{object_path}.{os.getpid()}.tmp"
+            shutil.copyfile(path, temp_path)
+            os.replace(temp_path, object_path)
+            created = True
+        with self._lock:
+            self.names[name] = digest
+        return digest, created
+
+    def alias(self, source, name):
+        """
+        Point ``name`` at the same content as ``source`` without copying anything.
+
+        Raises:
+            KeyError: If ``source`` is not in the store
+        """
+        with self._lock:
+            self.names[name] = self.names[source]
+
+    def save(self):
+        """Write the manifest atomically."""
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock:
+            data = {'clips': dict(sorted(self.names.items()))}
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def unreferenced_objects(self):
+        """Return object paths no name points at any more."""
+        referenced = set(self.names.values())
+        try:
+            entries = list(os.scandir(self.objects_dir))
+        except OSError:
+            return []
+        return [entry.path for entry in entries
+                if entry.name.endswith('.mp4') and entry.name[:-4] not in referenced]
+
+
+def audit_directories(directories):
+    """
+    Find byte-identical clips across directories.
+
+    Args:
+        directories (list): Directories to scan for .mp4 files
+
+    Returns:
+        dict: 'files', 'total_bytes', 'unique_files', 'unique_bytes',
+            'duplicate_bytes' and 'groups' (each with the 'hash', 'size' and
+            'paths' of files sharing one content, largest waste first)
+    """
+    by_hash = defaultdict(list)
+    sizes = {}
+    total_bytes = 0
+    files = 0
+    for directory in directories:
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            logger.warning(f"Skipping {directory}: {e}")
+            continue
+        for entry in entries:
+            if not entry.name.lower().endswith('.mp4') or not entry.is_file():
+                continue
+            size = entry.stat().st_size
+            digest = hash_file(entry.path)
+            by_hash[digest].append(entry.path)
+            sizes[digest] = size
+            total_bytes += size
+            files += 1
+
+    unique_bytes = sum(sizes.values())
+    duplicated = [digest for digest, paths in by_hash.items() if len(paths) > 1]
+    duplicated.sort(key=lambda digest: sizes[digest] * (len(by_hash[digest]) - 1), reverse=True)
+    groups = [{'hash': digest, 'size': sizes[digest], 'paths': by_hash[digest]} for digest in duplicated]
+    return {
+        'files': files,
+        'total_bytes': total_bytes,
+        'unique_files': len(by_hash),
+        'unique_bytes': unique_bytes,
+        'duplicate_bytes': total_bytes - unique_bytes,
+        'groups': groups,
+    }
@@ -0,0 +1,116 @@
+import json
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+from .streaming import StreamingSession
+from .transcribe import transcribe_words
+from .worker_pool import get_pool, PoolSaturated
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Threads running streaming decodes, shared by all connections. In worker pool
+# mode they only wait on the pool; otherwise they run the model themselves.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the shared decode executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.STREAM_DECODE_THREADS,
+                    thread_name_prefix='stream-decode',
+                )
+    return _executor
+
+
+def decode_words(samples, initial_prompt):
+    """Transcribe a streaming window with word timestamps, on the worker pool when there is one."""
+    pool = get_pool()
+    if pool is not None:
+        return pool.transcribe(samples, timeout=settings.TRANSCRIBE_TIMEOUT, words=True, initial_prompt=initial_prompt)
+    return transcribe_words(samples, initial_prompt=initial_prompt, vad=True)
+
+
+class TranscriptionConsumer(AsyncWebsocketConsumer):
+    """
+    Streaming transcription over a WebSocket.
+
+    Clients send binary frames of 16 kHz mono int16 PCM and receive JSON
+    messages ``{words, videos, stable}`` as words are recognized. Sending the
+    text frame ``{"action": "flush"}`` finalizes any pending words.
+
+    Decodes run off the event loop, at most one per connection: audio that
+    arrives while a decode is running is merged into the next one rather
+    than queued as extra steps.
+    """
+
+    async def connect(self):
+        self.session = StreamingSession(
+            step_seconds=settings.STREAM_STEP_SECONDS,
+            max_window_seconds=settings.STREAM_MAX_WINDOW_SECONDS,
+            prompt_words=settings.STREAM_PROMPT_WORDS,
+            max_backlog_seconds=settings.STREAM_MAX_BACKLOG_SECONDS,
+        )
+        self.flush_requested = False
+        self.decoder = None
+        self.falling_behind = False
+        await self.accept()
+
+    async def disconnect(self, code):
+        if self.decoder is not None:
+            self.decoder.cancel()
+
+    async def receive(self, text_data=None, bytes_data=None):
+        if bytes_data:
+            if not self.session.add(bytes_data) and not self.falling_behind:
+                self.falling_behind = True
+                logger.warning(f"Streaming decode is falling behind; dropped {self.session.dropped_samples} samples so far")
+        elif text_data:
+            try:
+                action = json.loads(text_data).get('action')
+            except (json.JSONDecodeError, AttributeError):
+                await self.send(text_data=json.dumps({'error': 'Invalid JSON'}))
+                return
+            if action != 'flush':
+                await self.send(text_data=json.dumps({'error': 'Invalid action'}))
+                return
+            self.flush_requested = True
+        else:
+            return
+        if self.decoder is None or self.decoder.done():
+            self.decoder = asyncio.ensure_future(self.run_decodes())
+
+    async def run_decodes(self):
+        """Decode until no step (or flush) is waiting."""
+        loop = asyncio.get_running_loop()
+        while self.session.due() or self.flush_requested:
+            flush = self.flush_requested
+            self.flush_requested = False
+            if flush and len(self.session.window) == 0:
+                continue
+            samples, prompt, final = self.session.start_decode(final=flush)
+            try:
+                hypothesis = await loop.run_in_executor(get_executor(), decode_words, samples, prompt)
+                messages = self.session.finish_decode(samples, hypothesis, final)
+                self.falling_behind = False
+            except PoolSaturated:
+                # Its audio stays in the window, so the next step (or a
+                # retried flush) decodes it; try again when more audio arrives
+                self.flush_requested = self.flush_requested or flush
+                await self.send(text_data=json.dumps({'error': 'Server busy'}))
+                return
+            except Exception as e:
+                logger.error(f"Error in streaming transcription: {str(e)}", exc_info=True)
+                await self.send(text_data=json.dumps({'error': str(e)}))
+                continue
+            for message in messages:
+                await self.send(text_data=json.dumps(message))
@@ -0,0 +1,207 @@
+import os
+import sqlite3
+import threading
+import logging
+from .clip_index import normalize_key
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Where an entry came from, in priority order; an earlier source wins a conflict
+SOURCES = ('alias', 'inflection', 'synonym')
+
+VOWELS = 'aeiou'
+
+
+def _inflections(word):
+    """Regular English inflections of a word (some are not real words; callers validate)."""
+    forms = {word + 's'}
+    if word.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+        forms.add(word + 'es')
+    if word.endswith('y') and len(word) > 1 and word[-2] not in VOWELS:
+        forms.update((word[:-1] + 'ies', word[:-1] + 'ied'))
+    if word.endswith('e'):
+        forms.update((word + 'd', word + 'r', word + 'st'))
+        if not word.endswith('ee'):
+            forms.add(word[:-1] + 'ing')
+    else:
+        forms.update((word + 'ed', word + 'ing', word + 'er', word + 'est'))
+    # Consonant-vowel-consonant endings double the last letter (stop -> stopped)
+    if len(word) >= 3 and word[-1] not in VOWELS + 'wxy' and word[-2] in VOWELS and word[-3] not in VOWELS:
+        forms.update(word + word[-1] + suffix for suffix in ('ed', 'ing', 'er', 'est'))
+    forms.discard(word)
+    return forms
+
+
+def _load_wordnet():
+    """Return the WordNet corpus reader, or None if the corpus isn't installed."""
+    try:
+        from nltk.corpus import wordnet
+        wordnet.ensure_loaded()
+        return wordnet
+    except (ImportError, LookupError) as e:
+        logger.warning(f"WordNet not available, building aliases and regular inflections only: {str(e)}")
+        return None
+
+
+def _synonyms(wordnet, word):
+    """
+    Words that mean the same as ``word`` in its most common sense.
+
+    Only the first sense of the word's dominant part of speech counts, the
+    word must be the first lemma of that sense, and the sense must also be
+    the first one of each synonym. Rarer senses would sign unrelated words
+    with the clip (go -> turn, can -> tin, home -> place).
+    """
+    counts = {}
+    for synset in wordnet.synsets(word):
+        pos = 'a' if synset.pos() == 's' else synset.pos()
+        for lemma in synset.lemmas():
+            if lemma.name().lower() == word:
+                counts[pos] = counts.get(pos, 0) + lemma.count()
+    if not counts:
+        return []
+    # Without frequency data the part of speech WordNet lists first wins
+    pos = max(counts, key=counts.get)
+    sense = wordnet.synsets(word, pos)[0]
+    names = sense.lemma_names()
+    if names[0].lower() != word:
+        return []
+    return [name for name in names[1:] if wordnet.synsets(name, pos)[:1] == [sense]]
+
+
+def build_entries(clip_names, aliases, use_wordnet=True):
+    """
+    Compute surface form -> clip name entries.
+
+    Args:
+        clip_names (iterable): Names of the clips in the library
+        aliases (iterable): (clip name, alias) pairs
+        use_wordnet (bool): Add WordNet-validated inflections, irregular
+            forms and synonyms
+
+    Returns:
+        dict: Normalized surface form -> (clip name, source)
+    """
+    clips = {normalize_key(name): name for name in clip_names}
+    entries = {}
+
+    def add(surface, clip_key, source):
+        surface = normalize_key(surface)
+        # Words with their own clip never need the table
+        if surface in clips or clip_key not in clips or not surface.isalnum():
+            return
+        current = entries.get(surface)
+        if current is None or SOURCES.index(source) < SOURCES.index(current[1]):
+            entries[surface] = (clips[clip_key], source)
+
+    for clip_name, alias in aliases:
+        add(alias, normalize_key(clip_name), 'alias')
+    # Aliases are signed like their clip, so they inflect to it too
+    inflectable = dict((key, key) for key in clips)
+    inflectable.update((surface, normalize_key(name)) for surface, (name, _) in entries.items())
+
+    wordnet = _load_wordnet() if use_wordnet else None
+
+    # Unchecked suffixes turn short words into unrelated ones (a -> as, be -> bed)
+    min_length = 2 if wordnet is not None else 3
+    for word, clip_key in inflectable.items():
+        if len(word) < min_length or not word.isalpha():
+            continue
+        for form in _inflections(word):
+            if wordnet is None:
+                # Without a dictionary to check against, keep only the safest suffixes
+                if form.endswith(('s', 'ed', 'ing')):
+                    add(form, clip_key, 'inflection')
+            elif any(wordnet.morphy(form, pos) == word for pos in (wordnet.NOUN, wordnet.VERB, wordnet.ADJ)):
+                add(form, clip_key, 'inflection')
+
+    if wordnet is not None:
+        # Irregular forms (went -> go, better -> good) from WordNet's exception lists
+        for exceptions in getattr(wordnet, '_exception_map', {}).values():
+            for form, lemmas in exceptions.items():
+                for lemma in lemmas:
+                    if lemma in inflectable:
+                        add(form, inflectable[lemma], 'inflection')
+                        break
+
+        for word in clips:
+            if len(word) < 3 or not word.isalpha():
+                continue
+            for synonym in _synonyms(wordnet, word):
+                add(synonym, word, 'synonym')
+
+    return entries
+
+
+def write_lexicon(path, entries):
+    """Write entries from build_entries to a SQLite file, replacing it atomically."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.execute('CREATE TABLE lexicon (surface TEXT PRIMARY KEY, clip TEXT NOT NULL, source TEXT NOT NULL) WITHOUT ROWID')
+        connection.executemany(
+            'INSERT INTO lexicon (surface, clip, source) VALUES (?, ?, ?)',
+            sorted((surface, clip, source) for surface, (clip, source) in entries.items()),
+        )
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(temp_path, path)
+
+
+class SignLexicon:
+    """In-memory surface form -> clip name table, loaded from the built SQLite file."""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    @classmethod
+    def load(cls, path):
+        """Load the table from ``path``; None if it hasn't been built."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                rows = connection.execute('SELECT surface, clip FROM lexicon').fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Ignoring unreadable sign lexicon {path}: {str(e)}")
+            return None
+        return cls(dict(rows))
+
+    def get(self, token):
+        """Return the clip name to sign ``token`` with, or None."""
+        return self.entries.get(token)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# Shared lexicon, loaded on first use
+_lexicon = None
+_lexicon_loaded = False
+_lexicon_lock = threading.Lock()
+
+
+def get_lexicon():
+    """Return the sign lexicon configured in settings, or None if it hasn't been built."""
+    global _lexicon, _lexicon_loaded
+    if not _lexicon_loaded:
+        with _lexicon_lock:
+            if not _lexicon_loaded:
+                try:
+                    from django.conf import settings
+                    path = settings.SIGN_LEXICON_PATH
+                except Exception:
+                    path = None
+                _lexicon = SignLexicon.load(path)
+                _lexicon_loaded = True
+                if _lexicon is not None:
+                    logger.info(f"Loaded sign lexicon with {len(_lexicon)} entries")
+    return _lexicon
@@ -0,0 +1,31 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from A2SL.clip_index import CLIP_DIRECTORIES
+from A2SL.clip_store import CLIP_STORE_DIRECTORY, OBJECTS_DIRECTORY, audit_directories
+
+
+class Command(BaseCommand):
+    help = 'Report byte-identical clips across assets/, static/ and the clip store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help='Number of duplicate groups to list')
+
+    def handle(self, *args, **options):
+        base_dir = str(settings.BASE_DIR)
+        directories = [os.path.join(base_dir, directory) for directory in CLIP_DIRECTORIES]
+        objects_dir = os.path.join(base_dir, CLIP_STORE_DIRECTORY, OBJECTS_DIRECTORY)
+        if os.path.isdir(objects_dir):
+            directories.append(objects_dir)
+
+        report = audit_directories(directories)
+        self.stdout.write(
+            f"{report['files']} clip files, {report['total_bytes'] / 1e6:.1f} MB; "
+            f"{report['unique_files']} unique, {report['unique_bytes'] / 1e6:.1f} MB"
+        )
+        self.stdout.write(f"Duplicate bytes: {report['duplicate_bytes'] / 1e6:.1f} MB")
+
+        for group in report['groups'][:options['limit']]:
+            names = ', '.join(os.path.relpath(path, base_dir) for path in group['paths'])
+            wasted = group['size'] * (len(group['paths']) - 1)
+            self.stdout.write(f"  {len(group['paths'])} copies, {wasted / 1e6:.2f} MB wasted: {names}")
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from A2SL.clip_index import get_clip_index
+from A2SL.sprite import build_sprite
+
+
+class Command(BaseCommand):
+    help = 'Concatenate the letter and digit clips into one fingerspelling sprite with an offset table'
+
+    def handle(self, *args, **options):
+        index = get_clip_index()
+        try:
+            table = build_sprite(index, settings.FINGERSPELL_SPRITE_DIR)
+        except (OSError, RuntimeError, ValueError) as e:
+            raise CommandError(f"Could not build sprite: {str(e)}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {table['url']} with {len(table['segments'])} characters ({table['duration']}s). "
+            "Restart the server to start using it."
+        ))
@@ -0,0 +1,29 @@
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from A2SL.clip_index import get_clip_index
+from A2SL.lexicon import build_entries, write_lexicon
+from A2SL.sign_aliases import ALIASES
+
+
+class Command(BaseCommand):
+    help = 'Build the surface form -> clip lookup table from the alias list and WordNet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-wordnet', action='store_true', help='Only use the alias list and regular inflections')
+
+    def handle(self, *args, **options):
+        index = get_clip_index()
+        entries = build_entries(
+            (clip.name for clip in index.clips()),
+            ALIASES,
+            use_wordnet=not options['no_wordnet'],
+        )
+        write_lexicon(settings.SIGN_LEXICON_PATH, entries)
+
+        counts = Counter(source for _, source in entries.values())
+        summary = ', '.join(f"{count} {source}" for source, count in sorted(counts.items()))
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(entries)} entries to {settings.SIGN_LEXICON_PATH} ({summary}). "
+            "Restart the server to start using them."
+        ))
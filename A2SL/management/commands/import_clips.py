@@ -0,0 +1,63 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from A2SL.clip_index import ClipIndex
+from A2SL.clip_store import ClipStore, CLIP_STORE_DIRECTORY, hash_file
+
+
+class Command(BaseCommand):
+    help = 'Import the clips in assets/ and static/ into the content-addressed clip store'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--remove-originals', action='store_true',
+            help='Delete the loose .mp4 files once their content is safely in the store',
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='Delete stored objects that no clip name refers to',
+        )
+
+    def handle(self, *args, **options):
+        base_dir = str(settings.BASE_DIR)
+        store = ClipStore(os.path.join(base_dir, CLIP_STORE_DIRECTORY))
+
+        # Index the loose files on their own so name collisions resolve exactly
+        # as they do at request time
+        index = ClipIndex(base_dir, store_directory=None)
+
+        created = 0
+        stored_bytes = 0
+        imported_bytes = 0
+        for clip in sorted(index.clips(), key=lambda clip: clip.name):
+            digest, is_new = store.add_file(clip.path, clip.name)
+            size = os.path.getsize(clip.path)
+            imported_bytes += size
+            if is_new:
+                created += 1
+                stored_bytes += size
+        store.save()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {len(index)} clip names as {created} new objects "
+            f"({stored_bytes / 1e6:.1f} MB stored for {imported_bytes / 1e6:.1f} MB of clips)"
+        ))
+
+        if options['remove_originals']:
+            stored = set(store.names.values())
+            removed = 0
+            for directory in index.directories:
+                full_dir = os.path.join(base_dir, directory)
+                for entry in list(os.scandir(full_dir)):
+                    if not entry.name.lower().endswith('.mp4') or not entry.is_file():
+                        continue
+                    # Only delete files whose exact content is in the store
+                    if hash_file(entry.path) in stored:
+                        os.remove(entry.path)
+                        removed += 1
+            self.stdout.write(f"Removed {removed} loose clip files")
+
+        if options['prune']:
+            unreferenced = store.unreferenced_objects()
+            for path in unreferenced:
+                os.remove(path)
+            self.stdout.write(f"Pruned {len(unreferenced)} unreferenced objects")
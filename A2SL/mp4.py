@@ -0,0 +1,186 @@
+import struct
+from collections import namedtuple
+
+# Boxes that only hold other boxes; everything else is skipped over
+CONTAINER_BOXES = {b'moov', b'trak', b'mdia', b'minf', b'stbl', b'edts', b'udta'}
+
+# What must match for clips to be joined without re-encoding: sample entry
+# type (e.g. avc1), coded size, media timescale and the decoder configuration
+# (for H.264 the avcC box: profile, level, SPS and PPS). ``profile`` and
+# ``level`` are None for codecs other than H.264.
+VideoFormat = namedtuple('VideoFormat', ['codec', 'width', 'height', 'timescale', 'profile', 'level', 'config'])
+
+
+def iter_boxes(f, start, end):
+    """
+    Yield (type, payload offset, payload size) for the boxes between two offsets.
+
+    Args:
+        f (file): MP4 file opened in binary mode
+        start (int): Offset of the first box
+        end (int): Offset where the enclosing box (or the file) ends
+    """
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        size, box_type = struct.unpack('>I4s', f.read(8))
+        header = 8
+        if size == 1:
+            # 64-bit size follows the type
+            size = struct.unpack('>Q', f.read(8))[0]
+            header = 16
+        elif size == 0:
+            # Box runs to the end of the file
+            size = end - offset
+        if size < header:
+            raise ValueError(f"Corrupt MP4 box at offset {offset}")
+        yield box_type, offset + header, size - header
+        offset += size
+
+
+def find_box(f, path, start=0, end=None):
+    """
+    Find a nested box, e.g. ``(b'moov', b'mvhd')``.
+
+    Returns:
+        tuple: (payload offset, payload size), or None if the box is missing
+    """
+    if end is None:
+        f.seek(0, 2)
+        end = f.tell()
+    for box_type, offset, size in iter_boxes(f, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return offset, size
+            if box_type in CONTAINER_BOXES:
+                return find_box(f, path[1:], offset, offset + size)
+    return None
+
+
+def read_duration(path):
+    """
+    Read the duration of an MP4 file from its movie header, without decoding.
+
+    Args:
+        path (str): Path to the MP4 file
+
+    Returns:
+        float: Duration in seconds
+    """
+    with open(path, 'rb') as f:
+        box = find_box(f, (b'moov', b'mvhd'))
+        if box is None:
+            raise ValueError(f"No movie header in {path}")
+        f.seek(box[0])
+        version = f.read(1)[0]
+        if version == 1:
+            # flags, creation and modification times are 3 + 8 + 8 bytes
+            f.seek(box[0] + 20)
+            timescale, duration = struct.unpack('>IQ', f.read(12))
+        else:
+            f.seek(box[0] + 12)
+            timescale, duration = struct.unpack('>II', f.read(8))
+    if not timescale:
+        raise ValueError(f"Invalid timescale in {path}")
+    return duration / timescale
+
+
+def _read_track_size(f, offset, size):
+    """Width and height from a track header (16.16 fixed point), or None for non-visual tracks."""
+    box = find_box(f, (b'tkhd',), offset, offset + size)
+    if box is None:
+        return None
+    f.seek(box[0])
+    version = f.read(1)[0]
+    # Width and height are the last 8 bytes of the track header
+    f.seek(box[0] + (88 if version == 1 else 76))
+    width, height = struct.unpack('>II', f.read(8))
+    if not width or not height:
+        return None
+    return width >> 16, height >> 16
+
+
+def read_metadata(path):
+    """
+    Read duration and video dimensions of an MP4 from its header boxes.
+
+    Args:
+        path (str): Path to the MP4 file
+
+    Returns:
+        dict: 'duration' (seconds), 'width' and 'height' (pixels, None if the
+            file has no video track)
+    """
+    width = height = None
+    with open(path, 'rb') as f:
+        moov = find_box(f, (b'moov',))
+        if moov is not None:
+            for box_type, offset, size in iter_boxes(f, moov[0], moov[0] + moov[1]):
+                if box_type == b'trak':
+                    dimensions = _read_track_size(f, offset, size)
+                    if dimensions:
+                        width, height = dimensions
+                        break
+    return {'duration': read_duration(path), 'width': width, 'height': height}
+
+
+def _read_video_format(f, offset, size):
+    """VideoFormat of a track, or None if it isn't a video track."""
+    handler = find_box(f, (b'mdia', b'hdlr'), offset, offset + size)
+    if handler is None:
+        return None
+    # version/flags and pre_defined come before the handler type
+    f.seek(handler[0] + 8)
+    if f.read(4) != b'vide':
+        return None
+
+    mdhd = find_box(f, (b'mdia', b'mdhd'), offset, offset + size)
+    f.seek(mdhd[0])
+    version = f.read(1)[0]
+    f.seek(mdhd[0] + (20 if version == 1 else 12))
+    timescale = struct.unpack('>I', f.read(4))[0]
+
+    stsd = find_box(f, (b'mdia', b'minf', b'stbl', b'stsd'), offset, offset + size)
+    # version/flags and entry count, then the first sample entry box
+    entry_offset = stsd[0] + 8
+    f.seek(entry_offset)
+    entry_size, codec = struct.unpack('>I4s', f.read(8))
+    # Visual sample entry: 16 reserved/pre_defined bytes follow the data reference index
+    f.seek(entry_offset + 8 + 24)
+    width, height = struct.unpack('>HH', f.read(4))
+    profile = level = None
+    config = b''
+    # Codec configuration boxes follow the 78 bytes of visual sample entry fields
+    children = entry_offset + 8 + 78
+    for box_type, box_offset, box_size in iter_boxes(f, children, entry_offset + entry_size):
+        if box_type in (b'avcC', b'hvcC', b'vpcC', b'av1C', b'esds'):
+            f.seek(box_offset)
+            config = f.read(box_size)
+            if box_type == b'avcC':
+                profile, level = config[1], config[3]
+            break
+    return VideoFormat(codec.decode('latin-1'), width, height, timescale, profile, level, config)
+
+
+def read_video_format(path):
+    """
+    Read the parameters of an MP4's first video track that stream copying depends on.
+
+    Args:
+        path (str): Path to the MP4 file
+
+    Returns:
+        VideoFormat: Codec, size, timescale and decoder configuration
+
+    Raises:
+        ValueError: If the file has no video track
+    """
+    with open(path, 'rb') as f:
+        moov = find_box(f, (b'moov',))
+        if moov is not None:
+            for box_type, offset, size in iter_boxes(f, moov[0], moov[0] + moov[1]):
+                if box_type == b'trak':
+                    video_format = _read_video_format(f, offset, size)
+                    if video_format is not None:
+                        return video_format
+    raise ValueError(f"No video track in {path}")
@@ -0,0 +1,226 @@
+import threading
+import logging
+from collections import OrderedDict, namedtuple
+from .clip_index import get_clip_index
+from .sprite import get_sprite
+from .lexicon import get_lexicon
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+
+# Trie node key marking the end of a phrase; its value is the phrase's clip
+_PHRASE_END = None
+
+# The clips resolved for one transcript word, or for a run of words signed by
+# one phrase clip (``word`` is then the phrase, e.g. "thank you"). ``clips``
+# holds the word or phrase clip or, when fingerspelling, one clip per letter;
+# ``missing`` lists letters with no clip.
+# A fingerspelled word also gets ``segments``, one (start, end) pair per letter
+# into the fingerspelling sprite, when a sprite covering every letter is built.
+ResolvedWord = namedtuple('ResolvedWord', ['word', 'clips', 'missing', 'segments'], defaults=((),))
+
+
+def normalize_tokens(tokens):
+    """
+    Normalize transcript tokens for resolution.
+
+    Punctuation is stripped, tokens are lower-cased and tokens that end up
+    empty are dropped.
+
+    Args:
+        tokens (iterable): Words from a transcript
+
+    Returns:
+        tuple: Normalized tokens
+    """
+    normalized = []
+    for token in tokens:
+        cleaned = ''.join(c for c in token if c.isalnum()).lower()
+        if cleaned:
+            normalized.append(cleaned)
+    return tuple(normalized)
+
+
+def build_phrase_trie(clips):
+    """
+    Build a token trie over the multi-word clips (e.g. "Thank You").
+
+    Args:
+        clips (iterable): Clip objects from the clip index
+
+    Returns:
+        dict: Nested dicts keyed by normalized token; a node that ends a
+            phrase maps _PHRASE_END to its clip
+    """
+    trie = {}
+    for clip in clips:
+        tokens = normalize_tokens(clip.name.split())
+        if len(tokens) < 2:
+            continue
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_PHRASE_END] = clip
+    return trie
+
+
+class SignResolver:
+    """
+    Resolve transcript words to sign clips, with a bounded LRU cache.
+
+    Runs of words with a phrase clip ("do not") are matched greedily,
+    longest phrase first, before falling back to one clip per word.
+    The cache maps normalized token sequences to resolved clip sequences, so a
+    phrase that has been seen before is answered without any lookups.
+    """
+
+    def __init__(self, index, max_entries=DEFAULT_CACHE_SIZE, sprite=None, lexicon=None):
+        self.index = index
+        self.sprite = sprite
+        self.lexicon = lexicon
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._cache_version = index.version
+        self._phrases = build_phrase_trie(index.clips())
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _resolve_word(self, token, fingerspell):
+        """Resolve a single normalized token."""
+        clip = self.index.lookup(token)
+        if clip is None and self.lexicon is not None:
+            # Inflections, aliases and synonyms of words that have a clip
+            canonical = self.lexicon.get(token)
+            if canonical is not None:
+                clip = self.index.lookup(canonical)
+        if clip:
+            return ResolvedWord(token, (clip,), ())
+        if not fingerspell:
+            logger.debug(f"No video found for word: {token}")
+            return ResolvedWord(token, (), ())
+
+        # Spell the word out letter by letter
+        clips = []
+        missing = []
+        for c in token.upper():
+            clip = self.index.lookup(c)
+            if clip:
+                clips.append(clip)
+            else:
+                missing.append(c)
+        if missing:
+            logger.warning(f"Missing videos for letters of '{token}': {missing}")
+        segments = (self.sprite.spell(token) or ()) if self.sprite is not None else ()
+        return ResolvedWord(token, tuple(clips), tuple(missing), segments)
+
+    def _resolve_tokens(self, tokens, phrases, fingerspell):
+        """Resolve normalized tokens, taking the longest phrase clip at each position."""
+        resolved = []
+        i = 0
+        while i < len(tokens):
+            # Walk the trie as far as the tokens allow, remembering the last phrase end
+            node = phrases
+            match = None
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _PHRASE_END in node:
+                    match = (j, node[_PHRASE_END])
+            if match:
+                end, clip = match
+                resolved.append(ResolvedWord(' '.join(tokens[i:end]), (clip,), ()))
+                i = end
+            else:
+                resolved.append(self._resolve_word(tokens[i], fingerspell))
+                i += 1
+        return tuple(resolved)
+
+    def resolve(self, tokens, fingerspell=True):
+        """
+        Resolve transcript words to sign clips.
+
+        Args:
+            tokens (iterable): Words from a transcript
+            fingerspell (bool): Spell out words without a clip letter by letter
+
+        Returns:
+            tuple: One ResolvedWord per normalized token
+        """
+        key = (normalize_tokens(tokens), fingerspell)
+        with self._lock:
+            # Drop cached results built from an older clip index
+            if self._cache_version != self.index.version:
+                self._cache.clear()
+                self._cache_version = self.index.version
+                self._phrases = build_phrase_trie(self.index.clips())
+            phrases = self._phrases
+            resolved = self._cache.get(key)
+            if resolved is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return resolved
+            self.misses += 1
+
+        resolved = self._resolve_tokens(key[0], phrases, fingerspell)
+
+        with self._lock:
+            self._cache[key] = resolved
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return resolved
+
+    def stats(self):
+        """Return cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._cache),
+                'max_size': self.max_entries,
+            }
+
+    def clear(self):
+        """Empty the cache and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# One resolver per clip index, created on first use
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(base_dir=None):
+    """
+    Return the shared resolver for the clip index of ``base_dir``.
+
+    Args:
+        base_dir (str): Project base directory; defaults to settings.BASE_DIR
+
+    Returns:
+        SignResolver: The shared resolver
+    """
+    index = get_clip_index(base_dir)
+    resolver = _resolvers.get(index.base_dir)
+    if resolver is None:
+        with _resolvers_lock:
+            resolver = _resolvers.get(index.base_dir)
+            if resolver is None:
+                try:
+                    from django.conf import settings
+                    max_entries = getattr(settings, 'SIGN_RESOLVER_CACHE_SIZE', DEFAULT_CACHE_SIZE)
+                except Exception:
+                    max_entries = DEFAULT_CACHE_SIZE
+                resolver = SignResolver(index, max_entries=max_entries, sprite=get_sprite(), lexicon=get_lexicon())
+                _resolvers[index.base_dir] = resolver
+    return resolver
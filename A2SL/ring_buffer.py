@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity single-producer, single-consumer audio buffer.
+
+    The audio callback writes and the processing thread reads; neither takes a
+    lock. Every frame is stored twice, ``capacity`` frames apart, so any run of
+    up to ``capacity`` unread frames can be read as one contiguous view.
+
+    When the reader falls behind, whole incoming blocks are dropped (never the
+    unread audio) and counted in ``overflow_frames``.
+    """
+
+    def __init__(self, capacity, channels=1, dtype=np.float32):
+        self.capacity = capacity
+        self.data = np.zeros((2 * capacity, channels), dtype=dtype)
+        # Total frames written and read; only the producer moves write_position
+        # and only the consumer moves read_position
+        self.write_position = 0
+        self.read_position = 0
+        self.overflow_frames = 0
+        self.overflow_blocks = 0
+
+    def write(self, block):
+        """Copy a block in (producer side). Returns False if it was dropped for lack of space."""
+        frames = len(block)
+        if frames > self.capacity - (self.write_position - self.read_position):
+            self.overflow_frames += frames
+            self.overflow_blocks += 1
+            return False
+        start = self.write_position % self.capacity
+        first = min(frames, self.capacity - start)
+        rest = frames - first
+        self.data[start:start + first] = block[:first]
+        self.data[start + self.capacity:start + self.capacity + first] = block[:first]
+        if rest:
+            self.data[:rest] = block[first:]
+            self.data[self.capacity:self.capacity + rest] = block[first:]
+        # Publish only after the frames are in place
+        self.write_position += frames
+        return True
+
+    def available(self):
+        """Number of unread frames."""
+        return self.write_position - self.read_position
+
+    def peek(self, frames):
+        """View of the oldest ``frames`` unread frames, valid until they are consumed."""
+        start = self.read_position % self.capacity
+        return self.data[start:start + min(frames, self.available())]
+
+    def consume(self, frames):
+        """Release the oldest ``frames`` unread frames back to the producer."""
+        self.read_position += min(frames, self.available())
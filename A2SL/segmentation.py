@@ -0,0 +1,205 @@
+import math
+import numpy as np
+from .vad import (
+    SAMPLE_RATE, FRAME_SECONDS, HOP_SECONDS, ABSOLUTE_FLOOR_DB, NOISE_MARGIN_DB,
+    MAX_SPEECH_FLATNESS, MIN_BAND_RATIO, frame_features,
+)
+
+# Speech starts NOISE_MARGIN_DB above the noise floor and only ends once the
+# level falls this much further, so syllable dips don't end an utterance
+HYSTERESIS_DB = 6.0
+# Time constant for the noise floor creeping up; it drops immediately
+NOISE_FLOOR_RISE_SECONDS = 3.0
+
+# Audio kept before the first and after the last speech frame
+PRE_ROLL_SECONDS = 0.2
+TAIL_SECONDS = 0.15
+# A pause this long ends an utterance
+PAUSE_SECONDS = 0.4
+# Shorter pauses are where over-long utterances get split
+SPLIT_PAUSE_SECONDS = 0.1
+MAX_UTTERANCE_SECONDS = 10.0
+# Utterances with less speech than this (clicks, coughs) are dropped
+MIN_SPEECH_SECONDS = 0.2
+
+
+class UtteranceSegmenter:
+    """
+    Split a live audio stream into utterances at natural pauses.
+
+    Audio is fed incrementally; every complete 25 ms frame is classified in one
+    vectorized pass (energy, speech-band ratio and spectral flatness from
+    vad.frame_features) against a running noise floor, with hysteresis.
+    Utterances end at a pause of PAUSE_SECONDS, or are split at the latest
+    short pause once they reach the maximum length.
+
+    Positions are absolute sample indices in the stream, so the caller can
+    keep audio in any buffer that tracks how many samples it has read.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, max_utterance_seconds=MAX_UTTERANCE_SECONDS,
+                 pause_seconds=PAUSE_SECONDS, max_energy_db=None):
+        """
+        Args:
+            sample_rate (int): Sample rate of the stream
+            max_utterance_seconds (float): Longest utterance to emit
+            pause_seconds (float): Silence that ends an utterance
+            max_energy_db (float): Frames louder than this (dBFS) are never
+                speech, e.g. the local user's own voice; None for no limit
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = int(FRAME_SECONDS * sample_rate)
+        self.hop_length = int(HOP_SECONDS * sample_rate)
+        self.pre_roll = int(PRE_ROLL_SECONDS * sample_rate)
+        self.tail = int(TAIL_SECONDS * sample_rate)
+        self.max_samples = int(max_utterance_seconds * sample_rate)
+        self.pause_frames = max(1, round(pause_seconds / HOP_SECONDS))
+        self.split_pause_frames = max(1, round(SPLIT_PAUSE_SECONDS / HOP_SECONDS))
+        self.min_speech_frames = max(1, round(MIN_SPEECH_SECONDS / HOP_SECONDS))
+        self.max_energy_db = max_energy_db
+        self.noise_floor_db = None
+        self.reset(0)
+
+    def reset(self, position):
+        """Drop any open utterance and continue from ``position``; the noise floor is kept."""
+        self.position = position
+        self.released = position
+        self.in_speech = False
+        self.utterance_start = None
+        self.last_speech_end = None
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.split_point = None
+        self.speech_frames_at_split = 0
+
+    def pending(self, end):
+        """Samples up to ``end`` that have not been analyzed yet."""
+        return end - self.position
+
+    def feed(self, samples, offset):
+        """
+        Analyze newly available audio.
+
+        Args:
+            samples (numpy.ndarray): Mono audio starting at stream position
+                ``offset`` and covering at least everything from keep_from()
+            offset (int): Stream position of ``samples[0]``
+
+        Returns:
+            list: (start, end) stream positions of each completed utterance
+        """
+        available = offset + len(samples) - self.position
+        if available < self.frame_length:
+            return []
+        n_frames = 1 + (available - self.frame_length) // self.hop_length
+        first = self.position - offset
+        window = samples[first:first + (n_frames - 1) * self.hop_length + self.frame_length]
+
+        speech = self._classify(frame_features(window, self.sample_rate))
+        starts = self.position + np.arange(n_frames) * self.hop_length
+        self.position += n_frames * self.hop_length
+        return self._segment(speech, starts)
+
+    def flush(self):
+        """Close the open utterance at the end of the stream; returns it as a list like feed()."""
+        utterances = []
+        if self.utterance_start is not None:
+            self._close(min(self.last_speech_end + self.tail, self.position), utterances)
+        return utterances
+
+    def keep_from(self):
+        """Earliest stream position still needed; everything before it can be released."""
+        if self.utterance_start is not None:
+            position = self.utterance_start
+        else:
+            position = self.position - self.pre_roll
+        self.released = max(self.released, position)
+        return self.released
+
+    def _classify(self, features):
+        """Speech mask for a batch of frames, updating the noise floor."""
+        energy_db = features['energy_db']
+        if self.noise_floor_db is None:
+            self.noise_floor_db = float(np.percentile(energy_db, 10))
+
+        start_threshold = max(ABSOLUTE_FLOOR_DB, self.noise_floor_db + NOISE_MARGIN_DB)
+        start = (
+            (energy_db > start_threshold)
+            & (features['band_ratio'] > MIN_BAND_RATIO)
+            & (features['flatness'] < MAX_SPEECH_FLATNESS)
+        )
+        keep = energy_db > start_threshold - HYSTERESIS_DB
+        if self.max_energy_db is not None:
+            too_loud = energy_db > self.max_energy_db
+            start &= ~too_loud
+            keep &= ~too_loud
+
+        # Hysteresis: within each run of frames above the lower threshold, speech
+        # begins at the first frame that passes the start test. The previous
+        # batch's last state is prepended so runs continue across batches.
+        start = np.concatenate(([self.in_speech], start))
+        keep = np.concatenate(([self.in_speech], keep))
+        run = np.cumsum(~keep)
+        started = np.maximum.accumulate(np.where(start, run, -1)) == run
+        speech = (keep & started)[1:]
+        self.in_speech = bool(speech[-1])
+
+        # Track the noise floor on the frames that weren't speech
+        quiet = ~speech
+        if self.max_energy_db is not None:
+            quiet &= ~too_loud
+        if quiet.any():
+            level = float(np.mean(energy_db[quiet]))
+            if level < self.noise_floor_db:
+                self.noise_floor_db = level
+            else:
+                rate = 1.0 - math.exp(-quiet.sum() * HOP_SECONDS / NOISE_FLOOR_RISE_SECONDS)
+                self.noise_floor_db += rate * (level - self.noise_floor_db)
+        return speech
+
+    def _segment(self, speech, starts):
+        """Advance the utterance state machine over classified frames."""
+        utterances = []
+        for is_speech, start in zip(speech.tolist(), starts.tolist()):
+            end = start + self.frame_length
+            if is_speech:
+                if self.utterance_start is None:
+                    self.utterance_start = max(start - self.pre_roll, self.released)
+                elif self.silence_frames >= self.split_pause_frames:
+                    # Middle of the pause just ended: where to split if this runs long
+                    self.split_point = self.last_speech_end + (start - self.last_speech_end) // 2
+                    self.speech_frames_at_split = self.speech_frames
+                self.silence_frames = 0
+                self.speech_frames += 1
+                self.last_speech_end = end
+            elif self.utterance_start is not None:
+                self.silence_frames += 1
+                if self.silence_frames >= self.pause_frames:
+                    self._close(min(self.last_speech_end + self.tail, end), utterances)
+                    continue
+            if self.utterance_start is not None and end - self.utterance_start >= self.max_samples:
+                self._split(end, utterances)
+        return utterances
+
+    def _close(self, end, utterances):
+        if self.speech_frames >= self.min_speech_frames:
+            utterances.append((self.utterance_start, end))
+        self.released = max(self.released, end)
+        self.utterance_start = None
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.split_point = None
+
+    def _split(self, end, utterances):
+        """Emit the first part of an over-long utterance, at its last pause if it has one."""
+        if self.split_point is not None and self.split_point - self.utterance_start >= self.max_samples // 4:
+            cut = self.split_point
+            remaining = self.speech_frames - self.speech_frames_at_split
+        else:
+            cut = end
+            remaining = 0
+        utterances.append((self.utterance_start, cut))
+        self.released = max(self.released, cut)
+        self.utterance_start = cut
+        self.speech_frames = remaining
+        self.split_point = None
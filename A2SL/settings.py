@@ -11,19 +11,45 @@ https://docs.djangoproject.com/en/3.0/ref/settings/
 """
 
 import os
+import sys
+import time
+from importlib import metadata, util
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
+
+_settings_import_started = time.perf_counter()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Below code added by RanjeetKumbhar01
-import nltk
-NLTK_DATA_DIR = os.path.join(BASE_DIR, 'nltk_data')
-nltk.data.path.append(NLTK_DATA_DIR)
-# download nltk utilities
-nltk.download('averaged_perceptron_tagger')
-nltk.download('wordnet')
-nltk.download('omw-1.4')
+# NLTK data is read from the bundled directory only; nothing is downloaded at
+# startup. Run `python download_nltk_resources.py` once to populate it.
+NLTK_DATA_DIR = os.environ.get('NLTK_DATA_DIR', os.path.join(BASE_DIR, 'nltk_data'))
+# nltk reads NLTK_DATA when it is first imported, so setting it here avoids
+# importing nltk during settings
+os.environ['NLTK_DATA'] = os.pathsep.join(
+    path for path in (NLTK_DATA_DIR, os.environ.get('NLTK_DATA')) if path
+)
+if 'nltk.data' in sys.modules:
+    sys.modules['nltk.data'].path.insert(0, NLTK_DATA_DIR)
+# Resources needed at request time (word_tokenize); newer nltk reads punkt_tab
+NLTK_REQUIRED_RESOURCES = ['tokenizers/punkt']
+if tuple(int(part) for part in metadata.version('nltk').split('.')[:3] if part.isdigit()) >= (3, 8, 2):
+    NLTK_REQUIRED_RESOURCES.append('tokenizers/punkt_tab')
+# Set NLTK_DATA_CHECK=0 for build steps that run before the data is in place
+NLTK_DATA_CHECK = os.environ.get('NLTK_DATA_CHECK', '1') == '1'
+
+if NLTK_DATA_CHECK:
+    _missing = [
+        resource for resource in NLTK_REQUIRED_RESOURCES
+        if not os.path.exists(os.path.join(NLTK_DATA_DIR, resource))
+        and not os.path.exists(os.path.join(NLTK_DATA_DIR, resource + '.zip'))
+    ]
+    if _missing:
+        raise ImproperlyConfigured(
+            f"Missing NLTK data in {NLTK_DATA_DIR}: {', '.join(_missing)}. "
+            "Run `python download_nltk_resources.py` to fetch it."
+        )
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.0/howto/deployment/checklist/
@@ -48,6 +74,11 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'A2SL',
 ]
+# daphne goes first: it replaces runserver with an ASGI server, so the
+# streaming WebSocket (ws/transcribe/) is served in development too. Without
+# it runserver speaks WSGI only and just the HTTP endpoints work.
+if util.find_spec('daphne') is not None:
+    INSTALLED_APPS.insert(0, 'daphne')
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -78,6 +109,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'A2SL.wsgi.application'
+ASGI_APPLICATION = 'A2SL.asgi.application'
 
 
 # Database
@@ -139,5 +171,89 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Sign clip index
+# Seconds between checks for added/removed clips in assets/ and static/ (0 disables)
+CLIP_INDEX_REFRESH_INTERVAL = 5
+# Number of resolved token sequences kept in the word-to-sign LRU cache
+SIGN_RESOLVER_CACHE_SIZE = 1024
+# Surface form -> clip table built by `manage.py build_sign_lexicon`
+SIGN_LEXICON_PATH = os.path.join(BASE_DIR, 'sign_lexicon.sqlite3')
+
+# Whisper speech recognition
+WHISPER_MODEL = os.environ.get('WHISPER_MODEL', 'base')
+WHISPER_DEVICE = os.environ.get('WHISPER_DEVICE', 'cpu')
+# 'fp32' or 'int8' (dynamic quantization of linear layers, CPU only);
+# compare the two with benchmark_whisper_precision.py
+WHISPER_PRECISION = os.environ.get('WHISPER_PRECISION', 'fp32')
+# Load and warm up the model when the server starts instead of on the first
+# /transcribe/ request; /ready/ reports 503 until the model is loaded
+WHISPER_WARM_START = os.environ.get('WHISPER_WARM_START', '0') == '1'
+# Trim leading/trailing silence before Whisper and skip chunks with no speech
+TRANSCRIBE_VAD = True
+# Group concurrent /transcribe/ requests (clips up to 30s) into batched decodes
+TRANSCRIBE_BATCHING = os.environ.get('TRANSCRIBE_BATCHING', '0') == '1'
+TRANSCRIBE_BATCH_MAX_SIZE = int(os.environ.get('TRANSCRIBE_BATCH_MAX_SIZE', '8'))
+TRANSCRIBE_BATCH_MAX_WAIT_MS = float(os.environ.get('TRANSCRIBE_BATCH_MAX_WAIT_MS', '30'))
+# Number of transcription worker processes sharing one copy of the model (0 transcribes inline)
+TRANSCRIBE_WORKERS = int(os.environ.get('TRANSCRIBE_WORKERS', '0'))
+# Requests queued or running before /transcribe/ answers 503
+TRANSCRIBE_MAX_PENDING = int(os.environ.get('TRANSCRIBE_MAX_PENDING', '32'))
+# Torch intra-op threads per worker (None splits the CPU cores evenly)
+TRANSCRIBE_TORCH_THREADS = None
+# Seconds a client is asked to wait before retrying a 503
+TRANSCRIBE_RETRY_AFTER = 2
+# Seconds to wait for a worker to return a transcription
+TRANSCRIBE_TIMEOUT = 60
+
+# Transcription result cache, keyed by a hash of the decoded audio
+TRANSCRIPTION_CACHE_SIZE = 512
+# Directory for the on-disk tier (None keeps the cache in memory only)
+TRANSCRIPTION_CACHE_DIR = os.environ.get('TRANSCRIPTION_CACHE_DIR') or None
+TRANSCRIPTION_CACHE_TTL = 24 * 60 * 60
+TRANSCRIPTION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Stitched sentence videos served by /sentence-video/
+SENTENCE_VIDEO_CACHE_DIR = os.path.join(MEDIA_ROOT, 'sentence_cache')
+SENTENCE_VIDEO_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Longest clip sequence a single request may stitch
+SENTENCE_VIDEO_MAX_CLIPS = 100
+# Sentence videos built (ffmpeg processes run) at once; more answer 503
+SENTENCE_VIDEO_MAX_BUILDS = int(os.environ.get('SENTENCE_VIDEO_MAX_BUILDS', '2'))
+
+# Fingerspelling sprite built by `manage.py build_fingerspell_sprite`
+FINGERSPELL_SPRITE_DIR = os.path.join(MEDIA_ROOT, 'sprites')
+
+# Clip serving (/clip/..., /clips/...). Set to 'X-Accel-Redirect' (nginx) or
+# 'X-Sendfile' (Apache, lighttpd) to let the front-end server send clip bytes
+CLIP_SENDFILE_HEADER = os.environ.get('CLIP_SENDFILE_HEADER') or None
+# Internal nginx location that maps onto BASE_DIR, for X-Accel-Redirect
+CLIP_SENDFILE_PREFIX = '/protected/'
+
+# Browser clip cache (service worker at /sw.js). Letters and digits are always
+# precached; these are the most frequent words, precached when a clip exists
+SERVICE_WORKER_PRECACHE_WORDS = [
+    'I', 'You', 'Is', 'It', 'And', 'To', 'Be', 'Not', 'Do', 'Have', 'What',
+    'We', 'My', 'Your', 'Are', 'Can', 'Will', 'Know', 'Go', 'With', 'For',
+    'This', 'That', 'Of', 'On', 'At', 'Was', 'How', 'Where', 'When', 'Why',
+    'Who', 'Hello', 'Thank You', 'Good', 'Help', 'Name', 'Welcome',
+]
+# Clips the service worker keeps on top of the precached ones
+SERVICE_WORKER_RUNTIME_CLIPS = 200
+
+# Streaming transcription over ws/transcribe/
+# Seconds of new audio between decodes
+STREAM_STEP_SECONDS = 0.5
+# Longest decode window before all pending words are committed
+STREAM_MAX_WINDOW_SECONDS = 10.0
+# Number of stable words passed back to the decoder as context
+STREAM_PROMPT_WORDS = 32
+# Decodes running at once across all connections (each connection has at most one)
+STREAM_DECODE_THREADS = int(os.environ.get('STREAM_DECODE_THREADS', '2'))
+# Audio a connection may have waiting to be decoded before new blocks are dropped
+STREAM_MAX_BACKLOG_SECONDS = 30.0
+
 # Default primary key field type
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Time spent importing this module, reported by /ready/
+SETTINGS_IMPORT_SECONDS = time.perf_counter() - _settings_import_started
@@ -0,0 +1,57 @@
+# Hand-picked stand-ins for words that have no clip of their own, as
+# (clip name, alias) pairs. The alias is signed with the clip's video.
+ALIASES = [
+    # Love - Use "Happy" as a close approximation
+    ('Happy', 'Love'),
+
+    # Common verbs
+    ('Walk', 'Going'),
+    ('Walk', 'Go'),
+    ('Talk', 'Say'),
+    ('Talk', 'Speak'),
+    ('Talk', 'Said'),
+    ('Sound', 'Hear'),
+    ('See', 'Look'),
+    ('See', 'Watch'),
+    ('Keep', 'Have'),
+    ('Keep', 'Has'),
+    ('Learn', 'Know'),
+    ('I', 'Im'),  # I'm
+    ('Stay', 'Live'),
+    ('Stay', 'Stayed'),
+    ('Stay', 'Living'),
+
+    # To be verbs
+    ('Be', 'Am'),
+    ('Be', 'Is'),
+    ('Be', 'Are'),
+    ('Be', 'Was'),
+    ('Be', 'Were'),
+
+    # Negations
+    ('Not', 'Dont'),  # Don't
+    ('Not', 'Doesnt'),  # Doesn't
+    ('Not', 'Didnt'),  # Didn't
+    ('Not', 'No'),
+
+    # Common words
+    ('A', 'An'),
+    ('Great', 'Awesome'),
+    ('Our', 'Their'),
+    ('More', 'Most'),
+    ('Good', 'Better'),
+    ('Good', 'Best'),
+    ('Bad', 'Worse'),
+    ('Bad', 'Worst'),
+    ('Words', 'Word'),
+    ('Words', 'Posture'),
+    ('Words', 'Die'),
+    ('Words', 'Driver'),
+    ('Words', 'Check'),
+    ('Words', 'For'),
+    ('Words', 'Every'),
+    ('Words', 'Single'),
+    ('Words', 'Waiting'),
+    ('Words', 'Its'),
+    ('Words', 'Gonna'),
+]
@@ -1,5 +1,6 @@
 import os
 import logging
+from .resolver import get_resolver
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -7,7 +8,8 @@ logger = logging.getLogger(__name__)
 
 def get_sign_videos(text, base_dir):
     """
-    Get sign language videos for the given text from the static folder.
+    Get sign language videos for the given text using the shared resolver.
+    Words without a video are skipped.
     
     Args:
         text (str): The text to find videos for
@@ -17,36 +19,8 @@ def get_sign_videos(text, base_dir):
         list: List of video URLs
     """
     try:
-        # Split text into words
-        words = text.split()
-        
-        # For each word, find a corresponding video
-        videos = []
-        for word in words:
-            # Clean the word (remove punctuation, etc.)
-            cleaned_word = ''.join(c for c in word if c.isalnum())
-            if not cleaned_word:
-                continue
-            
-            # Format word with first letter capitalized
-            titled_word = cleaned_word.capitalize()
-            
-            # Look for a video file in the static folder
-            static_path = os.path.join(base_dir, 'static', f"{titled_word}.mp4")
-            if os.path.exists(static_path):
-                videos.append(f"/static/{titled_word}.mp4")
-                logger.info(f"Found video for word: {titled_word}")
-            else:
-                # If not found with title case, try uppercase (for compatibility)
-                upper_word = cleaned_word.upper()
-                static_path = os.path.join(base_dir, 'static', f"{upper_word}.mp4")
-                if os.path.exists(static_path):
-                    videos.append(f"/static/{upper_word}.mp4")
-                    logger.info(f"Found video for word (uppercase): {upper_word}")
-                else:
-                    logger.warning(f"No video found for word: {titled_word}")
-        
-        return videos
+        resolved = get_resolver(base_dir).resolve(text.split(), fingerspell=False)
+        return [item.clips[0].url for item in resolved if item.clips]
         
     except Exception as e:
         logger.error(f"Error getting sign videos: {str(e)}")
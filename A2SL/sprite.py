@@ -0,0 +1,133 @@
+import os
+import json
+import threading
+import logging
+from .mp4 import read_duration
+from .stitching import concat_clips
+from .clip_index import fingerprinted_url
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Characters that are fingerspelled, in sprite order
+SPRITE_CHARACTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+SPRITE_NAME = 'fingerspell'
+# Served as /clip/sprites/<fingerprint>/fingerspell.mp4
+SPRITE_ROOT = 'sprites'
+
+
+def build_sprite(index, directory):
+    """
+    Concatenate every letter and digit clip into one MP4 with an offset table.
+
+    Writes ``fingerspell.mp4`` and ``fingerspell.json`` to ``directory``. The
+    table maps each character to its (start, end) time in the sprite. Letter
+    clips that differ in format are re-encoded to the most common one (see
+    stitching.concat_clips), which keeps every clip's duration.
+
+    Args:
+        index (ClipIndex): Clip library to take the letter clips from
+        directory (str): Output directory
+
+    Returns:
+        dict: The offset table that was written
+    """
+    clips = []
+    segments = {}
+    offset = 0.0
+    for character in SPRITE_CHARACTERS:
+        clip = index.lookup(character)
+        if clip is None:
+            logger.warning(f"No clip for '{character}'; it will not be in the sprite")
+            continue
+        duration = read_duration(clip.path)
+        segments[character] = (round(offset, 3), round(offset + duration, 3))
+        offset += duration
+        clips.append(clip)
+    if not clips:
+        raise ValueError("No letter or digit clips found")
+
+    os.makedirs(directory, exist_ok=True)
+    video_path = os.path.join(directory, f"{SPRITE_NAME}.mp4")
+    table_path = os.path.join(directory, f"{SPRITE_NAME}.json")
+
+    # Write the video first so the table never points at a sprite that isn't there
+    temp_path = f"{video_path}.{os.getpid()}.tmp"
+    if concat_clips([clip.path for clip in clips], temp_path):
+        logger.warning("Letter clips differ in resolution or encoding; the sprite was re-encoded")
+    os.replace(temp_path, video_path)
+
+    # The URL carries the content fingerprint so clients never play a stale sprite
+    table = {
+        'url': fingerprinted_url(SPRITE_ROOT, video_path),
+        'duration': round(offset, 3),
+        'segments': segments,
+    }
+    with open(f"{table_path}.tmp", 'w') as f:
+        json.dump(table, f, indent=2)
+    os.replace(f"{table_path}.tmp", table_path)
+    return table
+
+
+class FingerspellSprite:
+    """Offset table of a built fingerspelling sprite."""
+
+    def __init__(self, url, segments):
+        self.url = url
+        self.segments = {character: tuple(times) for character, times in segments.items()}
+
+    @classmethod
+    def load(cls, directory):
+        """Load the sprite table from ``directory``; None if no sprite has been built."""
+        try:
+            with open(os.path.join(directory, f"{SPRITE_NAME}.json")) as f:
+                table = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable fingerspelling sprite table: {str(e)}")
+            return None
+        return cls(table['url'], table['segments'])
+
+    def spell(self, word):
+        """
+        Return (start, end) segments spelling ``word``, or None if any character is missing.
+
+        Args:
+            word (str): Word to fingerspell
+
+        Returns:
+            tuple: One (start, end) pair per character
+        """
+        segments = []
+        for character in word.upper():
+            times = self.segments.get(character)
+            if times is None:
+                return None
+            segments.append(times)
+        return tuple(segments)
+
+
+# Shared sprite table, loaded on first use
+_sprite = None
+_sprite_loaded = False
+_sprite_lock = threading.Lock()
+
+
+def get_sprite():
+    """Return the fingerspelling sprite configured in settings, or None if it hasn't been built."""
+    global _sprite, _sprite_loaded
+    if not _sprite_loaded:
+        with _sprite_lock:
+            if not _sprite_loaded:
+                try:
+                    from django.conf import settings
+                    directory = settings.FINGERSPELL_SPRITE_DIR
+                except Exception:
+                    directory = None
+                _sprite = FingerspellSprite.load(directory) if directory else None
+                _sprite_loaded = True
+                if _sprite is not None:
+                    logger.info(f"Loaded fingerspelling sprite with {len(_sprite.segments)} characters")
+    return _sprite
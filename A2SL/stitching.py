@@ -0,0 +1,280 @@
+import os
+import hashlib
+import threading
+import subprocess
+import tempfile
+import logging
+import collections
+from .mp4 import read_video_format
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _concat_list_line(path):
+    """Quote a path for ffmpeg's concat demuxer."""
+    return "file '" + path.replace("'", "'\\''") + "'\n"
+
+
+# Part of every cache key; bump it when stitching changes so stale videos are rebuilt
+# (2: clips of differing formats are re-encoded instead of stream-copied)
+KEY_VERSION = 2
+
+# ffmpeg names for the H.264 profile_idc values the clip library may use
+H264_PROFILES = {66: 'baseline', 77: 'main', 100: 'high'}
+
+
+def _reencode_command(paths, output_path, video_format):
+    """ffmpeg command joining clips of differing formats by re-encoding them to ``video_format``."""
+    width, height = video_format.width, video_format.height
+    # Each clip is decoded with its own timestamps (the concat demuxer would
+    # mistime clips with another timescale) and letterboxed to the target size
+    filters = [
+        f"[{i}:v:0]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,settb=AVTB[v{i}]"
+        for i in range(len(paths))
+    ]
+    filters.append(''.join(f"[v{i}]" for i in range(len(paths))) + f"concat=n={len(paths)}:v=1:a=0[out]")
+    cmd = ["ffmpeg", "-nostdin", "-y", "-loglevel", "error"]
+    for path in paths:
+        cmd += ["-i", path]
+    cmd += [
+        # Keep every frame at its own time; clips differ in frame rate
+        "-filter_complex", ';'.join(filters), "-map", "[out]", "-vsync", "vfr",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "20", "-pix_fmt", "yuv420p",
+        "-video_track_timescale", str(video_format.timescale),
+    ]
+    if video_format.profile in H264_PROFILES:
+        cmd += ["-profile:v", H264_PROFILES[video_format.profile], "-level", f"{video_format.level / 10:.1f}"]
+    return cmd + ["-movflags", "+faststart", "-f", "mp4", output_path]
+
+
+def _run_ffmpeg(cmd):
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to concatenate clips: {e.stderr.decode(errors='replace')}") from e
+
+
+def concat_clips(paths, output_path):
+    """
+    Concatenate MP4 clips into one file.
+
+    Clips whose video formats (codec, size, timescale and decoder
+    configuration, see mp4.read_video_format) are all identical are joined
+    without re-encoding. Stream copying anything else would change
+    resolution, decoder settings or timing mid-stream, which players render
+    wrongly, so such sequences are re-encoded to the most common format
+    among their clips.
+
+    Args:
+        paths (list): Absolute paths of the clips, in playback order
+        output_path (str): Where to write the MP4
+
+    Returns:
+        bool: True if the clips had to be re-encoded
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    formats = [read_video_format(path) for path in paths]
+    if len(set(formats)) > 1:
+        # Ties go to the format of the earliest clip
+        target = collections.Counter(formats).most_common(1)[0][0]
+        mismatched = [os.path.basename(path) for path, video_format in zip(paths, formats) if video_format != target]
+        logger.info(f"Re-encoding {len(paths)} clips to {target.width}x{target.height}; "
+                    f"{len(mismatched)} differ from the rest, e.g. {', '.join(mismatched[:3])}")
+        _run_ffmpeg(_reencode_command(paths, output_path, target))
+        return True
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as list_file:
+        list_file.writelines(_concat_list_line(path) for path in paths)
+    try:
+        _run_ffmpeg([
+            "ffmpeg", "-nostdin", "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_file.name,
+            "-c", "copy", "-movflags", "+faststart",
+            "-f", "mp4", output_path,
+        ])
+    finally:
+        os.remove(list_file.name)
+    return False
+
+
+class StitchingBusy(Exception):
+    """Raised when a sentence video needs building but every build slot is taken."""
+
+
+class SentenceVideoCache:
+    """
+    Disk cache of stitched sentence videos.
+
+    Files are named by a hash of the clip sequence and evicted least recently
+    used first once the directory grows past ``max_bytes``. Concurrent
+    requests for the same sequence wait for a single build; at most
+    ``max_builds`` different sequences are built (one ffmpeg process each) at
+    a time, and further builds raise StitchingBusy instead of waiting.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, max_builds=2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_builds = max_builds
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._build_slots = threading.BoundedSemaphore(max_builds)
+        self.hits = 0
+        self.builds = 0
+        self.rejected = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(clips):
+        """Hash a clip sequence (list of Clip) into a cache key."""
+        digest = hashlib.sha256(f"v{KEY_VERSION}\0".encode('utf-8'))
+        for clip in clips:
+            digest.update(clip.url.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _lock_for(self, key):
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get(self, clips):
+        """
+        Return the path of the stitched video for ``clips``, building it if needed.
+
+        Args:
+            clips (list): Resolved Clip objects in playback order
+
+        Returns:
+            str: Path to the MP4; it may be evicted at any time, see open()
+
+        Raises:
+            StitchingBusy: If the video must be built and max_builds are running
+        """
+        key = self.key(clips)
+        path = os.path.join(self.directory, f"{key}.mp4")
+        if self._touch(path):
+            self.hits += 1
+            return path
+
+        lock = self._lock_for(key)
+        try:
+            with lock:
+                # Another request may have finished the build while we waited
+                if self._touch(path):
+                    self.hits += 1
+                    return path
+                if not self._build_slots.acquire(blocking=False):
+                    self.rejected += 1
+                    raise StitchingBusy(f"{self.max_builds} sentence videos already building")
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    concat_clips([clip.path for clip in clips], temp_path)
+                    os.replace(temp_path, path)
+                finally:
+                    self._build_slots.release()
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                self.builds += 1
+                logger.info(f"Built sentence video of {len(clips)} clips: {key}")
+        finally:
+            with self._locks_lock:
+                if self._locks.get(key) is lock:
+                    del self._locks[key]
+
+        self._evict()
+        return path
+
+    def open(self, clips):
+        """
+        Open the stitched video for ``clips``, building it if needed.
+
+        The file is opened under the eviction lock, so it can't be deleted
+        between being found and being opened; once open, eviction only
+        unlinks it and the handle keeps reading. If it was evicted right after
+        the build, it is built again.
+
+        Args:
+            clips (list): Resolved Clip objects in playback order
+
+        Returns:
+            tuple: (binary file object, path); the caller closes the file
+
+        Raises:
+            StitchingBusy: If the video must be built and max_builds are running
+        """
+        path = self.get(clips)
+        with self._evict_lock:
+            try:
+                return open(path, 'rb'), path
+            except FileNotFoundError:
+                pass
+        # Evicted by another request's build before we got to it
+        path = self.get(clips)
+        with self._evict_lock:
+            return open(path, 'rb'), path
+
+    @staticmethod
+    def _touch(path):
+        """Mark a cached file as recently used; False if it doesn't exist."""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _evict(self):
+        """Delete least recently used videos until the cache fits in max_bytes."""
+        with self._evict_lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.mp4'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for mtime, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'builds': self.builds,
+            'rejected': self.rejected,
+            'max_builds': self.max_builds,
+            'max_bytes': self.max_bytes,
+        }
+
+
+# Shared cache, created on first use
+sentence_cache = None
+_sentence_cache_lock = threading.Lock()
+
+
+def get_sentence_cache():
+    """Return the shared sentence video cache configured from settings."""
+    global sentence_cache
+    if sentence_cache is None:
+        from django.conf import settings
+        with _sentence_cache_lock:
+            if sentence_cache is None:
+                sentence_cache = SentenceVideoCache(
+                    settings.SENTENCE_VIDEO_CACHE_DIR,
+                    max_bytes=settings.SENTENCE_VIDEO_CACHE_MAX_BYTES,
+                    max_builds=settings.SENTENCE_VIDEO_MAX_BUILDS,
+                )
+    return sentence_cache
@@ -0,0 +1,138 @@
+import logging
+import numpy as np
+from .resolver import get_resolver, normalize_tokens
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+def _common_prefix_length(words, previous):
+    """Number of leading words two hypotheses agree on (ignoring case and punctuation)."""
+    length = 0
+    for word, other in zip(words, previous):
+        if normalize_tokens([word]) != normalize_tokens([other]):
+            break
+        length += 1
+    return length
+
+
+class StreamingSession:
+    """
+    Incremental transcription of one continuous 16 kHz int16 PCM stream.
+
+    Audio is decoded over a rolling window that starts right after the last
+    stable word. A word becomes stable once two consecutive decodes agree on
+    it; stable text is passed to the decoder as context and its audio is
+    dropped from the window.
+
+    The session only keeps state; the caller runs the model. ``start_decode``
+    takes a snapshot of the window, the caller transcribes it (possibly on
+    another thread, while more audio is added) and ``finish_decode`` turns
+    the result into messages of the form ``{'words', 'videos', 'stable'}``.
+    Stable messages are final and should be appended; an unstable message
+    replaces the previous unstable one.
+    """
+
+    def __init__(self, step_seconds=0.5, max_window_seconds=10.0, prompt_words=32, max_backlog_seconds=30.0):
+        self.step_samples = int(step_seconds * SAMPLE_RATE)
+        self.max_window_samples = int(max_window_seconds * SAMPLE_RATE)
+        self.max_backlog_samples = int(max_backlog_seconds * SAMPLE_RATE)
+        self.prompt_words = prompt_words
+        self.window = np.zeros(0, dtype=np.float32)
+        self.stable_words = []
+        self.previous = []
+        self.dropped_samples = 0
+        self._new_samples = 0
+
+    def add(self, pcm):
+        """
+        Append a block of little-endian int16 PCM to the window.
+
+        Blocks arriving while the window already holds max_backlog_seconds
+        (decoding can't keep up) are dropped and counted in dropped_samples.
+
+        Returns:
+            bool: False if the block was dropped
+        """
+        if len(pcm) % 2:
+            pcm = pcm[:-1]
+        samples = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+        if len(self.window) + len(samples) > self.max_backlog_samples:
+            self.dropped_samples += len(samples)
+            return False
+        self.window = np.concatenate((self.window, samples))
+        self._new_samples += len(samples)
+        return True
+
+    def due(self):
+        """True once a step's worth of new audio has arrived since the last decode started."""
+        return self._new_samples >= self.step_samples
+
+    def start_decode(self, final=False):
+        """
+        Snapshot the window for a decode.
+
+        Args:
+            final (bool): Commit every decoded word (end of stream)
+
+        Returns:
+            tuple: (samples, initial prompt, final); pass all three to
+                finish_decode along with the transcribe_words result
+        """
+        self._new_samples = 0
+        final = final or len(self.window) >= self.max_window_samples
+        prompt = ' '.join(self.stable_words[-self.prompt_words:])
+        return self.window, prompt, final
+
+    def finish_decode(self, samples, hypothesis, final):
+        """
+        Commit stable words from a decode of ``samples``.
+
+        Audio added since start_decode stays in the window for the next decode.
+
+        Args:
+            samples (numpy.ndarray): Window returned by start_decode
+            hypothesis (list): transcribe_words output for ``samples``
+            final (bool): As returned by start_decode
+
+        Returns:
+            list: Messages to send to the client
+        """
+        words = [item['word'] for item in hypothesis]
+
+        # Words both this decode and the previous one agree on are stable;
+        # at the end of the stream (or a full window) everything is.
+        agreed = len(words) if final else _common_prefix_length(words, self.previous)
+
+        messages = []
+        cut = 0
+        if agreed:
+            stable = words[:agreed]
+            self.stable_words.extend(stable)
+            messages.append(self._message(stable, stable=True))
+            # Start the next window right after the last stable word
+            cut = min(len(samples), int(hypothesis[agreed - 1]['end'] * SAMPLE_RATE))
+
+        self.previous = words[agreed:]
+        if self.previous:
+            messages.append(self._message(self.previous, stable=False))
+
+        if final:
+            cut = len(samples)
+            self.previous = []
+        elif not words and len(samples) > self.max_window_samples // 2:
+            # Long stretch with no speech; keep only the most recent step of audio
+            cut = max(cut, len(samples) - self.step_samples)
+        self.window = self.window[cut:]
+        return messages
+
+    def _message(self, words, stable):
+        resolved = get_resolver().resolve(words, fingerspell=False)
+        return {
+            'words': [item.word.capitalize() for item in resolved],
+            'videos': [item.clips[0].url if item.clips else '' for item in resolved],
+            'stable': stable,
+        }
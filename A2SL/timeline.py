@@ -0,0 +1,43 @@
+from .resolver import normalize_tokens
+
+
+def build_timeline(words, resolver, manifest=None):
+    """
+    Map timed transcript words onto sign clips.
+
+    Words covered by one phrase clip ("thank you") become a single entry
+    spanning all of them.
+
+    Args:
+        words (list): Dicts with 'word', 'start' and 'end' (see transcribe.transcribe_words)
+        resolver (SignResolver): Resolver used to pick the clips
+        manifest (ClipManifest): Adds each clip's duration when given
+
+    Returns:
+        list: One dict per sign with 'word', 'clip' (URL, '' if none),
+            't_start' and 't_end' (seconds into the audio) and, with a
+            manifest, 'clip_duration'
+    """
+    # Drop words that normalize to nothing (stray punctuation) so the
+    # remaining ones line up with the resolver's tokens
+    timed = [word for word in words if normalize_tokens([word['word']])]
+    resolved = resolver.resolve([word['word'] for word in timed], fingerspell=False)
+
+    timeline = []
+    position = 0
+    for item in resolved:
+        span = len(item.word.split())
+        first, last = timed[position], timed[position + span - 1]
+        position += span
+        url = item.clips[0].url if item.clips else ''
+        entry = {
+            'word': item.word.capitalize(),
+            'clip': url,
+            't_start': round(first['start'], 3),
+            't_end': round(last['end'], 3),
+        }
+        if manifest is not None:
+            clip = manifest.by_url.get(url)
+            entry['clip_duration'] = clip['duration'] if clip else None
+        timeline.append(entry)
+    return timeline
@@ -1,8 +1,15 @@
+import io
 import os
-import tempfile
+import time
+import wave
+import threading
+import subprocess
+import numpy as np
 import whisper
 import torch
 import logging
+from .batching import BatchScheduler
+from .vad import trim_silence
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -10,59 +17,348 @@ logger = logging.getLogger(__name__)
 
 # Initialize model as None
 model = None
+_model_lock = threading.Lock()
+
+# Micro-batching scheduler, created on first use when enabled
+scheduler = None
+
+# Work saved by voice activity trimming
+vad_stats = {
+    'chunks': 0,
+    'skipped_chunks': 0,
+    'input_seconds': 0.0,
+    'removed_seconds': 0.0,
+}
+_vad_lock = threading.Lock()
+
+# Load state reported by the readiness endpoint
+model_status = {
+    # unloaded, loading, loaded, ready (loaded and warmed up) or error
+    'state': 'unloaded',
+    'model': None,
+    'precision': None,
+    'load_seconds': None,
+    'warmup_seconds': None,
+    'error': None,
+}
+
+# Length of the synthetic clip used to warm up the model
+WARMUP_SECONDS = 1.0
+
+PRECISIONS = ('fp32', 'int8')
+
+def _model_settings():
+    """Return (model name, device, precision) from the Django settings."""
+    from django.conf import settings
+    return (
+        getattr(settings, 'WHISPER_MODEL', 'base'),
+        getattr(settings, 'WHISPER_DEVICE', 'cpu'),
+        getattr(settings, 'WHISPER_PRECISION', 'fp32'),
+    )
+
+def quantize_model(fp32_model):
+    """
+    Apply torch dynamic int8 quantization to the model's linear layers.
+    
+    Only supported on CPU. Weights are stored as int8 and activations are
+    quantized on the fly, which speeds up the matrix multiplies that
+    dominate decoding.
+    """
+    # Whisper's Linear subclass only overrides forward() to cast weights;
+    # make those layers plain nn.Linear so dynamic quantization picks them up.
+    for module in fp32_model.modules():
+        if isinstance(module, whisper.model.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(fp32_model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def load_model(name, device="cpu", precision="fp32"):
+    """
+    Load a Whisper model at the given precision.
+    
+    Args:
+        name (str): Whisper model name, e.g. "base"
+        device (str): Torch device
+        precision (str): "fp32" or "int8" (CPU only)
+        
+    Returns:
+        whisper.model.Whisper: The loaded model
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported Whisper precision: {precision}")
+    if precision == 'int8' and device != 'cpu':
+        raise ValueError("int8 dynamic quantization is only supported on CPU")
+    loaded = whisper.load_model(name, device=device, in_memory=True)
+    if precision == 'int8':
+        loaded = quantize_model(loaded)
+    return loaded
 
 def get_model():
-    """Lazily load the Whisper model when needed."""
+    """Load the Whisper model when first needed; concurrent callers share a single load."""
     global model
     if model is None:
-        try:
-            logger.info("Loading Whisper model...")
-            model = whisper.load_model("base", device="cpu", in_memory=True)
-            logger.info("Whisper model loaded successfully")
-        except Exception as e:
-            logger.error(f"Error loading Whisper model: {str(e)}", exc_info=True)
-            raise
+        with _model_lock:
+            if model is None:
+                name, device, precision = _model_settings()
+                model_status.update(state='loading', model=name, precision=precision, error=None)
+                try:
+                    logger.info(f"Loading Whisper model '{name}' ({precision}) on {device}...")
+                    start = time.perf_counter()
+                    loaded = load_model(name, device=device, precision=precision)
+                    model_status['load_seconds'] = round(time.perf_counter() - start, 3)
+                    model = loaded
+                    # Not 'ready' until warm_up() has run a first inference
+                    model_status['state'] = 'loaded'
+                    logger.info(f"Whisper model loaded successfully in {model_status['load_seconds']}s")
+                except Exception as e:
+                    model_status.update(state='error', error=str(e))
+                    logger.error(f"Error loading Whisper model: {str(e)}", exc_info=True)
+                    raise
     return model
 
-def transcribe_audio(audio_path):
+def warm_up():
+    """Run a short synthetic inference so that torch kernels are initialized."""
+    warm_model = get_model()
+    start = time.perf_counter()
+    silence = np.zeros(int(whisper.audio.SAMPLE_RATE * WARMUP_SECONDS), dtype=np.float32)
+    warm_model.transcribe(silence, fp16=False, language="en")
+    model_status['warmup_seconds'] = round(time.perf_counter() - start, 3)
+    model_status['state'] = 'ready'
+    logger.info(f"Whisper warm-up inference finished in {model_status['warmup_seconds']}s")
+
+def warm_start():
+    """Load and warm up the model before the first real request arrives."""
+    try:
+        warm_up()
+    except Exception as e:
+        logger.error(f"Whisper warm start failed: {str(e)}", exc_info=True)
+
+def get_scheduler():
+    """Return the shared micro-batching scheduler, or None when batching is disabled."""
+    global scheduler
+    if scheduler is None:
+        from django.conf import settings
+        if not getattr(settings, 'TRANSCRIBE_BATCHING', False):
+            return None
+        with _model_lock:
+            if scheduler is None:
+                scheduler = BatchScheduler(
+                    get_model,
+                    max_batch_size=getattr(settings, 'TRANSCRIBE_BATCH_MAX_SIZE', 8),
+                    max_wait_ms=getattr(settings, 'TRANSCRIBE_BATCH_MAX_WAIT_MS', 30),
+                )
+    return scheduler
+
+def _vad_enabled():
+    from django.conf import settings
+    return getattr(settings, 'TRANSCRIBE_VAD', True)
+
+def decode_signature():
+    """Return the model name and decode options that determine a transcription result."""
+    name, device, precision = _model_settings()
+    return f"{name}:{precision}", {'language': 'en', 'fp16': False, 'vad': _vad_enabled()}
+
+def trim_for_transcription(samples):
     """
-    Transcribe audio from a file path using Whisper.
+    Trim leading and trailing silence before inference and record what was removed.
+    
+    Returns:
+        tuple: (trimmed samples, empty if the clip is all silence; seconds
+            trimmed from the start, to map timestamps back onto the input)
+    """
+    trimmed, info = trim_silence(samples, whisper.audio.SAMPLE_RATE)
+    with _vad_lock:
+        vad_stats['chunks'] += 1
+        vad_stats['input_seconds'] += len(samples) / whisper.audio.SAMPLE_RATE
+        vad_stats['removed_seconds'] += info['removed_seconds']
+        if info['silent']:
+            vad_stats['skipped_chunks'] += 1
+    if info['silent']:
+        logger.info("No speech detected, skipping transcription")
+    elif info['removed_seconds'] > 0:
+        logger.info(f"Trimmed {info['removed_seconds']:.2f}s of silence")
+    return trimmed, info['start']
+
+def is_ready():
+    """Return True once the model is loaded and warm-up inference has finished."""
+    return model_status['state'] == 'ready' and model_status['warmup_seconds'] is not None
+
+def _decode_wav(data):
+    """Decode PCM WAV bytes in memory to mono float32 at Whisper's sample rate."""
+    with wave.open(io.BytesIO(data), 'rb') as wf:
+        channels = wf.getnchannels()
+        sample_width = wf.getsampwidth()
+        sample_rate = wf.getframerate()
+        frames = wf.readframes(wf.getnframes())
+
+    if sample_width == 1:
+        audio = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        audio = np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+    elif sample_width == 4:
+        audio = np.frombuffer(frames, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise wave.Error(f"Unsupported WAV sample width: {sample_width}")
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+
+    if sample_rate != whisper.audio.SAMPLE_RATE and len(audio) > 0:
+        # Linear resampling is plenty for speech recognition input
+        duration = len(audio) / sample_rate
+        target_length = int(round(duration * whisper.audio.SAMPLE_RATE))
+        source_times = np.arange(len(audio)) / sample_rate
+        target_times = np.arange(target_length) / whisper.audio.SAMPLE_RATE
+        audio = np.interp(target_times, source_times, audio).astype(np.float32)
+
+    return audio
+
+def _decode_with_ffmpeg(data):
+    """Decode any container ffmpeg understands by piping the bytes through it."""
+    cmd = [
+        "ffmpeg",
+        "-threads", "0",
+        "-i", "pipe:0",
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(whisper.audio.SAMPLE_RATE),
+        "pipe:1",
+    ]
+    try:
+        out = subprocess.run(cmd, input=data, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='replace')}") from e
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+def decode_audio(audio):
+    """
+    Decode audio into the 16 kHz mono float32 array Whisper expects.
+    
+    Args:
+        audio: A path to an audio file, encoded audio bytes (WAV is decoded
+            in memory, other formats are piped through ffmpeg) or a float32
+            PCM numpy array already sampled at 16 kHz
+        
+    Returns:
+        numpy.ndarray: Mono float32 samples
+    """
+    if isinstance(audio, np.ndarray):
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        return audio.astype(np.float32, copy=False)
+
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        data = bytes(audio)
+        if not data:
+            raise ValueError("Audio data is empty")
+        logger.info(f"Decoding {len(data)} bytes of audio in memory")
+        if data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+            try:
+                return _decode_wav(data)
+            except (wave.Error, EOFError) as e:
+                # e.g. float or compressed WAV; let ffmpeg handle it
+                logger.info(f"Falling back to ffmpeg for WAV data: {str(e)}")
+        return _decode_with_ffmpeg(data)
+
+    # Verify the file exists and has content
+    if not os.path.exists(audio):
+        raise FileNotFoundError(f"Audio file not found at {audio}")
+    
+    file_size = os.path.getsize(audio)
+    if file_size == 0:
+        raise ValueError("Audio file is empty")
+    
+    logger.info(f"Processing audio file of size: {file_size} bytes")
+    return whisper.load_audio(audio)
+
+def transcribe_audio(audio, batch=True):
+    """
+    Transcribe audio using Whisper.
     
     Args:
-        audio_path (str): Path to the audio file to transcribe
+        audio: Path to an audio file, encoded audio bytes or a float32 PCM
+            numpy array at 16 kHz (see decode_audio)
+        batch (bool): Allow the micro-batching scheduler to handle the clip
         
     Returns:
         str: Transcribed text
     """
     try:
-        # Verify the file exists and has content
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found at {audio_path}")
-        
-        file_size = os.path.getsize(audio_path)
-        if file_size == 0:
-            raise ValueError("Audio file is empty")
-        
-        logger.info(f"Processing audio file of size: {file_size} bytes")
+        samples = decode_audio(audio)
+        if len(samples) == 0:
+            raise ValueError("Audio contains no samples")
         
-        # Get the model (will load if not already loaded)
-        model = get_model()
+        if _vad_enabled():
+            samples, _ = trim_for_transcription(samples)
+            if len(samples) == 0:
+                return ''
         
-        # Transcribe the audio with explicit FP32
-        logger.info("Starting transcription...")
-        result = model.transcribe(
-            audio_path,
-            fp16=False,  # Force FP32
-            language="en"  # Specify English language
-        )
+        logger.info(f"Starting transcription of {len(samples) / whisper.audio.SAMPLE_RATE:.2f}s of audio...")
+        batcher = get_scheduler() if batch else None
+        if batcher is not None and len(samples) <= whisper.audio.N_SAMPLES:
+            # Short clips share a batched decode with concurrent requests
+            text = batcher.transcribe(samples)
+        else:
+            # Get the model (will load if not already loaded)
+            model = get_model()
+            
+            # Transcribe the audio with explicit FP32
+            result = model.transcribe(
+                samples,
+                fp16=False,  # Force FP32
+                language="en"  # Specify English language
+            )
+            
+            # Get the transcribed text
+            text = result['text'].strip()
         logger.info("Transcription completed")
-        
-        # Get the transcribed text
-        text = result['text'].strip()
         logger.info(f"Transcribed text: {text}")
         
         return text
         
     except Exception as e:
         logger.error(f"Error during transcription: {str(e)}", exc_info=True)
-        raise 
\ No newline at end of file
+        raise
+
+def transcribe_words(audio, initial_prompt=None, vad=False):
+    """
+    Transcribe audio and return word-level timestamps.
+    
+    Args:
+        audio: Path to an audio file, encoded audio bytes or a float32 PCM
+            numpy array at 16 kHz (see decode_audio)
+        initial_prompt (str): Previously transcribed text used as decoding context
+        vad (bool): Trim silence first (if TRANSCRIBE_VAD is on); timestamps
+            still count from the start of the untrimmed audio
+        
+    Returns:
+        list: One dict per word with 'word', 'start' and 'end' (seconds from
+            the start of the audio)
+    """
+    samples = decode_audio(audio)
+    if len(samples) == 0:
+        return []
+    
+    offset = 0.0
+    if vad and _vad_enabled():
+        samples, offset = trim_for_transcription(samples)
+        if len(samples) == 0:
+            return []
+    
+    model = get_model()
+    result = model.transcribe(
+        samples,
+        fp16=False,
+        language="en",
+        word_timestamps=True,
+        initial_prompt=initial_prompt or None,
+        condition_on_previous_text=False,
+    )
+    
+    words = []
+    for segment in result.get('segments', []):
+        for word in segment.get('words', []):
+            text = word['word'].strip()
+            if text:
+                words.append({'word': text, 'start': float(word['start']) + offset, 'end': float(word['end']) + offset})
+    return words
@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+import numpy as np
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Changes whenever the cached value format does, so older entries never match
+KEY_VERSION = 2
+
+
+class TranscriptionCache:
+    """
+    Content-addressed cache of transcription results.
+
+    Results are keyed by a hash of the decoded audio (quantized to int16 so
+    equivalent uploads hash the same) plus the model and decode options.
+    Only model output belongs here: anything derived from the clip library
+    (videos, timelines) changes when clips do and must be rebuilt per request.
+    A bounded in-memory LRU tier sits in front of an optional on-disk tier
+    with a TTL and a total size limit.
+    """
+
+    def __init__(self, max_entries=512, directory=None, ttl_seconds=86400, max_disk_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._disk_bytes = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    @staticmethod
+    def make_key(samples, model_name, options):
+        """
+        Hash decoded audio together with everything that affects the result.
+
+        Args:
+            samples (numpy.ndarray): 16 kHz mono float32 audio
+            model_name (str): Whisper model identifier
+            options (dict): Decode options that change the output
+
+        Returns:
+            str: Hex digest identifying the result
+        """
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+        digest = hashlib.sha256()
+        digest.update(json.dumps({'version': KEY_VERSION, 'model': model_name, 'options': options}, sort_keys=True).encode('utf-8'))
+        digest.update(pcm.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached result for ``key``, or None."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serializable result under ``key``."""
+        self._remember(key, value)
+        self._write_disk(key, value)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl_seconds:
+                with self._disk_lock:
+                    self._remove(path, stat.st_size)
+                return None
+            with open(path, 'r') as f:
+                value = json.load(f)
+            # Touch the entry so size-based eviction removes least recently used first
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None
+
+    def _write_disk(self, key, value):
+        if not self.directory:
+            return
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            data = json.dumps(value).encode('utf-8')
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            with self._disk_lock:
+                # Rewriting an entry replaces its bytes rather than adding to them
+                try:
+                    replaced = os.stat(path).st_size
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(temp_path, path)
+                self._disk_bytes += len(data) - replaced
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict()
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {str(e)}")
+
+    def _disk_entries(self):
+        """Yield (path, mtime, size) for every entry in the disk tier."""
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def _remove(self, path, size):
+        """Delete an entry. Called with _disk_lock held."""
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        self._disk_bytes = max(0, self._disk_bytes - size)
+
+    def _evict(self):
+        """Delete expired entries, then least recently used ones until under the size limit."""
+        now = time.time()
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        self._disk_bytes = sum(size for _, _, size in entries)
+        for path, mtime, size in entries:
+            if self._disk_bytes <= self.max_disk_bytes * 0.9 and now - mtime <= self.ttl_seconds:
+                break
+            self._remove(path, size)
+
+    def stats(self):
+        """Return hit-rate statistics for both tiers."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'disk_enabled': bool(self.directory),
+                'disk_bytes': self._disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes,
+            }
+
+
+# Shared cache, created on first use
+cache = None
+_cache_lock = threading.Lock()
+
+
+def get_transcription_cache():
+    """Return the shared transcription cache configured from settings."""
+    global cache
+    if cache is None:
+        from django.conf import settings
+        with _cache_lock:
+            if cache is None:
+                cache = TranscriptionCache(
+                    max_entries=getattr(settings, 'TRANSCRIPTION_CACHE_SIZE', 512),
+                    directory=getattr(settings, 'TRANSCRIPTION_CACHE_DIR', None),
+                    ttl_seconds=getattr(settings, 'TRANSCRIPTION_CACHE_TTL', 86400),
+                    max_disk_bytes=getattr(settings, 'TRANSCRIPTION_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+                )
+    return cache
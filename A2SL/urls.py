@@ -14,7 +14,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from . import views
@@ -30,4 +30,12 @@ urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('transcribe/', views.transcribe, name='transcribe'),
+    path('transcribe/stats/', views.transcribe_stats, name='transcribe_stats'),
+    path('clip/<str:root>/<str:fingerprint_prefix>/<str:filename>', views.clip_file, name='clip_file'),
+    re_path(r'^clips/(?P<digest>[0-9a-f]{64})\.mp4$', views.clip_store_object, name='clip_store_object'),
+    path('clip-manifest/', views.clip_manifest, name='clip_manifest'),
+    re_path(r'^clip-manifest/(?P<version>[0-9a-f]{16})\.json$', views.clip_manifest_version, name='clip_manifest_version'),
+    path('sentence-video/', views.sentence_video, name='sentence_video'),
+    path('sw.js', views.service_worker, name='service_worker'),
+    path('ready/', views.readiness, name='ready'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT) + static('/assets/', document_root=os.path.join(settings.BASE_DIR, 'assets'))
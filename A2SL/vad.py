@@ -0,0 +1,135 @@
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# 25 ms analysis frames every 10 ms
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.010
+
+# Band holding most of the power of voiced speech
+SPEECH_BAND_HZ = (80.0, 4000.0)
+
+# Frames quieter than this are never speech, whatever the noise floor
+ABSOLUTE_FLOOR_DB = -55.0
+# Speech must be this much louder than the estimated noise floor
+NOISE_MARGIN_DB = 10.0
+# ...but never more than this far below the loudest frame, so clips that are
+# speech from start to end are not mistaken for noise
+PEAK_MARGIN_DB = 3.0
+# White noise has a spectral flatness around 0.56; voiced speech is far lower
+MAX_SPEECH_FLATNESS = 0.3
+# Minimum share of frame power inside SPEECH_BAND_HZ
+MIN_BAND_RATIO = 0.5
+
+EPSILON = 1e-10
+
+
+def frame_signal(samples, frame_length, hop_length):
+    """
+    Split audio into overlapping frames without copying.
+
+    Args:
+        samples (numpy.ndarray): 1-D audio
+        frame_length (int): Samples per frame
+        hop_length (int): Samples between frame starts
+
+    Returns:
+        numpy.ndarray: Read-only (n_frames, frame_length) view
+    """
+    if len(samples) < frame_length:
+        samples = np.pad(samples, (0, frame_length - len(samples)))
+    return np.lib.stride_tricks.sliding_window_view(samples, frame_length)[::hop_length]
+
+
+def frame_features(samples, sample_rate=SAMPLE_RATE, frame_seconds=FRAME_SECONDS, hop_seconds=HOP_SECONDS):
+    """
+    Compute per-frame energy and spectral features for a whole clip at once.
+
+    Args:
+        samples (numpy.ndarray): Mono float32 audio in [-1, 1]
+        sample_rate (int): Sample rate of ``samples``
+
+    Returns:
+        dict: 'energy_db' (frame RMS in dBFS), 'band_ratio' (share of power in
+            the speech band) and 'flatness' (spectral flatness, near 1 for
+            noise and near 0 for voiced speech), each of shape (n_frames,)
+    """
+    frame_length = int(frame_seconds * sample_rate)
+    hop_length = int(hop_seconds * sample_rate)
+    frames = frame_signal(np.asarray(samples, dtype=np.float32), frame_length, hop_length)
+
+    energy_db = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + EPSILON)
+
+    power = np.abs(np.fft.rfft(frames * np.hanning(frame_length).astype(np.float32), axis=1)) ** 2
+    freqs = np.fft.rfftfreq(frame_length, 1.0 / sample_rate)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+    total_power = np.sum(power, axis=1) + EPSILON
+    band_ratio = np.sum(power[:, band], axis=1) / total_power
+    flatness = np.exp(np.mean(np.log(power + EPSILON), axis=1)) / (np.mean(power, axis=1) + EPSILON)
+
+    return {'energy_db': energy_db, 'band_ratio': band_ratio, 'flatness': flatness}
+
+
+def speech_frames(features, noise_floor_db=None, hangover_frames=20):
+    """
+    Classify frames as speech.
+
+    Args:
+        features (dict): Output of frame_features
+        noise_floor_db (float): Noise floor estimate; defaults to the 10th
+            percentile of the frame energies
+        hangover_frames (int): Keep this many frames around detected speech
+            so word onsets and tails are not clipped
+
+    Returns:
+        numpy.ndarray: Boolean mask, one entry per frame
+    """
+    energy_db = features['energy_db']
+    if noise_floor_db is None:
+        noise_floor_db = np.percentile(energy_db, 10)
+    threshold = max(ABSOLUTE_FLOOR_DB, min(noise_floor_db + NOISE_MARGIN_DB, energy_db.max() - PEAK_MARGIN_DB))
+    speech = (
+        (energy_db > threshold)
+        & (features['band_ratio'] > MIN_BAND_RATIO)
+        & (features['flatness'] < MAX_SPEECH_FLATNESS)
+    )
+
+    if hangover_frames and speech.any():
+        kernel = np.ones(2 * hangover_frames + 1)
+        speech = np.convolve(speech.astype(np.float32), kernel, mode='same') > 0
+    return speech
+
+
+def trim_silence(samples, sample_rate=SAMPLE_RATE):
+    """
+    Trim leading and trailing silence from a clip.
+
+    Args:
+        samples (numpy.ndarray): Mono float32 audio
+        sample_rate (int): Sample rate of ``samples``
+
+    Returns:
+        tuple: (trimmed samples, info) where info has 'start' and 'end'
+            (seconds kept), 'removed_seconds' and 'silent' (True when the clip
+            had no speech at all, in which case the trimmed clip is empty)
+    """
+    duration = len(samples) / sample_rate
+    if len(samples) == 0:
+        return samples, {'start': 0.0, 'end': 0.0, 'removed_seconds': 0.0, 'silent': True}
+
+    speech = speech_frames(frame_features(samples, sample_rate))
+    if not speech.any():
+        return samples[:0], {'start': 0.0, 'end': 0.0, 'removed_seconds': duration, 'silent': True}
+
+    hop_length = int(HOP_SECONDS * sample_rate)
+    frame_length = int(FRAME_SECONDS * sample_rate)
+    indices = np.flatnonzero(speech)
+    start = int(indices[0] * hop_length)
+    end = min(len(samples), int(indices[-1] * hop_length + frame_length))
+    trimmed = samples[start:end]
+    return trimmed, {
+        'start': start / sample_rate,
+        'end': end / sample_rate,
+        'removed_seconds': duration - len(trimmed) / sample_rate,
+        'silent': False,
+    }
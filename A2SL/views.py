@@ -1,25 +1,35 @@
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, Http404, HttpResponseRedirect
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import login,logout
 from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 import nltk
 from django.contrib.staticfiles import finders
 from django.contrib.auth.decorators import login_required
 import speech_recognition as sr
+import io
 import os
 from django.conf import settings
 import socket
 import logging
 import requests
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlencode
 import time
 import json
+import hashlib
 from django.views.decorators.csrf import csrf_exempt
-from .transcribe import transcribe_audio
-from .sign_language import get_sign_videos
+from .transcribe import transcribe_audio, transcribe_words, decode_audio, decode_signature, model_status, vad_stats, is_ready, get_scheduler
+from .transcription_cache import get_transcription_cache
+from .resolver import get_resolver
+from .worker_pool import get_pool, pool_ready, PoolSaturated
+from .clip_index import get_clip_index, fingerprinted_url, CLIP_DIRECTORIES, FINGERPRINT_LENGTH
+from .clip_store import CLIP_STORE_DIRECTORY, OBJECTS_DIRECTORY, fingerprint
+from .clip_serving import serve_file, serve_content, IMMUTABLE
+from .clip_manifest import get_clip_manifest
+from .timeline import build_timeline
+from .sprite import SPRITE_ROOT, SPRITE_CHARACTERS, get_sprite
+from .stitching import get_sentence_cache, StitchingBusy
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -55,85 +65,6 @@ def about_view(request):
 def contact_view(request):
 	return render(request,'contact.html')
 
-def get_word_videos(word):
-	"""Get video paths for a word or its individual letters"""
-	videos = []
-	missing = []
-	
-	# First try with first letter capital and rest small
-	word_title = word.title()
-	logger.info(f"Processing word with title case: {word_title}")
-	
-	# Try the complete word in assets folder with title case
-	word_path = os.path.join('assets', f'{word_title}.mp4')
-	full_path = os.path.join(settings.BASE_DIR, word_path)
-	logger.info(f"Checking assets path with title case: {full_path}")
-	
-	if os.path.exists(full_path):
-		logger.info(f"Found complete word in assets with title case: {word_title}")
-		videos.append(word_title)
-		return videos, missing
-	
-	# If not in assets, try in static folder with title case
-	word_path = os.path.join('static', f'{word_title}.mp4')
-	full_path = os.path.join(settings.BASE_DIR, word_path)
-	logger.info(f"Checking static path with title case: {full_path}")
-	
-	if os.path.exists(full_path):
-		logger.info(f"Found complete word in static with title case: {word_title}")
-		videos.append(word_title)
-		return videos, missing
-	
-	# If title case doesn't work, try all caps
-	word_upper = word.upper()
-	logger.info(f"Trying with all caps: {word_upper}")
-	
-	# Try the complete word in assets folder with all caps
-	word_path = os.path.join('assets', f'{word_upper}.mp4')
-	full_path = os.path.join(settings.BASE_DIR, word_path)
-	logger.info(f"Checking assets path with all caps: {full_path}")
-	
-	if os.path.exists(full_path):
-		logger.info(f"Found complete word in assets with all caps: {word_upper}")
-		videos.append(word_upper)
-		return videos, missing
-	
-	# If not in assets, try in static folder with all caps
-	word_path = os.path.join('static', f'{word_upper}.mp4')
-	full_path = os.path.join(settings.BASE_DIR, word_path)
-	logger.info(f"Checking static path with all caps: {full_path}")
-	
-	if os.path.exists(full_path):
-		logger.info(f"Found complete word in static with all caps: {word_upper}")
-		videos.append(word_upper)
-		return videos, missing
-	
-	# If word video doesn't exist in either location, try individual letters
-	logger.info(f"Breaking down word into letters: {word_upper}")
-	for c in word_upper:
-		# First try letter in assets folder
-		letter_path = os.path.join('assets', f'{c}.mp4')
-		full_path = os.path.join(settings.BASE_DIR, letter_path)
-		logger.info(f"Checking letter in assets: {full_path}")
-		
-		if os.path.exists(full_path):
-			logger.info(f"Found letter in assets: {c}")
-			videos.append(c)
-		else:
-			# Try letter in static folder
-			letter_path = os.path.join('static', f'{c}.mp4')
-			full_path = os.path.join(settings.BASE_DIR, letter_path)
-			logger.info(f"Checking letter in static: {full_path}")
-			
-			if os.path.exists(full_path):
-				logger.info(f"Found letter in static: {c}")
-				videos.append(c)
-			else:
-				logger.warning(f"Missing video for letter: {c}")
-				missing.append(c)
-	
-	return videos, missing
-
 @login_required(login_url="login")
 def animation_view(request):
 	if request.method == 'POST':
@@ -142,6 +73,7 @@ def animation_view(request):
 			try:
 				data = json.loads(request.body)
 				text = data.get('text', '').upper()
+				compact = data.get('format') == 'compact'
 			except json.JSONDecodeError:
 				return JsonResponse({'error': 'Invalid JSON'}, status=400)
 		else:
@@ -156,31 +88,13 @@ def animation_view(request):
 					'error': 'Unsupported audio format. Please upload a WAV, MP3, OGG, M4A, or WebM file.'
 				})
 			
-			# Save the uploaded file temporarily
-			temp_path = os.path.join(settings.MEDIA_ROOT, 'temp_audio.wav')
+			# Read the upload into memory; nothing is written to disk
 			try:
-				logger.info(f"Attempting to save audio file to: {temp_path}")
-				# Ensure the media directory exists
-				os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-				
-				with open(temp_path, 'wb+') as destination:
-					for chunk in audio_file.chunks():
-						destination.write(chunk)
-				logger.info("Successfully saved audio file")
-			except PermissionError as e:
-				logger.error(f"Permission error saving audio file: {str(e)}")
-				return render(request, 'animation.html', {
-					'error': 'Permission denied while saving audio file. Please check directory permissions.'
-				})
-			except IOError as e:
-				logger.error(f"IO error saving audio file: {str(e)}")
-				return render(request, 'animation.html', {
-					'error': 'Error saving audio file. Please try again.'
-				})
+				audio_bytes = audio_file.read()
 			except Exception as e:
-				logger.error(f"Unexpected error saving audio file: {str(e)}")
+				logger.error(f"Error reading audio file: {str(e)}")
 				return render(request, 'animation.html', {
-					'error': 'Error saving audio file. Please try again.'
+					'error': 'Error reading audio file. Please try again.'
 				})
 			
 			# Initialize speech recognizer
@@ -199,7 +113,7 @@ def animation_view(request):
 				
 				for attempt in range(max_retries):
 					try:
-						with sr.AudioFile(temp_path) as source:
+						with sr.AudioFile(io.BytesIO(audio_bytes)) as source:
 							# Adjust for ambient noise
 							recognizer.adjust_for_ambient_noise(source)
 							audio_data = recognizer.record(source)
@@ -234,13 +148,6 @@ def animation_view(request):
 				return render(request, 'animation.html', {
 					'error': f'Error processing audio: {str(e)}'
 				})
-			finally:
-				# Clean up temporary file
-				try:
-					if os.path.exists(temp_path):
-						os.remove(temp_path)
-				except Exception as e:
-					logger.error(f"Error removing temporary file: {str(e)}")
 			
 			if not text:
 				return render(request, 'animation.html', {
@@ -256,14 +163,21 @@ def animation_view(request):
 		processed_words = []
 		missing_videos = []
 		word_video_mapping = {}  # To keep track of which videos correspond to which words
+		playlist = []  # What the player plays, one entry per processed word
 		
-		for word in words:
-			videos, missing = get_word_videos(word)
+		resolver = get_resolver()
+		for resolved in resolver.resolve(words):
+			videos = [clip.name for clip in resolved.clips]
 			if videos:
 				processed_words.extend(videos)
-				word_video_mapping[word] = videos
-			if missing:
-				missing_videos.extend(missing)
+				word_video_mapping[resolved.word.upper()] = videos
+			if resolved.segments:
+				# Fingerspelled from the sprite: every letter is a time range of one file
+				playlist.extend({'src': resolver.sprite.url, 'start': start, 'end': end} for start, end in resolved.segments)
+			else:
+				playlist.extend({'src': clip.url} for clip in resolved.clips)
+			if resolved.missing:
+				missing_videos.extend(resolved.missing)
 
 		if not processed_words:
 			if request.headers.get('Content-Type') == 'application/json':
@@ -282,10 +196,15 @@ def animation_view(request):
 			logger.warning(f"Missing videos for words/letters: {missing_videos}")
 
 		if request.headers.get('Content-Type') == 'application/json':
+			if compact:
+				return JsonResponse(compact_playlist(playlist, text, missing_videos))
 			return JsonResponse({
 				'words': processed_words,
 				'text': text,
 				'word_video_mapping': word_video_mapping,
+				'playlist': playlist,
+				# Whole sentence as one MP4, for clients that play a single video
+				'sentence_video': sentence_video_url(processed_words),
 				'missing_videos': missing_videos if missing_videos else None
 			})
 		
@@ -293,6 +212,7 @@ def animation_view(request):
 			'words': processed_words,
 			'text': text,
 			'word_video_mapping': word_video_mapping,
+			'playlist': playlist,
 			'missing_videos': missing_videos if missing_videos else None
 		})
 	else:
@@ -338,6 +258,168 @@ def logout_view(request):
 def home(request):
 	return render(request, 'A2SL/home.html')
 
+def readiness(request):
+	"""Report whether this worker's Whisper model is loaded and warmed up (503 until it is, in warm-start mode)"""
+	if settings.TRANSCRIBE_WORKERS:
+		# Inference runs in the pool's workers, which warm up after forking
+		warm = pool_ready()
+	else:
+		warm = is_ready()
+	ready = warm or not settings.WHISPER_WARM_START
+	return JsonResponse({
+		'ready': ready,
+		'warm_start': settings.WHISPER_WARM_START,
+		'settings_import_seconds': settings.SETTINGS_IMPORT_SECONDS,
+		**model_status,
+	}, status=200 if ready else 503)
+
+def transcribe_stats(request):
+	"""Report cache, batching and worker pool metrics for this process"""
+	batcher = get_scheduler()
+	pool = get_pool()
+	return JsonResponse({
+		'resolver': get_resolver().stats(),
+		'batching': batcher.stats() if batcher is not None else None,
+		'workers': pool.stats() if pool is not None else None,
+		'transcription_cache': get_transcription_cache().stats(),
+		'sentence_video': get_sentence_cache().stats(),
+		# In worker pool mode trimming runs in the workers and is not counted here
+		'vad': dict(vad_stats),
+	})
+
+def compact_playlist(playlist, text, missing_videos):
+	"""Animation response with manifest clip IDs instead of URLs"""
+	manifest = get_clip_manifest()
+	sprite = get_resolver().sprite
+	items = []
+	durations = []
+	for item in playlist:
+		if 'start' in item:
+			# Sprite segments are sent as [start, end] into the sprite
+			items.append([item['start'], item['end']])
+			durations.append(round(item['end'] - item['start'], 3))
+		else:
+			ids, item_durations = manifest.compact([item['src']])
+			items.append(ids[0])
+			durations.append(item_durations[0])
+	return {
+		'text': text,
+		'manifest': manifest.version,
+		'sprite': sprite.url if sprite is not None else None,
+		'playlist': items,
+		'durations': durations,
+		'missing_videos': missing_videos if missing_videos else None,
+	}
+
+def clip_manifest(request):
+	"""Current clip manifest; revalidated on every use via its ETag"""
+	manifest = get_clip_manifest()
+	response = serve_content(request, manifest.content, 'application/json', manifest.version, 'no-cache')
+	response['Content-Location'] = f"/clip-manifest/{manifest.version}.json"
+	return response
+
+def clip_manifest_version(request, version):
+	"""A specific manifest version, cacheable forever"""
+	manifest = get_clip_manifest()
+	if version != manifest.version:
+		return JsonResponse({'error': 'Manifest version no longer available', 'version': manifest.version}, status=404)
+	return serve_content(request, manifest.content, 'application/json', manifest.version, IMMUTABLE)
+
+def service_worker_precache():
+	"""Clip URLs the service worker caches on install: alphabet, sprite and frequent words"""
+	index = get_clip_index()
+	urls = []
+	for word in list(SPRITE_CHARACTERS) + settings.SERVICE_WORKER_PRECACHE_WORDS:
+		clip = index.lookup(word)
+		if clip is not None and clip.url not in urls:
+			urls.append(clip.url)
+	sprite = get_sprite()
+	if sprite is not None:
+		urls.append(sprite.url)
+	return urls
+
+def service_worker(request):
+	"""Clip-caching service worker; served from the site root so its scope covers every page"""
+	manifest = get_clip_manifest()
+	content = render_to_string('sw.js', {
+		'version': manifest.version,
+		'precache': json.dumps(service_worker_precache()),
+		'runtime_limit': settings.SERVICE_WORKER_RUNTIME_CLIPS,
+	}).encode('utf-8')
+	# The script changes with the manifest, which is what makes browsers install the new version
+	etag = hashlib.sha256(content).hexdigest()[:16]
+	response = serve_content(request, content, 'application/javascript', etag, 'no-cache')
+	response['Service-Worker-Allowed'] = '/'
+	return response
+
+def sentence_video_url(clip_names):
+	"""URL of the stitched video for a sequence of clip names"""
+	return '/sentence-video/?' + urlencode({'clip': clip_names}, doseq=True)
+
+def sentence_video(request):
+	"""Serve a resolved clip sequence (?clip=Hello&clip=World) as one stitched MP4"""
+	if request.method != 'GET':
+		return JsonResponse({'error': 'Method not allowed'}, status=405)
+	
+	names = request.GET.getlist('clip')
+	if not names:
+		return JsonResponse({'error': 'No clips requested'}, status=400)
+	if len(names) > settings.SENTENCE_VIDEO_MAX_CLIPS:
+		return JsonResponse({'error': f'At most {settings.SENTENCE_VIDEO_MAX_CLIPS} clips per video'}, status=400)
+	
+	# Only clips from the library can be stitched; names never reach the filesystem
+	index = get_clip_index()
+	clips = []
+	for name in names:
+		clip = index.lookup(name)
+		if clip is None:
+			return JsonResponse({'error': f'Unknown clip: {name}'}, status=404)
+		clips.append(clip)
+	
+	try:
+		# Opened, not just located: eviction can delete the file at any time
+		file, path = get_sentence_cache().open(clips)
+	except StitchingBusy:
+		response = JsonResponse({'error': 'Server busy, please retry shortly'}, status=503)
+		response['Retry-After'] = str(settings.TRANSCRIBE_RETRY_AFTER)
+		return response
+	except Exception as e:
+		logger.error(f"Error stitching sentence video: {str(e)}", exc_info=True)
+		return JsonResponse({'error': 'Could not build sentence video'}, status=500)
+	
+	# Named by a hash of the clip sequence; clip names can be re-pointed, so
+	# clients revalidate daily instead of caching forever
+	key = os.path.splitext(os.path.basename(path))[0]
+	return serve_file(request, path, etag=key, cache_control='public, max-age=86400', file=file)
+
+def _served_roots():
+	"""Directories that /clip/<root>/... may serve from"""
+	roots = {directory: os.path.join(settings.BASE_DIR, directory) for directory in CLIP_DIRECTORIES}
+	roots[SPRITE_ROOT] = settings.FINGERSPELL_SPRITE_DIR
+	return roots
+
+def clip_file(request, root, fingerprint_prefix, filename):
+	"""Serve a clip by fingerprinted URL (/clip/<root>/<fingerprint>/<file>), cacheable forever"""
+	directory = _served_roots().get(root)
+	if directory is None or filename.startswith('.') or not filename.lower().endswith('.mp4'):
+		raise Http404('Unknown clip')
+	path = os.path.join(directory, filename)
+	if not os.path.isfile(path):
+		raise Http404('Unknown clip')
+	
+	digest = fingerprint(path)
+	if fingerprint_prefix != digest[:FINGERPRINT_LENGTH]:
+		# The clip changed since this URL was issued; point at the current content
+		return HttpResponseRedirect(fingerprinted_url(root, path))
+	return serve_file(request, path, etag=digest)
+
+def clip_store_object(request, digest):
+	"""Serve a content-addressed clip from the clip store (/clips/<sha256>.mp4)"""
+	path = os.path.join(settings.BASE_DIR, CLIP_STORE_DIRECTORY, OBJECTS_DIRECTORY, f"{digest}.mp4")
+	if not os.path.isfile(path):
+		raise Http404('Unknown clip')
+	return serve_file(request, path, etag=digest)
+
 @csrf_exempt
 def transcribe(request):
 	if request.method == 'POST':
@@ -361,65 +443,19 @@ def transcribe(request):
 					# Treat as binary audio data
 					logger.info("Received binary data with JSON content type")
 					
-			# Handle audio file upload or binary data
+			# Handle audio file upload or binary data, decoded in memory
 			if 'audio' in request.FILES:
 				# Normal file upload
-				audio_file = request.FILES['audio']
-				temp_path = None
-				
-				try:
-					# Save the uploaded file temporarily
-					temp_path = os.path.join(settings.MEDIA_ROOT, f'temp_{audio_file.name}')
-					logger.info(f"Saving audio file to: {temp_path}")
-					os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-					
-					with open(temp_path, 'wb+') as destination:
-						for chunk in audio_file.chunks():
-							destination.write(chunk)
-					logger.info("Successfully saved audio file")
-					
-					# Process the audio file
-					return process_audio_file(temp_path)
-					
-				except Exception as e:
-					logger.error(f"Error processing audio: {str(e)}", exc_info=True)
-					return JsonResponse({'error': str(e)}, status=500)
-					
-				finally:
-					# Clean up the temporary file
-					if temp_path and os.path.exists(temp_path):
-						try:
-							os.remove(temp_path)
-							logger.info("Cleaned up temporary file")
-						except Exception as e:
-							logger.error(f"Error removing temporary file: {e}")
+				audio_bytes = request.FILES['audio'].read()
 			else:
 				# Binary data in request body
-				try:
-					# Save the binary data to a temporary file
-					temp_path = os.path.join(settings.MEDIA_ROOT, 'temp_audio.wav')
-					logger.info(f"Saving binary audio data to: {temp_path}")
-					os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-					
-					with open(temp_path, 'wb') as destination:
-						destination.write(request.body)
-					logger.info("Successfully saved binary audio data")
-					
-					# Process the audio file
-					return process_audio_file(temp_path)
-					
-				except Exception as e:
-					logger.error(f"Error processing binary audio data: {str(e)}", exc_info=True)
-					return JsonResponse({'error': str(e)}, status=500)
-					
-				finally:
-					# Clean up the temporary file
-					if temp_path and os.path.exists(temp_path):
-						try:
-							os.remove(temp_path)
-							logger.info("Cleaned up temporary file")
-						except Exception as e:
-							logger.error(f"Error removing temporary file: {e}")
+				audio_bytes = request.body
+			logger.info(f"Received {len(audio_bytes)} bytes of audio")
+			return process_audio(
+				audio_bytes,
+				compact=request.GET.get('format') == 'compact',
+				timeline=request.GET.get('timeline') in ('1', 'true'),
+			)
 				
 		except Exception as e:
 			logger.error(f"Error in POST /transcribe/: {str(e)}", exc_info=True)
@@ -427,28 +463,105 @@ def transcribe(request):
 			
 	return JsonResponse({'error': 'Method not allowed'}, status=405)
 
-def process_audio_file(temp_path):
-	"""Process an audio file and return transcription and videos"""
+def compact_result(result):
+	"""Transcription response with manifest clip IDs and durations instead of URLs"""
+	manifest = get_clip_manifest()
+	clips, durations = manifest.compact(result['videos'])
+	compact = {
+		'text': result['text'],
+		'formatted_words': result['formatted_words'],
+		'manifest': manifest.version,
+		'clips': clips,
+		'durations': durations,
+	}
+	if 'timeline' in result:
+		compact['timeline'] = [
+			{**entry, 'clip': manifest.compact([entry['clip']])[0][0]}
+			for entry in result['timeline']
+		]
+	return compact
+
+def process_audio(audio, compact=False, timeline=False):
+	"""
+	Transcribe audio (encoded bytes or a PCM array) and return transcription and videos.
+	'formatted_words' and 'videos' are per sign, not per word of 'text' (see resolve_transcript).
+	With compact=True, videos are returned as clip manifest IDs plus durations.
+	With timeline=True, the response adds a 'timeline' of {word, clip, t_start, t_end}
+	from Whisper's word timestamps.
+	"""
 	try:
-		# Transcribe the audio
-		logger.info("Starting audio transcription")
-		transcription = transcribe_audio(temp_path)
-		logger.info(f"Transcription result: {transcription}")
+		samples = decode_audio(audio)
 		
-		# Modify transcription to capitalize each word
-		formatted_words = [word.capitalize() for word in transcription.split()]
-		transcription = ' '.join(formatted_words)
-		
-		# Get sign language videos for the transcribed text
-		logger.info("Getting sign language videos")
-		videos = get_sign_videos(transcription, settings.BASE_DIR)
-		logger.info(f"Found {len(videos)} videos")
+		# Identical audio (retries, duplicate uploads) is answered from the cache.
+		# Only the transcript is cached; clips are resolved against the current
+		# library every time, so added or renamed clips show up immediately.
+		cache = get_transcription_cache()
+		model_name, options = decode_signature()
+		cache_key = cache.make_key(samples, model_name, {**options, 'timeline': timeline})
+		transcript = cache.get(cache_key)
+		if transcript is not None:
+			logger.info("Transcription cache hit")
+		else:
+			transcript = transcribe_samples(samples, timeline)
+			cache.put(cache_key, transcript)
 		
-		return JsonResponse({
-			'text': transcription,
-			'videos': videos,
-			'formatted_words': formatted_words
-		})
+		result = resolve_transcript(transcript['text'], transcript['words'])
+		return JsonResponse(compact_result(result) if compact else result)
+	except PoolSaturated as e:
+		logger.warning(f"Transcription pool saturated: {str(e)}")
+		response = JsonResponse({'error': 'Server busy, please retry shortly'}, status=503)
+		response['Retry-After'] = str(settings.TRANSCRIBE_RETRY_AFTER)
+		return response
 	except Exception as e:
 		logger.error(f"Error processing audio: {str(e)}", exc_info=True)
 		return JsonResponse({'error': str(e)}, status=500)
+
+def transcribe_samples(samples, timeline=False):
+	"""
+	Run the model on decoded audio.
+	Returns {'text', 'words'}, with words (Whisper word timestamps) only when timeline=True.
+	"""
+	logger.info("Starting audio transcription")
+	pool = get_pool()
+	words = None
+	if timeline:
+		if pool is not None:
+			words = pool.transcribe(samples, timeout=settings.TRANSCRIBE_TIMEOUT, words=True)
+		else:
+			words = transcribe_words(samples, vad=True)
+		transcription = ' '.join(word['word'] for word in words)
+	elif pool is not None:
+		transcription = pool.transcribe(samples, timeout=settings.TRANSCRIBE_TIMEOUT)
+	else:
+		transcription = transcribe_audio(samples)
+	logger.info(f"Transcription result: {transcription}")
+	return {'text': transcription, 'words': words}
+
+def resolve_transcript(transcription, words=None):
+	"""
+	Map a transcript onto sign videos (and, given word timestamps, a timeline) with the current clips.
+	
+	'text' is the whole transcript. 'formatted_words' and 'videos' have one entry
+	per sign, and a phrase with its own clip is a single sign, so they can be
+	shorter than text.split(): "thank you do not walking went party turn" gives
+	8 words but 6 signs, ['Thank you', 'Do not', 'Walking', 'Went', 'Party', 'Turn'].
+	Pair videos with formatted_words, never with the words of 'text'.
+	"""
+	# Modify transcription to capitalize each word
+	transcription = ' '.join(word.capitalize() for word in transcription.split())
+	
+	# Get sign language videos for the transcribed text, one entry per sign
+	# ('' where it has no video) so clients can pair them up directly
+	resolved = get_resolver().resolve(transcription.split(), fingerspell=False)
+	formatted_words = [item.word.capitalize() for item in resolved]
+	videos = [item.clips[0].url if item.clips else '' for item in resolved]
+	logger.info(f"Found {sum(1 for video in videos if video)} videos")
+	
+	result = {
+		'text': transcription,
+		'videos': videos,
+		'formatted_words': formatted_words
+	}
+	if words is not None:
+		result['timeline'] = build_timeline(words, get_resolver(), get_clip_manifest())
+	return result
@@ -0,0 +1,298 @@
+import os
+import time
+import itertools
+import threading
+import logging
+import collections
+import multiprocessing
+from concurrent.futures import Future
+import torch
+from . import transcribe
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Messages from workers: (kind, worker index, request id, result, error)
+WORKER_READY = 'ready'
+WORKER_RESULT = 'result'
+
+# Seconds between checks for dead workers
+WORKER_CHECK_INTERVAL = 1.0
+
+# Imported by the forkserver before it forks any worker; loads the model
+PRELOAD_MODULE = 'A2SL.worker_preload'
+
+
+class PoolSaturated(Exception):
+    """Raised when the transcription pool's request queue is full."""
+
+
+class WorkerDied(RuntimeError):
+    """Raised for a request whose worker exited before returning a result."""
+
+
+def _pss_mb(pid):
+    """Proportional set size of a process in MB (shared pages split between their users), or None off Linux."""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _worker_main(index, tasks, results, torch_threads):
+    """Worker loop: warm up the model, then transcribe the tasks sent to this worker."""
+    # Split the cores between workers instead of every worker using all of them
+    torch.set_num_threads(torch_threads)
+    # Under forkserver the model is already loaded and shared; this only runs
+    # the warm-up inference (under spawn it loads a private copy first)
+    transcribe.warm_start()
+    if transcribe.is_ready():
+        results.put((WORKER_READY, index, None, None, None))
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        request_id, audio, words, initial_prompt = task
+        try:
+            if words:
+                result = transcribe.transcribe_words(audio, initial_prompt=initial_prompt, vad=True)
+            else:
+                result = transcribe.transcribe_audio(audio, batch=False)
+            results.put((WORKER_RESULT, index, request_id, result, None))
+        except Exception as e:
+            results.put((WORKER_RESULT, index, request_id, None, str(e)))
+
+
+class TranscriptionPool:
+    """
+    Pool of transcription worker processes.
+
+    Workers are not forked from the Django process: it already runs threads
+    (clip index watcher, request threads), and a forked child could inherit
+    a lock one of them was holding. They are forked from a 'forkserver'
+    instead, a fresh single-threaded process that loads the model once (see
+    worker_preload) before forking any worker, so all workers share the
+    weight pages copy-on-write. Where forkserver is unavailable workers are
+    spawned, and each loads its own copy.
+
+    The parent hands each worker one request at a time, so it always knows
+    what a worker is running. A worker that dies is replaced and its request
+    fails at once. At most ``max_pending`` requests may be queued or running;
+    a request keeps its slot until its worker reports back, even if the
+    caller stopped waiting. Beyond that ``submit`` raises PoolSaturated
+    instead of queueing.
+    """
+
+    def __init__(self, workers, max_pending=32, torch_threads=None):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context('forkserver')
+            self._context.set_forkserver_preload([PRELOAD_MODULE])
+        else:
+            self._context = multiprocessing.get_context('spawn')
+        # Requests waiting for a worker, oldest first
+        self._queue = collections.deque()
+        # request id -> Future, for every queued or running request
+        self._pending = {}
+        self._processes = [None] * self.workers
+        self._task_queues = [None] * self.workers
+        # worker index -> request id it is running
+        self._running = {}
+        self._ready = set()
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.respawned = 0
+        self._closed = False
+
+    def start(self):
+        """Start the workers and the threads that collect results and watch for dead workers."""
+        self._results = self._context.Queue()
+        with self._lock:
+            for index in range(self.workers):
+                self._start_worker(index)
+
+        threading.Thread(target=self._collect_results, name='transcribe-pool-results', daemon=True).start()
+        threading.Thread(target=self._monitor_workers, name='transcribe-pool-monitor', daemon=True).start()
+        logger.info(f"Started {self.workers} transcription workers ({self._context.get_start_method()}) "
+                    f"with {self.torch_threads} torch threads each")
+        return self
+
+    def _start_worker(self, index):
+        # Each worker gets its own task queue, so a dead worker can't take a
+        # task from the shared backlog with it
+        tasks = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, tasks, self._results, self.torch_threads),
+            name=f'transcribe-worker-{index}',
+            daemon=True,
+        )
+        process.start()
+        self._processes[index] = process
+        self._task_queues[index] = tasks
+
+    def _dispatch(self):
+        """Hand queued requests to idle workers. Called with the lock held."""
+        for index in range(self.workers):
+            if not self._queue:
+                return
+            if index in self._running or not self._processes[index].is_alive():
+                continue
+            task = self._queue.popleft()
+            self._running[index] = task[0]
+            self._task_queues[index].put(task)
+
+    def _finish(self, request_id, result=None, error=None):
+        """Resolve a request and free its slot. Called with the lock held."""
+        future = self._pending.pop(request_id, None)
+        if future is None:
+            return
+        if error is None:
+            self.completed += 1
+            future.set_result(result)
+        else:
+            self.failed += 1
+            future.set_exception(error)
+
+    def _collect_results(self):
+        while True:
+            kind, index, request_id, result, error = self._results.get()
+            with self._lock:
+                if kind == WORKER_READY:
+                    self._ready.add(index)
+                    continue
+                if self._running.get(index) == request_id:
+                    del self._running[index]
+                self._finish(request_id, result, RuntimeError(error) if error is not None else None)
+                self._dispatch()
+
+    def _monitor_workers(self):
+        while not self._closed:
+            time.sleep(WORKER_CHECK_INTERVAL)
+            with self._lock:
+                if self._closed:
+                    return
+                for index, process in enumerate(self._processes):
+                    if process.is_alive():
+                        continue
+                    request_id = self._running.pop(index, None)
+                    self._ready.discard(index)
+                    logger.error(f"Transcription worker {index} exited with code {process.exitcode}; restarting it")
+                    if request_id is not None:
+                        self._finish(request_id, error=WorkerDied(f"Transcription worker exited with code {process.exitcode}"))
+                    self._start_worker(index)
+                    self.respawned += 1
+                self._dispatch()
+
+    def submit(self, audio, words=False, initial_prompt=None):
+        """
+        Queue audio for transcription by a worker.
+
+        Args:
+            audio: Encoded audio bytes or a float32 PCM array (see transcribe.decode_audio)
+            words (bool): Return word timestamps (transcribe.transcribe_words) instead of text
+            initial_prompt (str): Decoding context, with ``words`` only
+
+        Returns:
+            concurrent.futures.Future: Resolves to the transcribed text or word list
+
+        Raises:
+            PoolSaturated: If max_pending requests are already in flight
+        """
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                raise PoolSaturated(f"{self.max_pending} transcriptions already pending")
+            future = Future()
+            request_id = future.request_id = next(self._ids)
+            self._pending[request_id] = future
+            self._queue.append((request_id, audio, words, initial_prompt))
+            self._dispatch()
+        return future
+
+    def transcribe(self, audio, timeout=None, words=False, initial_prompt=None):
+        """Transcribe audio on a worker and wait for the text (or word timestamps)."""
+        future = self.submit(audio, words=words, initial_prompt=initial_prompt)
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            # A request no worker has started can be dropped now. One that is
+            # running keeps its slot until the worker reports back.
+            with self._lock:
+                for task in self._queue:
+                    if task[0] == future.request_id:
+                        self._queue.remove(task)
+                        self._pending.pop(future.request_id, None)
+                        break
+            raise
+
+    def is_ready(self):
+        """Return True once every worker has finished its warm-up inference."""
+        with self._lock:
+            return len(self._ready) >= self.workers
+
+    def stats(self):
+        """Return worker and queue metrics."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'alive': sum(1 for process in self._processes if process is not None and process.is_alive()),
+                'start_method': self._context.get_start_method(),
+                # Compare with a single model's size to check the weights are shared
+                'worker_pss_mb': [_pss_mb(process.pid) if process is not None else None for process in self._processes],
+                'ready': len(self._ready),
+                'torch_threads': self.torch_threads,
+                'queued': len(self._queue),
+                'running': len(self._running),
+                'pending': len(self._pending),
+                'max_pending': self.max_pending,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'respawned': self.respawned,
+            }
+
+    def shutdown(self):
+        """Ask the workers to exit once they finish their current request."""
+        with self._lock:
+            self._closed = True
+            for tasks in self._task_queues:
+                tasks.put(None)
+
+
+# Shared pool, started on first use when enabled
+pool = None
+_pool_lock = threading.Lock()
+
+
+def pool_ready():
+    """Return True if the shared pool is running and all its workers are warm; never starts it."""
+    return pool is not None and pool.is_ready()
+
+
+def get_pool():
+    """Return the shared transcription pool, or None when TRANSCRIBE_WORKERS is 0."""
+    global pool
+    if pool is None:
+        from django.conf import settings
+        workers = getattr(settings, 'TRANSCRIBE_WORKERS', 0)
+        if not workers:
+            return None
+        with _pool_lock:
+            if pool is None:
+                pool = TranscriptionPool(
+                    workers,
+                    max_pending=getattr(settings, 'TRANSCRIBE_MAX_PENDING', 32),
+                    torch_threads=getattr(settings, 'TRANSCRIBE_TORCH_THREADS', None),
+                ).start()
+    return pool
@@ -0,0 +1,30 @@
+"""
+Preloaded by the transcription pool's forkserver (see worker_pool).
+
+Importing this module loads the Whisper model in the forkserver, a fresh
+process with no other threads, before any worker is forked from it. Every
+worker then shares the model's weight pages copy-on-write instead of
+loading its own copy.
+"""
+import gc
+import logging
+import torch
+from . import transcribe
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Keep torch from starting its intra-op thread pool here, so the forkserver
+# stays single-threaded; each worker sets its own thread count after the fork
+torch.set_num_threads(1)
+
+try:
+    transcribe.get_model()
+except Exception as e:
+    # Workers load the model themselves (and report the error) instead
+    logger.error(f"Could not preload the Whisper model: {str(e)}", exc_info=True)
+
+# Keep the garbage collector from writing to the loaded objects' headers,
+# which would copy their pages into every worker
+gc.freeze()
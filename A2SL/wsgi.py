@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SL.settings')
 
 application = get_wsgi_application()
+
+# Only processes that serve requests load the model (see A2SL.apps)
+from .apps import warm_start_in_background
+
+warm_start_in_background()
@@ -3,7 +3,9 @@ import numpy as np
 import requests
 import threading
 import queue
+import collections
 import time
+import io
 import wave
 import tempfile
 import os
@@ -11,6 +13,8 @@ import sys
 import logging
 import webbrowser
 from http.server import HTTPServer, SimpleHTTPRequestHandler
+from A2SL.segmentation import UtteranceSegmenter
+from A2SL.ring_buffer import AudioRingBuffer
 import threading
 import argparse
 import subprocess
@@ -41,10 +45,13 @@ class VideoDisplayServer(threading.Thread):
             self.server.server_close()
 
 class AudioCapture:
-    def __init__(self, sample_rate=16000, channels=1, allow_mic=False):
+    def __init__(self, sample_rate=16000, channels=1, allow_mic=False, max_in_flight=2):
         self.sample_rate = sample_rate
         self.channels = channels
-        self.audio_queue = queue.Queue()
+        # Captured audio, written by the PortAudio callback and analyzed by process_audio
+        self.block_size = 1024
+        self.ring = AudioRingBuffer(sample_rate * 30, channels)
+        self.stream_status = None
         self.is_recording = False
         self.stream = None
         self.video_server = VideoDisplayServer()
@@ -57,6 +64,26 @@ class AudioCapture:
         self.last_gmeet_check = 0
         self.own_voice_threshold = 0.45  # Threshold to identify user's own voice (higher values)
         
+        # Chunks are uploaded by max_in_flight threads so capture never waits on the
+        # network. At most max_in_flight more wait to be sent; older ones are dropped.
+        self.max_in_flight = max_in_flight
+        self.upload_queue = queue.Queue(maxsize=max_in_flight)
+        self.upload_threads = []
+        self.next_sequence = 0
+        # Results are displayed in capture order, whichever upload finishes first.
+        # In-order results wait in display_backlog; one upload thread at a time
+        # displays them, outside results_lock, so others can keep delivering.
+        self.results_lock = threading.Lock()
+        self.completed_results = {}
+        self.next_display_sequence = 0
+        self.display_backlog = collections.deque()
+        self.displaying = False
+        self.dropped_chunks = 0
+        
+        # After a connection error, chunks are dropped until this time instead of each one retrying
+        self.server_retry_interval = 2.0
+        self.server_retry_at = 0
+        
         # Create static directory if it doesn't exist
         os.makedirs('static', exist_ok=True)
         
@@ -424,78 +451,21 @@ class AudioCapture:
     
     def audio_callback(self, indata, frames, time, status):
         """This is called for each audio block from the output device."""
+        # Runs on the real-time audio thread: no logging, analysis or allocation
+        # here, just a copy into the ring buffer. process_audio does the rest.
         if status:
-            logger.warning(f"Status: {status}")
-            
-        # Check if Google Meet is active - if not, don't process the audio
-        if not self.check_google_meet_active():
-            # Occasionally log that we're waiting for Google Meet
-            if np.random.random() < 0.01:  # 1% chance to log
-                logger.info("Waiting for Google Meet to become active")
-            return
-        
-        # Calculate audio level - used for speech detection
-        audio_level = np.abs(indata).mean()
-        
-        # Debug: Occasionally print the audio level for monitoring
-        if np.random.random() < 0.01:  # 1% chance to log level for monitoring
-            logger.debug(f"Current audio level: {audio_level:.6f}")
-        
-        # Skip processing if the audio level is very high (likely user's own voice)
-        if audio_level > self.own_voice_threshold:
-            if np.random.random() < 0.05:  # 5% chance to log
-                logger.info(f"Skipping likely own voice: level={audio_level:.6f}")
-            return
-        
-        # Enhanced spectral characteristics detection specifically for Google Meet speech
-        is_speech_like = False
-        is_call_audio = False
-        
-        if len(indata) > 0:
-            # Extract first channel if multichannel
-            audio_data = indata[:, 0] if indata.ndim > 1 else indata
-            
-            # Calculate power spectrum
-            if len(audio_data) >= 256:  # Ensure we have enough samples
-                spectrum = np.abs(np.fft.rfft(audio_data[:256]))
-                
-                # Enhanced speech detection for call audio
-                if len(spectrum) > 45:
-                    # Google Meet and video call speech typically has more energy in 300-3000 Hz range
-                    speech_energy = np.sum(spectrum[5:45])
-                    total_energy = np.sum(spectrum)
-                    
-                    if total_energy > 0:
-                        speech_ratio = speech_energy / total_energy
-                        
-                        # More lenient threshold for speech detection in call audio
-                        is_speech_like = speech_ratio > 0.4  # Was 0.45
-                        
-                        # Call audio also has specific frequency characteristics
-                        # Higher frequencies are often filtered out in call audio
-                        high_freq_energy = np.sum(spectrum[45:]) if len(spectrum) > 45 else 0
-                        high_freq_ratio = high_freq_energy / total_energy if total_energy > 0 else 0
-                        
-                        # Call audio typically has less high-frequency energy - more lenient criteria
-                        is_call_audio = high_freq_ratio < 0.2 and is_speech_like  # Was 0.15
-                        
-                        if is_speech_like and np.random.random() < 0.05:  # Log occasionally
-                            logger.debug(f"Speech ratio: {speech_ratio:.2f}, High freq ratio: {high_freq_ratio:.2f}")
-        
-        # Lower threshold specifically for Google Meet/call audio
-        # Call audio is typically lower volume than normal audio
-        call_audio_threshold = 0.0002  # Very low threshold for call audio (was 0.0003)
-        
-        # Queue audio if ANY of the following conditions are true:
-        # 1. Has speech-like spectral characteristics 
-        # 2. OR appears to be call audio
-        # 3. OR has sufficient audio level to potentially be speech
-        if (is_speech_like or is_call_audio or audio_level > call_audio_threshold):
-            # Log detection reasoning occasionally
-            if np.random.random() < 0.02:  # 2% chance
-                logger.info(f"Capturing audio: level={audio_level:.6f}, speech-like={is_speech_like}, call-audio={is_call_audio}")
-            
-            self.audio_queue.put(indata.copy())
+            self.stream_status = status
+        self.ring.write(indata)
+    
+    def report_capture_problems(self, reported):
+        """Log stream status flags and ring buffer overflows raised since the last call."""
+        if self.stream_status is not None:
+            logger.warning(f"Status: {self.stream_status}")
+            self.stream_status = None
+        if self.ring.overflow_blocks != reported:
+            logger.warning(f"Audio buffer full: dropped {self.ring.overflow_frames} frames "
+                           f"in {self.ring.overflow_blocks} blocks so far")
+        return self.ring.overflow_blocks
     
     def start_recording(self):
         """Start recording audio from the output device."""
@@ -636,6 +606,11 @@ class AudioCapture:
         # Start processing thread
         self.process_thread = threading.Thread(target=self.process_audio)
         self.process_thread.start()
+        
+        # Start upload threads
+        self.upload_threads = [threading.Thread(target=self.upload_worker, daemon=True) for _ in range(self.max_in_flight)]
+        for thread in self.upload_threads:
+            thread.start()
     
     def stop_recording(self):
         """Stop recording audio."""
@@ -645,18 +620,27 @@ class AudioCapture:
             self.stream.close()
         if hasattr(self, 'process_thread'):
             self.process_thread.join()
+        for thread in self.upload_threads:
+            thread.join()
         self.video_server.stop()
     
-    def save_audio_to_wav(self, audio_data, filename):
-        """Save audio data to a WAV file."""
+    def encode_wav(self, audio_data):
+        """Encode audio data as 16-bit PCM WAV bytes, in memory."""
         # Normalize audio data
         audio_data = np.clip(audio_data, -1.0, 1.0)
         
-        with wave.open(filename, 'wb') as wf:
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wf:
             wf.setnchannels(self.channels)
             wf.setsampwidth(2)  # 2 bytes per sample
             wf.setframerate(self.sample_rate)
             wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
+        return buffer.getvalue()
+    
+    def save_audio_to_wav(self, audio_data, filename):
+        """Save audio data to a WAV file."""
+        with open(filename, 'wb') as f:
+            f.write(self.encode_wav(audio_data))
     
     def display_videos(self, videos_data):
         """Display sign language words in the browser, stacked vertically with last word at top."""
@@ -902,257 +886,266 @@ class AudioCapture:
         return [s.strip() for s in sentences if s.strip()]
     
     def process_audio(self):
-        """Process recorded audio and send to backend."""
-        buffer = []
-        buffer_duration = 2.0  # seconds - even shorter for Google Meet audio to be more responsive
-        samples_per_buffer = self.sample_rate * buffer_duration
-        
+        """Split recorded audio into utterances and send each to the backend."""
         # Server URL
         server_url = 'http://127.0.0.1:8000/transcribe/'
         
         # Words to filter out (fillers, common noise words)
         filler_words = {'um', 'uh', 'er', 'ah', 'like', 'you know', 'hmm', 'so', 'well', 'actually', 'basically'}
         
-        # Ultra-low threshold for consecutive silence detection specifically for Google Meet audio
-        silence_threshold = 0.00015  # Extremely low for Google Meet call audio
-        consecutive_silence_frames = 0
-        max_silence_frames = 5  # Reset buffer after this many silent frames (lower for Google Meet audio)
-        
-        # Minimum time between processing chunks to avoid overloading the server
-        min_processing_interval = 0.8  # seconds (shorter interval for more responsiveness)
-        last_processing_time = time.time()
+        # Utterances end at natural pauses and never exceed the segmenter's maximum
+        # length, which is well under the ring buffer's capacity. Frames louder than
+        # own_voice_threshold (roughly, as dBFS) are taken to be the user's own voice.
+        segmenter = UtteranceSegmenter(self.sample_rate, max_energy_db=20 * np.log10(self.own_voice_threshold))
+        reported_overflows = 0
         
         logger.info("Starting audio processing thread - highly optimized for Google Meet calls")
         
         while self.is_recording:
             try:
-                try:
-                    # Get audio data from queue with a short timeout for fast response
-                    audio_data = self.audio_queue.get(timeout=0.1)
-                    
-                    # Calculate audio level
-                    audio_level = np.abs(audio_data).mean()
-                    
-                    # Check if this is silence (using ultra-low threshold for call audio)
-                    if audio_level < silence_threshold:
-                        consecutive_silence_frames += 1
-                        
-                        current_time = time.time()
-                        time_since_last_process = current_time - last_processing_time
-                        
-                        # If we've had enough consecutive silent frames and it's been long
-                        # enough since our last processing, process the buffer and reset
-                        if consecutive_silence_frames >= max_silence_frames and buffer and time_since_last_process >= min_processing_interval:
-                            logger.info(f"Processing buffer after silence detection ({consecutive_silence_frames} frames)")
-                            full_buffer = np.concatenate(buffer)
-                            self.process_audio_buffer(full_buffer, server_url, filler_words)
-                            buffer = []
-                            consecutive_silence_frames = 0
-                            last_processing_time = current_time
-                    else:
-                        # Reset consecutive silence counter if we detect non-silence
-                        consecutive_silence_frames = 0
-                        buffer.append(audio_data)
-                        
-                except queue.Empty:
+                reported_overflows = self.report_capture_problems(reported_overflows)
+                
+                offset = self.ring.read_position
+                available = self.ring.available()
+                if segmenter.pending(offset + available) < self.block_size:
+                    time.sleep(0.01)
                     continue
                 
-                # If we have enough data and it's been at least min_processing_interval
-                # since last processing, process the buffer
-                current_time = time.time()
-                time_since_last_process = current_time - last_processing_time
+                # Check if Google Meet is active - if not, don't process the audio
+                if not self.check_google_meet_active():
+                    self.ring.consume(available)
+                    segmenter.reset(offset + available)
+                    continue
                 
-                if buffer and len(buffer) * len(buffer[0]) >= samples_per_buffer and time_since_last_process >= min_processing_interval:
-                    full_buffer = np.concatenate(buffer)
-                    
-                    # Check if the audio is not completely silent
-                    audio_level = np.abs(full_buffer).mean()
-                    logger.info(f"Audio level: {audio_level:.6f}")
-                    
-                    # Use an extremely low threshold specifically for Google Meet audio detection
-                    gmeet_audio_threshold = 0.00015  # Ultra-low threshold specifically for Google Meet
-                    
-                    if audio_level > gmeet_audio_threshold:
-                        self.process_audio_buffer(full_buffer, server_url, filler_words)
-                        last_processing_time = current_time
-                    else:
-                        logger.info("Audio is too quiet, skipping processing")
-                    
-                    # Clear buffer after processing
-                    buffer = []
+                audio = self.ring.peek(available)
+                for start, end in segmenter.feed(audio[:, 0], offset):
+                    logger.info(f"Utterance of {(end - start) / self.sample_rate:.2f}s "
+                                f"(noise floor {segmenter.noise_floor_db:.1f} dBFS)")
+                    # The upload runs on another thread, so it gets its own copy
+                    self.process_audio_buffer(audio[start - offset:end - offset].copy(), server_url, filler_words)
+                
+                # Hand everything the segmenter no longer needs back to the callback
+                self.ring.consume(segmenter.keep_from() - offset)
                 
             except Exception as e:
                 logger.error(f"Error in process_audio: {e}")
                 time.sleep(1)  # Avoid tight loop in case of repeated errors
                 
     def process_audio_buffer(self, audio_buffer, server_url, filler_words):
-        """Process a filled audio buffer and send to server."""
-        # Create temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-            self.save_audio_to_wav(audio_buffer, temp_file.name)
-            logger.info(f"\nProcessing audio chunk of size: {len(audio_buffer)} samples")
-            
-            # Send to backend
+        """Queue a filled audio buffer for upload, without waiting on the network."""
+        chunk = (self.next_sequence, audio_buffer, server_url, filler_words)
+        self.next_sequence += 1
+        while True:
             try:
-                with open(temp_file.name, 'rb') as audio_file:
-                    files = {'audio': ('audio.wav', audio_file, 'audio/wav')}
-                    logger.info(f"Sending audio to backend at {server_url}...")
-                    
-                    # First check if server is reachable
-                    try:
-                        requests.get('http://127.0.0.1:8000/', timeout=2)
-                    except requests.exceptions.ConnectionError:
-                        logger.error("Could not connect to Django server. Please make sure it's running with 'python3 manage.py runserver'")
-                        return
-                    
-                    # Send as multipart form data
-                    response = requests.post(
-                        server_url,
-                        files=files,
-                        timeout=30  # Add timeout
-                    )
-                    
-                    if response.ok:
-                        result = response.json()
-                        if 'error' in result:
-                            logger.error(f"Error from server: {result['error']}")
-                        else:
-                            transcription = result.get('text', '')
-                            logger.info("\nTranscription: " + transcription)
+                self.upload_queue.put_nowait(chunk)
+                return
+            except queue.Full:
+                pass
+            # Every upload thread is busy and the backlog is full: drop the oldest
+            # waiting chunk so captions stay close to live instead of falling behind
+            try:
+                sequence = self.upload_queue.get_nowait()[0]
+            except queue.Empty:
+                continue
+            self.dropped_chunks += 1
+            logger.warning(f"Upload backlog full, dropped audio chunk {sequence} ({self.dropped_chunks} dropped so far)")
+            self.deliver_result(sequence, None)
+    
+    def upload_worker(self):
+        """Upload queued chunks until recording stops and the queue is drained."""
+        # Each thread keeps its own keep-alive connection to the backend;
+        # requests.Session isn't safe to share between threads
+        with requests.Session() as session:
+            while self.is_recording or not self.upload_queue.empty():
+                try:
+                    sequence, audio_buffer, server_url, filler_words = self.upload_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                result = None
+                try:
+                    result = self.upload_chunk(session, audio_buffer, server_url, filler_words)
+                finally:
+                    # Always deliver, even on failure, so later chunks aren't held back
+                    self.deliver_result(sequence, result)
+    
+    def deliver_result(self, sequence, result):
+        """
+        Record the result for a chunk and display every result that is now in order.
+        
+        Args:
+            sequence (int): Chunk sequence number
+            result (dict): Processed server response, or None if the chunk produced nothing
+        """
+        with self.results_lock:
+            self.completed_results[sequence] = result
+            while self.next_display_sequence in self.completed_results:
+                ready = self.completed_results.pop(self.next_display_sequence)
+                self.next_display_sequence += 1
+                if ready is not None:
+                    self.display_backlog.append(ready)
+            if self.displaying:
+                # The thread already displaying will pick these up, in order
+                return
+            self.displaying = True
+        
+        while True:
+            with self.results_lock:
+                if not self.display_backlog:
+                    self.displaying = False
+                    return
+                ready = self.display_backlog.popleft()
+            try:
+                logger.info(f"\nDisplaying sign language content...")
+                self.display_videos(ready)
+            except Exception as e:
+                logger.error(f"Error displaying videos: {str(e)}")
+    
+    def upload_chunk(self, session, audio_buffer, server_url, filler_words):
+        """
+        Send an audio buffer to the server and prepare its result for display.
+        
+        Args:
+            session (requests.Session): The calling upload thread's session
+            audio_buffer (numpy.ndarray): Captured audio
+            server_url (str): Transcription endpoint
+            filler_words (set): Words to drop from the result
+        
+        Returns:
+            dict: Server response with filler words and words without videos
+                removed, or None if there is nothing to display
+        """
+        if time.time() < self.server_retry_at:
+            # The server was unreachable moments ago; don't queue up connection attempts
+            logger.info("Skipping audio chunk while the server is unreachable")
+            return
+        
+        logger.info(f"\nProcessing audio chunk of size: {len(audio_buffer)} samples")
+        
+        # Send to backend over the upload thread's keep-alive session
+        try:
+            files = {'audio': ('audio.wav', self.encode_wav(audio_buffer), 'audio/wav')}
+            logger.info(f"Sending audio to backend at {server_url}...")
+            
+            # Send as multipart form data
+            response = session.post(
+                server_url,
+                files=files,
+                timeout=30  # Add timeout
+            )
+            
+            if response.ok:
+                result = response.json()
+                if 'error' in result:
+                    logger.error(f"Error from server: {result['error']}")
+                else:
+                    transcription = result.get('text', '')
+                    logger.info("\nTranscription: " + transcription)
                             
-                            # Log the full result for debugging
-                            logger.info(f"Server response: {result}")
+                    # Log the full result for debugging
+                    logger.info(f"Server response: {result}")
                             
-                            # Even if transcription is empty, check audio level
-                            audio_level = np.abs(audio_buffer).mean()
+                    # Even if transcription is empty, check audio level
+                    audio_level = np.abs(audio_buffer).mean()
                             
-                            # For Google Meet audio, we want to be more sensitive
-                            if not transcription or transcription.strip() == '':
-                                # If audio level is significant but no transcription, 
-                                # try to interpret it as possible speech
-                                if audio_level > 0.3:  # A moderate threshold
-                                    logger.warning("Empty transcription received but audio level significant. Using placeholder.")
-                                    # Use placeholder for non-empty but unrecognized speech
-                                    transcription = "[Speech detected]"
-                                    result['text'] = transcription
-                                    result['formatted_words'] = ["Speech"]
+                    # For Google Meet audio, we want to be more sensitive
+                    if not transcription or transcription.strip() == '':
+                        # If audio level is significant but no transcription, 
+                        # try to interpret it as possible speech
+                        if audio_level > 0.3:  # A moderate threshold
+                            logger.warning("Empty transcription received but audio level significant. Using placeholder.")
+                            # Use placeholder for non-empty but unrecognized speech
+                            transcription = "[Speech detected]"
+                            result['text'] = transcription
+                            result['formatted_words'] = ["Speech"]
                                     
-                                    # Ensure we have a video for 'Speech'
-                                    # Try to use a generic placeholder video or create one if needed
-                                    speech_video_path = '/static/Speech.mp4'
+                            # Ensure we have a video for 'Speech'
+                            # Try to use a generic placeholder video or create one if needed
+                            speech_video_path = '/static/Speech.mp4'
                                     
-                                    # Check if we have speech video in static folder
-                                    if not os.path.exists(os.path.join('static', 'Speech.mp4')):
-                                        # Since there's no video, just ensure we have the minimal JSON structure
-                                        logger.warning("No speech placeholder video found - using text only")
+                            # Check if we have speech video in static folder
+                            if not os.path.exists(os.path.join('static', 'Speech.mp4')):
+                                # Since there's no video, just ensure we have the minimal JSON structure
+                                logger.warning("No speech placeholder video found - using text only")
                                     
-                                    # Create or update videos list
-                                    if 'videos' not in result or not result['videos']:
-                                        result['videos'] = [speech_video_path]
-                                else:
-                                    logger.warning("Empty transcription received. Audio might be too quiet or unclear.")
-                                    return
+                            # Create or update videos list
+                            if 'videos' not in result or not result['videos']:
+                                result['videos'] = [speech_video_path]
+                        else:
+                            logger.warning("Empty transcription received. Audio might be too quiet or unclear.")
+                            return
                             
-                            # Filter out filler words and normalize text
-                            processed_transcription = self.filter_text(transcription, filler_words)
-                            if processed_transcription != transcription:
-                                logger.info(f"Filtered transcription: {processed_transcription}")
-                                # Update the transcription in the result
-                                result['text'] = processed_transcription
-                                
-                                # Also update the formatted_words list to match the filtered text
-                                filtered_words = processed_transcription.split()
-                                result['formatted_words'] = [word.capitalize() for word in filtered_words]
-                                
-                                # We need to ensure the videos list matches the new word count
-                                if 'videos' in result and len(result['videos']) != len(filtered_words):
-                                    # If we have videos but in the wrong count, try to match them up
-                                    # by preserving the videos we have for words that remain
-                                    original_words = transcription.split()
-                                    original_videos = result.get('videos', [])
-                                    
-                                    # Create a word-to-video mapping from the original
-                                    word_to_video = {}
-                                    if len(original_words) == len(original_videos):
-                                        for i, word in enumerate(original_words):
-                                            word_to_video[word.lower()] = original_videos[i]
-                                    
-                                    # Create a new videos list for the filtered words
-                                    new_videos = []
-                                    for word in filtered_words:
-                                        if word.lower() in word_to_video:
-                                            new_videos.append(word_to_video[word.lower()])
-                                        else:
-                                            # No video for this word, use a placeholder path
-                                            new_videos.append('')
-                                    
-                                    # Update the videos list
-                                    result['videos'] = new_videos
+                    # Filter out filler words. The server returns one video per
+                    # formatted word ('' when a word has none), so words and
+                    # videos are filtered as pairs and stay aligned.
+                    formatted_words = result.get('formatted_words', [])
+                    videos = result.get('videos', [])
+                    if len(videos) == len(formatted_words):
+                        pairs = [(word, video) for word, video in zip(formatted_words, videos)
+                                 if word.lower() not in filler_words]
+                        result['formatted_words'] = [word for word, _ in pairs]
+                        result['videos'] = [video for _, video in pairs]
+                    processed_transcription = self.filter_text(transcription, filler_words)
+                    if processed_transcription != transcription:
+                        logger.info(f"Filtered transcription: {processed_transcription}")
+                        result['text'] = processed_transcription
                             
-                            # Check if videos are present and make sure all paths are valid
-                            if 'videos' in result:
-                                videos = result['videos']
+                    # Check if videos are present and make sure all paths are valid
+                    if 'videos' in result:
+                        videos = result['videos']
                                 
-                                # Ensure all video paths are properly formatted with leading slash if needed
-                                for i, video_path in enumerate(videos):
-                                    if video_path and not video_path.startswith('/') and not video_path.startswith('http'):
-                                        videos[i] = '/' + video_path
+                        # Ensure all video paths are properly formatted with leading slash if needed
+                        for i, video_path in enumerate(videos):
+                            if video_path and not video_path.startswith('/') and not video_path.startswith('http'):
+                                videos[i] = '/' + video_path
                                         
-                                result['videos'] = videos
+                        result['videos'] = videos
                                 
-                                # Make the absolute URLs for videos
-                                base_url = "http://127.0.0.1:8000"
-                                for i, video_path in enumerate(videos):
-                                    if video_path and video_path.startswith('/static/'):
-                                        # Convert to full URL for proper video display
-                                        videos[i] = f"{base_url}{video_path}"
+                        # Make the absolute URLs for videos
+                        base_url = "http://127.0.0.1:8000"
+                        for i, video_path in enumerate(videos):
+                            if video_path and video_path.startswith('/'):
+                                # Convert to full URL for proper video display
+                                videos[i] = f"{base_url}{video_path}"
                                 
-                                # Update videos in result
-                                result['videos'] = videos
+                        # Update videos in result
+                        result['videos'] = videos
                                 
-                                # Log a summary
-                                video_count = sum(1 for v in videos if v and len(v) > 0)
-                                logger.info(f"Found {video_count} valid videos out of {len(videos)} words")
+                        # Log a summary
+                        video_count = sum(1 for v in videos if v and len(v) > 0)
+                        logger.info(f"Found {video_count} valid videos out of {len(videos)} words")
                                 
-                                # FILTER MODIFICATION: Only show words that have videos
-                                # Filter words and videos to only include words with videos
-                                if 'formatted_words' in result:
-                                    valid_videos = []
-                                    valid_words = []
+                        # FILTER MODIFICATION: Only show words that have videos
+                        # Filter words and videos to only include words with videos
+                        if 'formatted_words' in result:
+                            valid_videos = []
+                            valid_words = []
                                     
-                                    for word, video in zip(result['formatted_words'], videos):
-                                        if video and len(video) > 0:
-                                            valid_videos.append(video)
-                                            valid_words.append(word)
+                            for word, video in zip(result['formatted_words'], videos):
+                                if video and len(video) > 0:
+                                    valid_videos.append(video)
+                                    valid_words.append(word)
                                     
-                                    # If we found valid words with videos
-                                    if valid_words:
-                                        # Create a new transcription with only the words that have videos
-                                        result['text'] = ' '.join(valid_words)
-                                        result['formatted_words'] = valid_words
-                                        result['videos'] = valid_videos
-                                        logger.info(f"Filtered to only words with videos: {result['text']}")
+                            # If we found valid words with videos
+                            if valid_words:
+                                # Create a new transcription with only the words that have videos
+                                result['text'] = ' '.join(valid_words)
+                                result['formatted_words'] = valid_words
+                                result['videos'] = valid_videos
+                                logger.info(f"Filtered to only words with videos: {result['text']}")
                                 
-                            # Display videos if available
-                            if 'videos' in result or 'formatted_words' in result:
-                                logger.info(f"\nDisplaying sign language content...")
-                                self.display_videos(result)
-                            else:
-                                logger.warning("No videos or words returned from server")
-                    else:
-                        logger.error(f"Error: {response.status_code} - {response.text}")
-            except requests.exceptions.Timeout:
-                logger.error("Error: Request timed out. The server took too long to respond.")
-            except requests.exceptions.ConnectionError:
-                logger.error("Error: Could not connect to the server. Is the Django server running?")
-            except Exception as e:
-                logger.error(f"Error sending audio to backend: {e}")
-            finally:
-                # Clean up temporary file
-                try:
-                    os.remove(temp_file.name)
-                except Exception as e:
-                    logger.error(f"Error removing temporary file: {e}")
+                    # Display videos if available
+                    if 'videos' in result or 'formatted_words' in result:
+                        return result
+                    logger.warning("No videos or words returned from server")
+            else:
+                logger.error(f"Error: {response.status_code} - {response.text}")
+        except requests.exceptions.Timeout:
+            logger.error("Error: Request timed out. The server took too long to respond.")
+        except requests.exceptions.ConnectionError:
+            logger.error("Could not connect to Django server. Please make sure it's running with 'python3 manage.py runserver'")
+            self.server_retry_at = time.time() + self.server_retry_interval
+        except Exception as e:
+            logger.error(f"Error sending audio to backend: {e}")
                     
     def filter_text(self, text, filler_words):
         """Filter out filler words and normalize text."""
@@ -1175,10 +1168,11 @@ def main():
         parser.add_argument('--device', type=int, help='Specify audio device index to use')
         parser.add_argument('--gmeet', action='store_true', help='Optimize for Google Meet audio capture (default: True)', default=True)
         parser.add_argument('--allow-mic', action='store_true', help='Allow microphone input (default: False)', default=False)
+        parser.add_argument('--in-flight', type=int, default=2, help='Audio chunks uploaded concurrently (default: 2)')
         args = parser.parse_args()
         
         # Create audio capture instance
-        audio_capture = AudioCapture(allow_mic=args.allow_mic)
+        audio_capture = AudioCapture(allow_mic=args.allow_mic, max_in_flight=max(1, args.in_flight))
         
         # List available audio devices
         audio_capture.list_audio_devices()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Regenerate the synthetic benchmark fixtures in this directory.
+
+There is no speech in them, so the reference transcripts are empty: they
+measure realtime factor and peak memory, and show any text the model
+hallucinates, but give no word error rate. For WER, add recordings with
+their transcripts next to them (``meeting.wav`` + ``meeting.txt``).
+
+Usage:
+    python benchmark_fixtures/make_synthetic.py
+"""
+import os
+import sys
+import wave
+import numpy as np
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRECTORY))
+from synthetic_audio import SAMPLE_RATE, voiced_tone  # noqa: E402
+
+
+def voiced(seconds, rng):
+    """Speech-like tone bursts: a 140 Hz harmonic series, syllable-rate modulated, with pauses."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = voiced_tone(seconds, 140, vibrato_hz=0.7)
+    envelope = np.clip(np.sin(2 * np.pi * 2.5 * t), 0, None)
+    # A pause of about a second every three seconds
+    envelope *= (t % 3.0) < 2.0
+    return 0.1 * tone * envelope + 0.002 * rng.standard_normal(len(t))
+
+
+def write_fixture(name, samples):
+    with wave.open(os.path.join(DIRECTORY, f"{name}.wav"), 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes((np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes())
+    with open(os.path.join(DIRECTORY, f"{name}.txt"), 'w') as f:
+        f.write('\n')
+
+
+def main():
+    rng = np.random.default_rng(0)
+    write_fixture('silence', np.zeros(2 * SAMPLE_RATE))
+    write_fixture('room_noise', 0.01 * rng.standard_normal(5 * SAMPLE_RATE))
+    write_fixture('voiced_tones', voiced(10, rng))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Compare Whisper fp32 and int8 (dynamic quantization) inference on CPU.
+
+Each fixture is an audio file with a reference transcript next to it
+(``hello.wav`` + ``hello.txt``). Every precision runs in its own process so
+peak memory is measured independently. Reports realtime factor (decode time
+divided by audio duration), peak resident memory and word error rate.
+
+Every precision is also compared with the first one (fp32 by default):
+"WER vs fp32" uses the fp32 transcripts as the reference, so it shows how
+much quantization changes the output even for fixtures without a usable
+reference transcript.
+
+The committed fixtures (see benchmark_fixtures/make_synthetic.py) contain no
+speech and have empty transcripts: they cover speed and memory, and any words
+decoded from them show up as word_errors. Add recordings for a real WER.
+
+Usage:
+    python benchmark_whisper_precision.py --fixtures benchmark_fixtures --model base
+"""
+import os
+import re
+import sys
+import json
+import time
+import glob
+import resource
+import argparse
+import subprocess
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.ogg', '.m4a', '.webm', '.flac')
+
+
+def find_fixtures(fixtures_dir):
+    """Return (audio path, reference text) pairs for every fixture with a transcript."""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, '*'))):
+        stem, ext = os.path.splitext(path)
+        if ext.lower() not in AUDIO_EXTENSIONS:
+            continue
+        reference_path = stem + '.txt'
+        if not os.path.exists(reference_path):
+            logger.warning(f"Skipping {path}: no reference transcript at {reference_path}")
+            continue
+        with open(reference_path) as f:
+            fixtures.append((path, f.read().strip()))
+    return fixtures
+
+
+def normalize_words(text):
+    """Lower-case, strip punctuation and split into words."""
+    return re.sub(r"[^a-z0-9' ]+", ' ', text.lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Return (word edit distance, reference word count)."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    return previous[-1], len(ref)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_precision(model_name, precision, fixtures, runs):
+    """Benchmark one precision in this process and return the measurements."""
+    import whisper
+    from A2SL.transcribe import load_model, decode_audio
+
+    start = time.perf_counter()
+    model = load_model(model_name, device='cpu', precision=precision)
+    load_seconds = time.perf_counter() - start
+
+    # One untimed pass so kernel initialization doesn't count against the first fixture
+    model.transcribe(decode_audio(fixtures[0][0])[:whisper.audio.SAMPLE_RATE], fp16=False, language='en')
+
+    audio_seconds = 0.0
+    decode_seconds = 0.0
+    errors = 0
+    reference_words = 0
+    results = []
+    for path, reference in fixtures:
+        samples = decode_audio(path)
+        duration = len(samples) / whisper.audio.SAMPLE_RATE
+        elapsed = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            text = model.transcribe(samples, fp16=False, language='en')['text'].strip()
+            elapsed.append(time.perf_counter() - start)
+        best = min(elapsed)
+        fixture_errors, fixture_words = word_errors(reference, text)
+        audio_seconds += duration
+        decode_seconds += best
+        errors += fixture_errors
+        reference_words += fixture_words
+        results.append({
+            'fixture': os.path.basename(path),
+            'seconds': round(duration, 2),
+            'rtf': round(best / duration, 3) if duration else None,
+            'wer': round(fixture_errors / fixture_words, 3) if fixture_words else None,
+            'word_errors': fixture_errors,
+            'text': text,
+        })
+
+    return {
+        'precision': precision,
+        'load_seconds': round(load_seconds, 2),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'rtf': round(decode_seconds / audio_seconds, 3) if audio_seconds else None,
+        'wer': round(errors / reference_words, 3) if reference_words else None,
+        'fixtures': results,
+    }
+
+
+def compare_transcripts(baseline, report):
+    """
+    WER of ``report`` with ``baseline``'s transcripts as the reference.
+
+    Returns:
+        float: Word edit distance over baseline words; if the baseline
+            decoded no words at all, 1.0 when ``report`` decoded any, else 0.0
+    """
+    errors = 0
+    words = 0
+    for reference, hypothesis in zip(baseline['fixtures'], report['fixtures']):
+        fixture_errors, fixture_words = word_errors(reference['text'], hypothesis['text'])
+        errors += fixture_errors
+        words += fixture_words
+    if words:
+        return round(errors / words, 3)
+    return float(errors > 0)
+
+
+def format_value(value):
+    """Table cell for a report value; None (no reference words) is n/a."""
+    return 'n/a' if value is None else value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Whisper fp32 vs int8 inference on CPU')
+    parser.add_argument('--fixtures', default='benchmark_fixtures', help='Directory of audio files with .txt reference transcripts')
+    parser.add_argument('--model', default='base', help='Whisper model name')
+    parser.add_argument('--precisions', nargs='+', default=['fp32', 'int8'], choices=['fp32', 'int8'])
+    parser.add_argument('--runs', type=int, default=3, help='Timed runs per fixture (best is reported)')
+    parser.add_argument('--threads', type=int, help='Torch intra-op threads')
+    parser.add_argument('--json', action='store_true', help='Print raw JSON results')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    fixtures = find_fixtures(args.fixtures)
+    if not fixtures:
+        logger.error(f"No fixtures found in {args.fixtures} (expected e.g. hello.wav + hello.txt)")
+        sys.exit(1)
+
+    if args.worker:
+        if args.threads:
+            import torch
+            torch.set_num_threads(args.threads)
+        print(json.dumps(run_precision(args.model, args.worker, fixtures, args.runs)))
+        return
+
+    reports = []
+    for precision in args.precisions:
+        logger.info(f"Benchmarking {args.model} at {precision} on {len(fixtures)} fixtures...")
+        cmd = [sys.executable, os.path.abspath(__file__), '--worker', precision,
+               '--fixtures', os.path.abspath(args.fixtures), '--model', args.model, '--runs', str(args.runs)]
+        if args.threads:
+            cmd += ['--threads', str(args.threads)]
+        output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        reports.append(json.loads(output.strip().splitlines()[-1]))
+
+    baseline = reports[0]
+    for report in reports:
+        report['wer_vs_baseline'] = compare_transcripts(baseline, report)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+
+    print(f"\nModel: {args.model}, fixtures: {len(fixtures)}")
+    print(f"{'precision':<10}{'load s':>8}{'peak MB':>10}{'RTF':>8}{'WER':>8}{'WER vs ' + baseline['precision']:>13}")
+    for report in reports:
+        print(f"{report['precision']:<10}{report['load_seconds']:>8}{report['peak_rss_mb']:>10}"
+              f"{format_value(report['rtf']):>8}{format_value(report['wer']):>8}{format_value(report['wer_vs_baseline']):>13}")
+
+
+if __name__ == "__main__":
+    main()
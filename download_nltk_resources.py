@@ -1,14 +1,24 @@
 import nltk
 import os
 
+# Everything the app reads from nltk_data: punkt for word_tokenize, and
+# WordNet for `manage.py build_sign_lexicon`
+RESOURCES = ['punkt', 'wordnet', 'omw-1.4']
+# word_tokenize reads punkt_tab from nltk 3.8.2 on
+if tuple(int(part) for part in nltk.__version__.split('.')[:3] if part.isdigit()) >= (3, 8, 2):
+    RESOURCES.append('punkt_tab')
+
 def download_resources():
     # Set the NLTK data directory to a local folder in the project
-    nltk_data_dir = os.path.join(os.path.dirname(__file__), 'nltk_data')
+    nltk_data_dir = os.environ.get('NLTK_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data'))
     if not os.path.exists(nltk_data_dir):
         os.makedirs(nltk_data_dir)
     nltk.data.path.append(nltk_data_dir)
-    nltk.download('punkt', download_dir=nltk_data_dir)
+    failed = [resource for resource in RESOURCES if not nltk.download(resource, download_dir=nltk_data_dir)]
+    return nltk_data_dir, failed
 
 if __name__ == "__main__":
-    download_resources()
-    print("NLTK 'punkt' resource downloaded successfully to local nltk_data directory.")
+    nltk_data_dir, failed = download_resources()
+    if failed:
+        raise SystemExit(f"Failed to download NLTK resources: {', '.join(failed)}")
+    print(f"NLTK resources {', '.join(RESOURCES)} downloaded successfully to {nltk_data_dir}.")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Evaluate audio_capture's utterance segmentation against labelled recordings.
+
+Each fixture is a 16-bit PCM WAV file with an Audacity label track next to it
+(``meeting.wav`` + ``meeting.labels``, one ``start<TAB>end<TAB>text`` line per
+stretch of speech). The recording is streamed through UtteranceSegmenter in
+capture-sized blocks, and compared with the fixed two-second chunking that
+audio_capture used before.
+
+Reports, per method: precision (share of uploaded audio that is speech),
+recall (share of speech that was uploaded), cuts inside labelled speech,
+requests and bytes uploaded.
+
+Usage:
+    python evaluate_segmentation.py --fixtures segmentation_fixtures
+"""
+import os
+import sys
+import json
+import glob
+import wave
+import argparse
+import logging
+import numpy as np
+from A2SL.segmentation import UtteranceSegmenter
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# audio_capture's PortAudio block size
+BLOCK_SIZE = 1024
+# WAV header plus 16-bit mono samples, as audio_capture uploads them
+WAV_HEADER_BYTES = 44
+
+# The previous scheme: fixed chunks, skipped only when nearly silent
+FIXED_CHUNK_SECONDS = 2.0
+FIXED_SILENCE_LEVEL = 0.00015
+
+
+def find_fixtures(fixtures_dir):
+    """Return (audio path, label path) pairs for every WAV file with labels."""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.wav'))):
+        label_path = os.path.splitext(path)[0] + '.labels'
+        if not os.path.exists(label_path):
+            logger.warning(f"Skipping {path}: no labels at {label_path}")
+            continue
+        fixtures.append((path, label_path))
+    return fixtures
+
+
+def read_wav(path):
+    """Read a 16-bit PCM WAV file as mono float32; returns (samples, sample rate)."""
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path} is not 16-bit PCM")
+        channels = wf.getnchannels()
+        sample_rate = wf.getframerate()
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype='<i2')
+    samples = data.reshape(-1, channels).mean(axis=1) / 32768.0
+    return samples.astype(np.float32), sample_rate
+
+
+def read_labels(path, sample_rate, length):
+    """Boolean per-sample speech mask from an Audacity label track."""
+    mask = np.zeros(length, dtype=bool)
+    with open(path) as f:
+        for line in f:
+            fields = line.split('\t')
+            if len(fields) < 2 or line.startswith('\\'):
+                # Blank lines and Audacity's spectral selection lines
+                continue
+            start, end = float(fields[0]), float(fields[1])
+            mask[int(start * sample_rate):int(end * sample_rate)] = True
+    return mask
+
+
+def segment_stream(samples, sample_rate):
+    """Utterances found by streaming ``samples`` through the segmenter in capture blocks."""
+    segmenter = UtteranceSegmenter(sample_rate)
+    utterances = []
+    for end in range(BLOCK_SIZE, len(samples) + BLOCK_SIZE, BLOCK_SIZE):
+        # The segmenter only looks at audio from keep_from() on, like the ring buffer
+        offset = segmenter.keep_from()
+        utterances += segmenter.feed(samples[offset:end], offset)
+    return utterances + segmenter.flush()
+
+
+def segment_fixed(samples, sample_rate):
+    """Chunks the fixed two-second scheme would have uploaded."""
+    chunk = int(FIXED_CHUNK_SECONDS * sample_rate)
+    return [
+        (start, min(start + chunk, len(samples)))
+        for start in range(0, len(samples), chunk)
+        if np.abs(samples[start:start + chunk]).mean() > FIXED_SILENCE_LEVEL
+    ]
+
+
+def score(utterances, speech):
+    """Compare uploaded ranges with the labelled speech mask."""
+    uploaded = np.zeros(len(speech), dtype=bool)
+    cuts = 0
+    for start, end in utterances:
+        uploaded[start:end] = True
+        # A boundary with labelled speech on both sides cuts a word or phrase
+        cuts += int(0 < start < len(speech) and speech[start - 1] and speech[start])
+        cuts += int(0 < end < len(speech) and speech[end - 1] and speech[end])
+    hits = np.count_nonzero(uploaded & speech)
+    return {
+        'uploaded_samples': int(np.count_nonzero(uploaded)),
+        'speech_samples': int(np.count_nonzero(speech)),
+        'hit_samples': int(hits),
+        'cuts_in_speech': cuts,
+        'requests': len(utterances),
+        'bytes': sum(WAV_HEADER_BYTES + 2 * (end - start) for start, end in utterances),
+    }
+
+
+def summarize(name, scores):
+    """Totals over all fixtures for one method."""
+    uploaded = sum(s['uploaded_samples'] for s in scores)
+    speech = sum(s['speech_samples'] for s in scores)
+    hits = sum(s['hit_samples'] for s in scores)
+    return {
+        'method': name,
+        'precision': round(hits / uploaded, 3) if uploaded else None,
+        'recall': round(hits / speech, 3) if speech else None,
+        'cuts_in_speech': sum(s['cuts_in_speech'] for s in scores),
+        'requests': sum(s['requests'] for s in scores),
+        'bytes': sum(s['bytes'] for s in scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate utterance segmentation on labelled recordings')
+    parser.add_argument('--fixtures', default='segmentation_fixtures', help='Directory of WAV files with .labels files')
+    parser.add_argument('--json', action='store_true', help='Print raw JSON results')
+    args = parser.parse_args()
+
+    fixtures = find_fixtures(args.fixtures)
+    if not fixtures:
+        logger.error(f"No fixtures found in {args.fixtures} (expected e.g. meeting.wav + meeting.labels)")
+        sys.exit(1)
+
+    methods = {'segmenter': segment_stream, 'fixed-2s': segment_fixed}
+    scores = {name: [] for name in methods}
+    for path, label_path in fixtures:
+        samples, sample_rate = read_wav(path)
+        speech = read_labels(label_path, sample_rate, len(samples))
+        for name, segment in methods.items():
+            scores[name].append(score(segment(samples, sample_rate), speech))
+
+    reports = [summarize(name, method_scores) for name, method_scores in scores.items()]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+
+    print(f"\nFixtures: {len(fixtures)}")
+    print(f"{'method':<12}{'precision':>10}{'recall':>8}{'cuts':>6}{'requests':>10}{'bytes':>12}")
+    for report in reports:
+        print(f"{report['method']:<12}{report['precision']:>10}{report['recall']:>8}"
+              f"{report['cuts_in_speech']:>6}{report['requests']:>10}{report['bytes']:>12}")
+
+
+if __name__ == "__main__":
+    main()
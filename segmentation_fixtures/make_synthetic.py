@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Regenerate the synthetic segmentation fixture in this directory.
+
+``synthetic.wav`` is phrases of speech-like "words" (a 140 Hz harmonic series
+with syllable-rate modulation) separated by pauses of varying length, over
+low background noise. ``synthetic.labels`` is its Audacity label track, one
+line per phrase; words within a phrase are too close together to be told
+apart, so the short gaps between them count as speech.
+
+Usage:
+    python segmentation_fixtures/make_synthetic.py
+"""
+import os
+import sys
+import wave
+import numpy as np
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRECTORY))
+from synthetic_audio import SAMPLE_RATE, voiced_tone  # noqa: E402
+
+WORD_SECONDS = 0.33
+WORD_GAP_SECONDS = 0.12
+# (words in the phrase, pause after it in seconds)
+PHRASES = [
+    (4, 1.0), (7, 0.6), (3, 1.5), (12, 0.5), (2, 2.0),
+    (30, 0.8), (5, 0.45), (6, 1.2), (1, 1.0), (9, 1.0),
+]
+LEAD_SECONDS = 1.0
+
+
+def word(rng):
+    """One voiced word with a random pitch and a smooth envelope."""
+    t = np.arange(int(WORD_SECONDS * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = voiced_tone(WORD_SECONDS, rng.uniform(120, 160), vibrato_hz=3)
+    envelope = np.sin(np.pi * t / WORD_SECONDS) * (0.6 + 0.4 * np.cos(2 * np.pi * 2.5 * t))
+    return rng.uniform(0.05, 0.15) * tone * envelope
+
+
+def main():
+    rng = np.random.default_rng(0)
+    parts = [np.zeros(int(LEAD_SECONDS * SAMPLE_RATE))]
+    labels = []
+    position = LEAD_SECONDS
+    for words, pause in PHRASES:
+        start = position
+        for i in range(words):
+            parts.append(word(rng))
+            position += WORD_SECONDS
+            if i < words - 1:
+                parts.append(np.zeros(int(WORD_GAP_SECONDS * SAMPLE_RATE)))
+                position += WORD_GAP_SECONDS
+        labels.append((start, position, f"phrase of {words} words"))
+        parts.append(np.zeros(int(pause * SAMPLE_RATE)))
+        position += pause
+
+    samples = np.concatenate(parts)
+    samples += 0.002 * rng.standard_normal(len(samples))
+    with wave.open(os.path.join(DIRECTORY, 'synthetic.wav'), 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes((np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes())
+    with open(os.path.join(DIRECTORY, 'synthetic.labels'), 'w') as f:
+        for start, end, text in labels:
+            f.write(f"{start:.6f}\t{end:.6f}\t{text}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Speech-like test audio without recordings.
+
+Shared by the tests and by the make_synthetic.py scripts that regenerate the
+committed benchmark and segmentation fixtures.
+"""
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def voiced_tone(seconds, f0=140.0, vibrato_hz=0.0, vibrato_depth=0.05, sample_rate=SAMPLE_RATE):
+    """
+    A voiced sound: the first eleven harmonics of f0 at 1/k amplitude, which
+    puts most of its power in the speech band like a vowel does.
+
+    Args:
+        seconds (float): Length
+        f0 (float): Fundamental frequency in Hz
+        vibrato_hz (float): Rate of the pitch modulation (0 for a steady pitch)
+        vibrato_depth (float): Pitch modulation as a fraction of f0
+        sample_rate (int): Sample rate in Hz
+
+    Returns:
+        numpy.ndarray: Unscaled float64 samples, peak around 1.7
+    """
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = f0 * (1 + vibrato_depth * np.sin(2 * np.pi * vibrato_hz * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    return sum(np.sin(k * phase) / k for k in range(1, 12))
@@ -0,0 +1,124 @@
+// Clip cache for the sign player, rendered by views.service_worker.
+//
+// Clip URLs carry a content fingerprint, so a cached clip never goes stale:
+// everything is served cache-first. Each clip manifest version gets its own
+// cache; a new manifest installs a new worker, which carries over the clips
+// it still needs and drops the old caches when it activates.
+
+const CACHE_PREFIX = 'a2sl-clips-';
+const CACHE_NAME = CACHE_PREFIX + '{{ version }}';
+// Alphabet, fingerspelling sprite and the most frequent words
+const PRECACHE = {{ precache|safe }};
+// Clips cached on first use, on top of the precached ones
+const RUNTIME_LIMIT = {{ runtime_limit }};
+
+const PRECACHED = new Set(PRECACHE.map(url => new URL(url, self.location.origin).href));
+
+async function precache() {
+    const cache = await caches.open(CACHE_NAME);
+    await Promise.all(PRECACHE.map(async url => {
+        try {
+            if (await cache.match(url)) {
+                return;
+            }
+            // Same URL means same bytes, whichever version's cache holds it
+            const previous = await caches.match(url);
+            if (previous) {
+                await cache.put(url, previous);
+                return;
+            }
+            const response = await fetch(url);
+            if (response.ok && !response.redirected) {
+                await cache.put(url, response);
+            }
+        } catch (error) {
+            // One missing clip shouldn't stop the worker from installing
+            console.warn('Could not precache', url, error);
+        }
+    }));
+}
+
+async function deleteOldCaches() {
+    const names = await caches.keys();
+    await Promise.all(names
+        .filter(name => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+        .map(name => caches.delete(name)));
+}
+
+async function trimRuntimeEntries(cache) {
+    // Keys come back in insertion order, so the oldest runtime clips go first
+    const runtime = (await cache.keys()).filter(request => !PRECACHED.has(request.url));
+    const excess = runtime.length - RUNTIME_LIMIT;
+    for (let i = 0; i < excess; i++) {
+        await cache.delete(runtime[i]);
+    }
+}
+
+// Same rules as clip_serving.parse_range on the server
+function rangeResponse(blob, header, headers) {
+    const size = blob.size;
+    const match = /^bytes=(\d*)-(\d*)$/.exec(header.trim());
+    if (!match || (match[1] === '' && match[2] === '')) {
+        return new Response(blob, { status: 200, headers });
+    }
+    let start;
+    let end;
+    if (match[1] === '') {
+        const length = Number(match[2]);
+        start = length ? Math.max(0, size - length) : size;
+        end = size - 1;
+    } else {
+        start = Number(match[1]);
+        end = match[2] === '' ? size - 1 : Math.min(Number(match[2]), size - 1);
+    }
+    if (start >= size || end < start) {
+        return new Response(null, { status: 416, headers: { 'Content-Range': `bytes */${size}` } });
+    }
+    const partial = new Headers(headers);
+    partial.set('Content-Range', `bytes ${start}-${end}/${size}`);
+    partial.set('Content-Length', String(end - start + 1));
+    return new Response(blob.slice(start, end + 1), { status: 206, statusText: 'Partial Content', headers: partial });
+}
+
+async function cacheFirst(request, url) {
+    const cache = await caches.open(CACHE_NAME);
+    let response = await cache.match(url);
+    if (!response) {
+        // Fetch the whole clip (no Range) so the cached copy can answer any range
+        response = await fetch(url);
+        if (!response.ok || response.redirected || response.status !== 200) {
+            return response;
+        }
+        await cache.put(url, response.clone());
+        trimRuntimeEntries(cache);
+    }
+    const range = request.headers.get('Range');
+    if (range) {
+        return rangeResponse(await response.blob(), range, response.headers);
+    }
+    return response;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(deleteOldCaches().then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) {
+        return;
+    }
+    if (!url.pathname.startsWith('/clip/') && !url.pathname.startsWith('/clips/')) {
+        return;
+    }
+    // The query string never changes a clip; key the cache on the path alone
+    event.respondWith(cacheFirst(request, url.origin + url.pathname));
+});
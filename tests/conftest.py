@@ -0,0 +1,33 @@
+import os
+import django
+import pytest
+
+# The tests never need the NLTK data or a loaded model
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SL.settings')
+os.environ.setdefault('NLTK_DATA_CHECK', '0')
+django.setup()
+
+from A2SL.clip_index import Clip, normalize_key  # noqa: E402
+
+
+class FakeIndex:
+    """Just enough of ClipIndex for the resolver."""
+
+    def __init__(self, names):
+        self.version = 1
+        self.set_clips(names)
+
+    def set_clips(self, names):
+        self._clips = {normalize_key(name): Clip(name, 'assets', f'/clips/{name}.mp4', f'/clip/{name}.mp4') for name in names}
+
+    def lookup(self, word):
+        return self._clips.get(normalize_key(word))
+
+    def clips(self):
+        return list(self._clips.values())
+
+
+@pytest.fixture
+def fake_index():
+    """Build a ClipIndex stand-in from clip names: ``fake_index(['Hello', 'Thank You'])``."""
+    return FakeIndex
@@ -0,0 +1,46 @@
+import sys
+import threading
+import types
+import pytest
+from django.test import override_settings
+from A2SL import apps
+
+
+@pytest.fixture
+def loaders(monkeypatch):
+    """Stand-ins for the pool and in-process model loaders; records which one ran."""
+    started = []
+    done = threading.Event()
+
+    def loader(name):
+        def load():
+            started.append(name)
+            done.set()
+        return load
+
+    monkeypatch.setitem(sys.modules, 'A2SL.worker_pool', types.SimpleNamespace(get_pool=loader('pool')))
+    monkeypatch.setitem(sys.modules, 'A2SL.transcribe', types.SimpleNamespace(warm_start=loader('model')))
+    monkeypatch.setattr(apps, '_warm_start_thread', None)
+    return started, done
+
+
+def test_django_setup_does_not_warm_start():
+    # conftest ran django.setup() like any management command would
+    assert apps._warm_start_thread is None
+
+
+@override_settings(WHISPER_WARM_START=False)
+def test_disabled_warm_start_does_nothing(loaders):
+    apps.warm_start_in_background()
+    assert apps._warm_start_thread is None
+
+
+@pytest.mark.parametrize('workers, expected', [(0, 'model'), (2, 'pool')])
+def test_warm_start_runs_once(loaders, workers, expected):
+    started, done = loaders
+    with override_settings(WHISPER_WARM_START=True, TRANSCRIBE_WORKERS=workers):
+        apps.warm_start_in_background()
+        apps.warm_start_in_background()
+    assert done.wait(5)
+    apps._warm_start_thread.join(5)
+    assert started == [expected]
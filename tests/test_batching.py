@@ -0,0 +1,82 @@
+import threading
+import time
+import numpy as np
+import pytest
+from A2SL.batching import WINDOW_SAMPLES, BatchScheduler
+
+
+class FakeScheduler(BatchScheduler):
+    """Records each batch instead of running Whisper; the first decode can be held open."""
+
+    def __init__(self, **kwargs):
+        super().__init__(get_model=None, **kwargs)
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+        self.decoding = threading.Event()
+
+    def _decode(self, clips):
+        self.decoding.set()
+        self.release.wait(5)
+        self.batches.append([int(clip[0]) for clip in clips])
+        return [f"clip {int(clip[0])}" for clip in clips]
+
+
+def clip(number):
+    return np.full(1600, number, dtype=np.float32)
+
+
+def test_requests_in_the_window_share_a_batch():
+    scheduler = FakeScheduler(max_batch_size=3, max_wait_ms=5000)
+    started = time.perf_counter()
+    futures = [scheduler.submit(clip(i)) for i in range(3)]
+
+    assert [future.result(timeout=5) for future in futures] == ['clip 0', 'clip 1', 'clip 2']
+    # A full batch goes out without waiting for the window to close
+    assert time.perf_counter() - started < 2
+    assert scheduler.batches == [[0, 1, 2]]
+
+
+def test_partial_batch_is_flushed_when_the_window_closes():
+    scheduler = FakeScheduler(max_batch_size=8, max_wait_ms=50)
+    futures = [scheduler.submit(clip(i)) for i in range(2)]
+
+    assert [future.result(timeout=5) for future in futures] == ['clip 0', 'clip 1']
+    assert scheduler.batches == [[0, 1]]
+    stats = scheduler.stats()
+    assert stats['batch_size_histogram'] == {2: 1}
+    assert stats['max_queue_wait_ms'] >= 40
+
+
+def test_backlog_is_batched_after_the_window_closes():
+    scheduler = FakeScheduler(max_batch_size=3, max_wait_ms=10)
+    scheduler.release.clear()
+    first = scheduler.submit(clip(0))
+    assert scheduler.decoding.wait(5)
+
+    # These queue up while the model is busy, well past their window
+    futures = [scheduler.submit(clip(i)) for i in range(1, 6)]
+    time.sleep(0.05)
+    scheduler.release.set()
+
+    assert first.result(timeout=5) == 'clip 0'
+    assert [future.result(timeout=5) for future in futures] == [f"clip {i}" for i in range(1, 6)]
+    assert scheduler.batches == [[0], [1, 2, 3], [4, 5]]
+    assert scheduler.stats()['requests'] == 6
+
+
+def test_failed_decode_fails_every_request_in_the_batch():
+    class FailingScheduler(BatchScheduler):
+        def _decode(self, clips):
+            raise RuntimeError("out of memory")
+
+    scheduler = FailingScheduler(get_model=None, max_batch_size=2, max_wait_ms=1000)
+    futures = [scheduler.submit(clip(i)) for i in range(2)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="out of memory"):
+            future.result(timeout=5)
+
+
+def test_audio_longer_than_a_window_is_refused():
+    with pytest.raises(ValueError):
+        FakeScheduler().submit(np.zeros(WINDOW_SAMPLES + 1, dtype=np.float32))
@@ -0,0 +1,122 @@
+import os
+import pytest
+from django.conf import settings
+from django.test import RequestFactory, override_settings
+from A2SL.clip_serving import IMMUTABLE, parse_range, serve_content, serve_file
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def clip(tmp_path):
+    path = tmp_path / 'Hello.mp4'
+    path.write_bytes(CONTENT)
+    return str(path)
+
+
+def get(**headers):
+    return RequestFactory().get('/clip/', **{'HTTP_' + name.upper().replace('-', '_'): value for name, value in headers.items()})
+
+
+def body(response):
+    return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=1000-', (1000, 1023)),
+    ('bytes=1000-5000', (1000, 1023)),
+    ('bytes=-100', (924, 1023)),
+    ('bytes=-5000', (0, 1023)),
+    (' bytes=5-5 ', (5, 5)),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1024) == expected
+
+
+@pytest.mark.parametrize('header', [None, '', 'bytes=-', 'bytes=0-1,5-9', 'items=0-1', 'bytes=a-b'])
+def test_parse_range_serves_whole_file(header):
+    assert parse_range(header, 1024) is None
+
+
+@pytest.mark.parametrize('header', ['bytes=1024-', 'bytes=2000-3000', 'bytes=10-5', 'bytes=-0'])
+def test_parse_range_unsatisfiable(header):
+    assert parse_range(header, 1024) is False
+
+
+def test_full_response(clip):
+    response = serve_file(get(), clip, 'abc')
+    assert response.status_code == 200
+    assert body(response) == CONTENT
+    assert response['ETag'] == '"abc"'
+    assert response['Cache-Control'] == IMMUTABLE
+    assert response['Accept-Ranges'] == 'bytes'
+    assert response['Content-Type'] == 'video/mp4'
+
+
+def test_range_response(clip):
+    response = serve_file(get(range='bytes=-100'), clip, 'abc')
+    assert response.status_code == 206
+    assert response['Content-Range'] == 'bytes 924-1023/1024'
+    assert response['Content-Length'] == '100'
+    assert body(response) == CONTENT[924:]
+
+
+def test_unsatisfiable_range(clip):
+    response = serve_file(get(range='bytes=2000-'), clip, 'abc')
+    assert response.status_code == 416
+    assert response['Content-Range'] == 'bytes */1024'
+
+
+def test_stale_if_range_sends_whole_file(clip):
+    response = serve_file(get(range='bytes=0-9', if_range='"old"'), clip, 'abc')
+    assert response.status_code == 200
+    assert body(response) == CONTENT
+
+    response = serve_file(get(range='bytes=0-9', if_range='"abc"'), clip, 'abc')
+    assert response.status_code == 206
+
+
+def test_not_modified(clip):
+    for header in ('"abc"', 'W/"abc"', '"other", "abc"', '*'):
+        response = serve_file(get(if_none_match=header), clip, 'abc')
+        assert response.status_code == 304
+        assert response['ETag'] == '"abc"'
+    assert serve_file(get(if_none_match='"other"'), clip, 'abc').status_code == 200
+
+
+def test_missing_file(tmp_path):
+    assert serve_file(get(), str(tmp_path / 'gone.mp4'), 'abc').status_code == 404
+
+
+def test_method_not_allowed(clip):
+    response = serve_file(RequestFactory().post('/clip/'), clip, 'abc')
+    assert response.status_code == 405
+    assert response['Allow'] == 'GET, HEAD'
+
+
+def test_open_file_is_served_after_unlink(clip):
+    file = open(clip, 'rb')
+    os.remove(clip)
+    response = serve_file(get(range='bytes=0-9'), clip, 'abc', file=file)
+    assert body(response) == CONTENT[:10]
+    assert file.closed
+
+
+def test_open_file_closed_when_not_modified(clip):
+    file = open(clip, 'rb')
+    assert serve_file(get(if_none_match='"abc"'), clip, 'abc', file=file).status_code == 304
+    assert file.closed
+
+
+@override_settings(CLIP_SENDFILE_HEADER='X-Accel-Redirect', CLIP_SENDFILE_PREFIX='/protected/')
+def test_sendfile_offload():
+    response = serve_file(get(), os.path.join(settings.BASE_DIR, 'assets', 'Hello.mp4'), 'abc')
+    assert response['X-Accel-Redirect'] == '/protected/assets/Hello.mp4'
+    assert response['ETag'] == '"abc"'
+
+
+def test_serve_content():
+    response = serve_content(get(), b'{}', 'application/json', 'v1', 'no-cache')
+    assert response.status_code == 200 and response.content == b'{}'
+    assert serve_content(get(if_none_match='"v1"'), b'{}', 'application/json', 'v1', 'no-cache').status_code == 304
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+from A2SL.clip_store import MANIFEST_NAME, OBJECTS_DIRECTORY, ClipStore, audit_directories, fingerprint
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_objects_are_named_by_content_hash(tmp_path):
+    store = ClipStore(tmp_path / 'store')
+    source = write(tmp_path / 'Hello.mp4', b'hello clip')
+
+    digest, created = store.add_file(source, 'Hello')
+
+    assert created
+    assert digest == hashlib.sha256(b'hello clip').hexdigest()
+    assert store.path_for('Hello') == os.path.join(str(tmp_path / 'store'), OBJECTS_DIRECTORY, f"{digest}.mp4")
+    assert open(store.path_for('Hello'), 'rb').read() == b'hello clip'
+    assert store.path_for('Missing') is None
+
+
+def test_identical_clips_are_stored_once(tmp_path):
+    store = ClipStore(tmp_path / 'store')
+    hello = write(tmp_path / 'assets' / 'Hello.mp4', b'hello clip')
+    hi = write(tmp_path / 'static' / 'Hi.mp4', b'hello clip')
+    world = write(tmp_path / 'assets' / 'World.mp4', b'world clip')
+
+    assert store.add_file(hello, 'Hello')[1]
+    assert not store.add_file(hi, 'Hi')[1]
+    assert store.add_file(world, 'World')[1]
+    store.alias('Hello', 'Greetings')
+
+    assert store.path_for('Hi') == store.path_for('Hello') == store.path_for('Greetings')
+    assert len(os.listdir(tmp_path / 'store' / OBJECTS_DIRECTORY)) == 2
+
+
+def test_manifest_round_trip_and_unreferenced_objects(tmp_path):
+    store = ClipStore(tmp_path / 'store')
+    assert not store.exists()
+    store.add_file(write(tmp_path / 'Hello.mp4', b'hello clip'), 'Hello')
+    store.add_file(write(tmp_path / 'World.mp4', b'old world'), 'World')
+    old_world = store.path_for('World')
+    # Re-recording a clip leaves the old object for cleanup
+    store.add_file(write(tmp_path / 'World.mp4', b'new world'), 'World')
+    store.save()
+
+    reopened = ClipStore(tmp_path / 'store')
+    assert reopened.exists()
+    assert reopened.names == store.names
+    assert list(json.loads((tmp_path / 'store' / MANIFEST_NAME).read_text())['clips']) == ['Hello', 'World']
+    assert reopened.unreferenced_objects() == [old_world]
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    write(tmp_path / 'store' / MANIFEST_NAME, b'{not json')
+    assert ClipStore(tmp_path / 'store').names == {}
+
+
+def test_audit_groups_duplicates_by_wasted_bytes(tmp_path):
+    write(tmp_path / 'assets' / 'Hello.mp4', b'hello clip')
+    write(tmp_path / 'static' / 'Hello.mp4', b'hello clip')
+    write(tmp_path / 'static' / 'Hi.MP4', b'hello clip')
+    write(tmp_path / 'assets' / 'Go.mp4', b'go' * 20)
+    write(tmp_path / 'static' / 'Go.mp4', b'go' * 20)
+    write(tmp_path / 'assets' / 'World.mp4', b'world clip')
+    write(tmp_path / 'assets' / 'notes.txt', b'hello clip')
+
+    report = audit_directories([str(tmp_path / 'assets'), str(tmp_path / 'static'), str(tmp_path / 'missing')])
+
+    assert (report['files'], report['unique_files']) == (6, 3)
+    assert report['total_bytes'] == 3 * 10 + 2 * 40 + 10
+    assert report['duplicate_bytes'] == 2 * 10 + 40
+    assert [(group['size'], len(group['paths'])) for group in report['groups']] == [(40, 2), (10, 3)]
+
+
+def test_fingerprint_follows_file_changes(tmp_path):
+    path = write(tmp_path / 'Hello.mp4', b'hello clip')
+    assert fingerprint(path) == hashlib.sha256(b'hello clip').hexdigest()
+
+    write(tmp_path / 'Hello.mp4', b'hello clip, re-recorded')
+    os.utime(path, ns=(1, 1))
+    assert fingerprint(path) == hashlib.sha256(b'hello clip, re-recorded').hexdigest()
@@ -0,0 +1,116 @@
+import pytest
+from A2SL import lexicon
+from A2SL.lexicon import build_entries
+
+
+class Lemma:
+    def __init__(self, name, count):
+        self._name, self._count = name, count
+
+    def name(self):
+        return self._name
+
+    def count(self):
+        return self._count
+
+
+class Synset:
+    def __init__(self, name, lemmas):
+        self.name = name
+        self._lemmas = [Lemma(*lemma) if isinstance(lemma, tuple) else Lemma(lemma, 0) for lemma in lemmas]
+
+    def pos(self):
+        return self.name.split('.')[1]
+
+    def lemmas(self):
+        return self._lemmas
+
+    def lemma_names(self):
+        return [lemma.name() for lemma in self._lemmas]
+
+    def __repr__(self):
+        return self.name
+
+
+# A slice of WordNet 3.0, with the frequency counts of the clip words
+SYNSETS = {synset.name: synset for synset in [
+    Synset('go.n.01', ['go', 'spell', 'tour', 'turn']),
+    Synset('adam.n.01', ['Adam', 'ecstasy', 'XTC', 'go', 'disco_biscuit']),
+    Synset('travel.v.01', ['travel', ('go', 130), 'move', 'locomote']),
+    Synset('go.v.02', [('go', 40), 'proceed', 'move']),
+    Synset('doctor_of_osteopathy.n.01', ['Doctor_of_Osteopathy', 'DO']),
+    Synset('bash.n.02', ['bash', 'brawl', 'do', 'shindig']),
+    Synset('make.v.01', ['make', ('do', 80)]),
+    Synset('perform.v.01', ['perform', 'execute', ('do', 30)]),
+    Synset('can.n.01', [('can', 3), 'tin', 'tin_can']),
+    Synset('can.n.02', [('can', 1), 'canful']),
+    Synset('can.v.01', [('can', 0), 'tin', 'put_up']),
+    Synset('tin.n.01', ['tin', 'Sn', 'atomic_number_50']),
+    Synset('tin.v.01', ['tin']),
+    Synset('home.n.01', [('home', 20), 'place']),
+    Synset('topographic_point.n.01', ['topographic_point', 'place', 'spot']),
+    Synset('will.n.01', [('will', 5), 'volition']),
+    Synset('will.n.03', [('will', 2), 'testament']),
+    Synset('testament.n.01', ['testament']),
+    Synset('car.n.01', [('car', 50), 'auto', 'automobile', 'machine', 'motorcar']),
+    Synset('machine.n.01', ['machine']),
+]}
+
+# Each word's senses in WordNet's order (most frequent first)
+SENSES = {
+    'go': ['go.n.01', 'adam.n.01', 'travel.v.01', 'go.v.02'],
+    'do': ['doctor_of_osteopathy.n.01', 'bash.n.02', 'make.v.01', 'perform.v.01'],
+    'can': ['can.n.01', 'can.n.02', 'can.v.01'],
+    'tin': ['tin.n.01', 'can.n.01', 'tin.v.01', 'can.v.01'],
+    'home': ['home.n.01'],
+    'place': ['topographic_point.n.01', 'home.n.01'],
+    'will': ['will.n.01', 'will.n.03'],
+    'testament': ['testament.n.01', 'will.n.03'],
+    'car': ['car.n.01'],
+    'machine': ['machine.n.01', 'car.n.01'],
+    'auto': ['car.n.01'],
+    'automobile': ['car.n.01'],
+    'motorcar': ['car.n.01'],
+}
+
+
+class FakeWordNet:
+    NOUN, VERB, ADJ = 'n', 'v', 'a'
+    _exception_map = {'v': {'went': ['go']}}
+
+    def synsets(self, word, pos=None):
+        synsets = [SYNSETS[name] for name in SENSES.get(word.lower(), [])]
+        return [synset for synset in synsets if pos in (None, synset.pos())]
+
+    def morphy(self, form, pos):
+        return None
+
+
+@pytest.fixture
+def entries(monkeypatch):
+    monkeypatch.setattr(lexicon, '_load_wordnet', FakeWordNet)
+    return build_entries(['Go', 'Do', 'Can', 'Home', 'Will', 'Car'], aliases=[('Car', 'vehicle')])
+
+
+@pytest.mark.parametrize('word', ['turn', 'spell', 'tour', 'ecstasy', 'bash', 'brawl', 'tin', 'canful', 'place', 'testament', 'machine'])
+def test_rare_senses_are_not_synonyms(entries, word):
+    assert word not in entries
+
+
+def test_first_sense_synonyms(entries):
+    assert entries['auto'] == ('Car', 'synonym')
+    assert entries['automobile'] == ('Car', 'synonym')
+    assert entries['motorcar'] == ('Car', 'synonym')
+
+
+def test_aliases_and_irregular_forms(entries):
+    assert entries['vehicle'] == ('Car', 'alias')
+    assert entries['went'] == ('Go', 'inflection')
+
+
+def test_without_wordnet():
+    entries = build_entries(['Walk', 'Go'], aliases=[], use_wordnet=False)
+    assert entries['walking'] == ('Walk', 'inflection')
+    assert entries['walks'] == ('Walk', 'inflection')
+    # Short words are left alone without a dictionary to check against
+    assert 'gos' not in entries
@@ -0,0 +1,110 @@
+import io
+import os
+import struct
+import pytest
+from django.conf import settings
+from A2SL.clip_index import Clip
+from A2SL.clip_manifest import ClipManifest
+from A2SL.mp4 import find_box, iter_boxes, read_duration, read_metadata, read_video_format
+
+
+def box(box_type, payload=b'', large=False):
+    if large:
+        return struct.pack('>I4sQ', 1, box_type, 16 + len(payload)) + payload
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def mvhd(timescale, duration, version=0):
+    if version == 1:
+        return box(b'mvhd', bytes([1, 0, 0, 0]) + struct.pack('>QQIQ', 0, 0, timescale, duration) + bytes(80))
+    return box(b'mvhd', bytes(4) + struct.pack('>IIII', 0, 0, timescale, duration) + bytes(80))
+
+
+def tkhd(width, height):
+    # Version 0: width and height (16.16 fixed point) end the 84-byte payload
+    return box(b'tkhd', bytes(76) + struct.pack('>II', width << 16, height << 16))
+
+
+def mp4(tmp_path, *boxes, name='clip.mp4'):
+    path = tmp_path / name
+    path.write_bytes(box(b'ftyp', b'isom') + b''.join(boxes))
+    return str(path)
+
+
+def test_iter_and_find_boxes():
+    data = box(b'ftyp', b'isom') + box(b'free', bytes(10), large=True) + box(b'moov', mvhd(1000, 500))
+    f = io.BytesIO(data)
+    assert [box_type for box_type, _, _ in iter_boxes(f, 0, len(data))] == [b'ftyp', b'free', b'moov']
+    offset, size = find_box(f, (b'moov', b'mvhd'))
+    assert size == 100
+    assert find_box(f, (b'moov', b'trak')) is None
+    # Only container boxes are searched
+    assert find_box(f, (b'ftyp', b'mvhd')) is None
+
+
+def test_corrupt_box():
+    with pytest.raises(ValueError):
+        list(iter_boxes(io.BytesIO(struct.pack('>I4s', 4, b'moov')), 0, 8))
+
+
+@pytest.mark.parametrize('version', [0, 1])
+def test_read_duration(tmp_path, version):
+    path = mp4(tmp_path, box(b'moov', mvhd(600, 900, version)))
+    assert read_duration(path) == 1.5
+
+
+def test_read_duration_errors(tmp_path):
+    with pytest.raises(ValueError):
+        read_duration(mp4(tmp_path, box(b'mdat', bytes(16))))
+    with pytest.raises(ValueError):
+        read_duration(mp4(tmp_path, box(b'moov', mvhd(0, 900)), name='zero.mp4'))
+
+
+def test_read_metadata(tmp_path):
+    audio = box(b'trak', tkhd(0, 0))
+    video = box(b'trak', box(b'edts') + tkhd(640, 360))
+    path = mp4(tmp_path, box(b'moov', mvhd(1000, 2500) + audio + video), box(b'mdat', bytes(32)))
+    assert read_metadata(path) == {'duration': 2.5, 'width': 640, 'height': 360}
+
+    path = mp4(tmp_path, box(b'moov', mvhd(1000, 2500) + audio), name='audio.mp4')
+    assert read_metadata(path) == {'duration': 2.5, 'width': None, 'height': None}
+
+
+def test_read_metadata_of_library_clip():
+    metadata = read_metadata(os.path.join(settings.BASE_DIR, 'assets', 'Hello.mp4'))
+    assert metadata['duration'] == pytest.approx(1.292, abs=0.001)
+    assert (metadata['width'], metadata['height']) == (1280, 720)
+
+
+def test_clip_manifest(tmp_path):
+    hello = mp4(tmp_path, box(b'moov', mvhd(1000, 1234) + box(b'trak', tkhd(320, 240))), name='Hello.mp4')
+    bye = mp4(tmp_path, box(b'moov', mvhd(1000, 500)), name='Bye.mp4')
+    broken = tmp_path / 'Broken.mp4'
+    broken.write_bytes(b'not an mp4')
+    clips = [
+        Clip('Hello', 'assets', hello, '/clip/assets/1/Hello.mp4'),
+        Clip('Bye', 'assets', bye, '/clip/assets/2/Bye.mp4'),
+        Clip('Broken', 'assets', str(broken), '/clip/assets/3/Broken.mp4'),
+    ]
+
+    manifest = ClipManifest(clips)
+
+    # Sorted by name, unreadable clips left out
+    assert [(entry['id'], entry['name']) for entry in manifest.entries] == [(0, 'Bye'), (1, 'Hello')]
+    assert manifest.entries[1]['duration'] == 1.234
+    assert (manifest.entries[1]['width'], manifest.entries[1]['height']) == (320, 240)
+    assert manifest.compact(['/clip/assets/1/Hello.mp4', '', '/clip/assets/3/Broken.mp4']) == ([1, None, None], [1.234, None, None])
+
+    assert ClipManifest(reversed(clips)).version == manifest.version
+    assert ClipManifest(clips[:1]).version != manifest.version
+
+
+def test_read_video_format_of_library_clips():
+    hello = read_video_format(os.path.join(settings.BASE_DIR, 'assets', 'Hello.mp4'))
+    assert (hello.codec, hello.width, hello.height, hello.profile) == ('avc1', 1280, 720, 66)
+    assert hello.timescale > 0 and hello.config
+
+
+def test_read_video_format_without_video(tmp_path):
+    with pytest.raises(ValueError):
+        read_video_format(mp4(tmp_path, box(b'moov', mvhd(1000, 500))))
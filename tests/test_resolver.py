@@ -0,0 +1,59 @@
+from A2SL.resolver import SignResolver, build_phrase_trie, normalize_tokens
+
+NAMES = ['Do', 'Not', 'Do Not', 'Do Not Go', 'Go', 'Stop', 'Thank You', 'You', 'A', 'B', 'C']
+
+
+def names(resolved):
+    return [(word.word, [clip.name for clip in word.clips]) for word in resolved]
+
+
+def test_normalize_tokens():
+    assert normalize_tokens(['Thank', 'you!', '--', "Don't"]) == ('thank', 'you', 'dont')
+
+
+def test_phrase_trie_holds_only_multi_word_clips(fake_index):
+    trie = build_phrase_trie(fake_index(NAMES).clips())
+    assert set(trie) == {'do', 'thank'}
+    assert trie['do']['not'][None].name == 'Do Not'
+    assert trie['do']['not']['go'][None].name == 'Do Not Go'
+
+
+def test_longest_phrase_wins(fake_index):
+    resolver = SignResolver(fake_index(NAMES))
+    assert names(resolver.resolve(['do', 'not', 'go'])) == [('do not go', ['Do Not Go'])]
+    assert names(resolver.resolve(['Do', 'not', 'stop'])) == [('do not', ['Do Not']), ('stop', ['Stop'])]
+    assert names(resolver.resolve(['Thank', 'you.'])) == [('thank you', ['Thank You'])]
+
+
+def test_partial_phrase_falls_back_to_words(fake_index):
+    resolver = SignResolver(fake_index(NAMES))
+    # "do" starts a phrase, but "go" doesn't continue one
+    assert names(resolver.resolve(['do', 'go'])) == [('do', ['Do']), ('go', ['Go'])]
+    assert names(resolver.resolve(['you', 'do'])) == [('you', ['You']), ('do', ['Do'])]
+
+
+def test_fingerspelling_unknown_words(fake_index):
+    resolver = SignResolver(fake_index(NAMES))
+    (word,) = resolver.resolve(['cab!'])
+    assert [clip.name for clip in word.clips] == ['C', 'A', 'B']
+    assert word.missing == ()
+
+    (word,) = resolver.resolve(['dab'])
+    assert [clip.name for clip in word.clips] == ['A', 'B']
+    assert word.missing == ('D',)
+
+    (word,) = resolver.resolve(['cab'], fingerspell=False)
+    assert word.clips == ()
+
+
+def test_cache_and_index_refresh(fake_index):
+    index = fake_index(NAMES)
+    resolver = SignResolver(index)
+    resolver.resolve(['do', 'not', 'go'])
+    resolver.resolve(['do', 'not', 'go'])
+    assert resolver.stats()['hits'] == 1
+
+    # A new index version rebuilds the phrase trie and drops cached results
+    index.set_clips([name for name in NAMES if name != 'Do Not Go'])
+    index.version += 1
+    assert names(resolver.resolve(['do', 'not', 'go'])) == [('do not', ['Do Not']), ('go', ['Go'])]
@@ -0,0 +1,58 @@
+import numpy as np
+from A2SL.ring_buffer import AudioRingBuffer
+
+
+def frames(start, count, channels=1):
+    return np.arange(start, start + count, dtype=np.float32).repeat(channels).reshape(count, channels)
+
+
+def test_write_peek_consume():
+    ring = AudioRingBuffer(8)
+    assert ring.write(frames(0, 3))
+    assert ring.write(frames(3, 2))
+    assert ring.available() == 5
+    np.testing.assert_array_equal(ring.peek(4), frames(0, 4))
+
+    ring.consume(3)
+    assert ring.available() == 2
+    np.testing.assert_array_equal(ring.peek(10), frames(3, 2))
+    # Consuming more than is there only releases what is
+    ring.consume(10)
+    assert ring.available() == 0
+    assert len(ring.peek(1)) == 0
+
+
+def test_unread_frames_stay_contiguous_across_the_wrap():
+    ring = AudioRingBuffer(8, channels=2)
+    position = 0
+    # Blocks of 5 wrap the 8-frame buffer at a different offset every time
+    for _ in range(20):
+        assert ring.write(frames(position, 5, channels=2))
+        view = ring.peek(5)
+        assert view.flags['C_CONTIGUOUS']
+        np.testing.assert_array_equal(view, frames(position, 5, channels=2))
+        ring.consume(5)
+        position += 5
+    assert (ring.write_position, ring.read_position) == (100, 100)
+
+    # A full buffer that starts mid-way reads back as one view
+    ring.write(frames(100, 3, channels=2))
+    ring.consume(3)
+    assert ring.write(frames(103, 8, channels=2))
+    np.testing.assert_array_equal(ring.peek(8), frames(103, 8, channels=2))
+
+
+def test_overflow_drops_whole_incoming_blocks():
+    ring = AudioRingBuffer(8)
+    assert ring.write(frames(0, 6))
+    assert not ring.write(frames(6, 3))
+    assert not ring.write(frames(9, 9))
+    assert (ring.overflow_blocks, ring.overflow_frames) == (2, 12)
+
+    # The unread audio is untouched and space frees up as it is consumed
+    np.testing.assert_array_equal(ring.peek(8), frames(0, 6))
+    assert ring.write(frames(18, 2))
+    ring.consume(4)
+    assert ring.write(frames(20, 4))
+    np.testing.assert_array_equal(ring.peek(8), np.concatenate([frames(4, 2), frames(18, 6)]))
+    assert ring.overflow_blocks == 2
@@ -0,0 +1,121 @@
+import os
+import numpy as np
+from A2SL.segmentation import UtteranceSegmenter
+from evaluate_segmentation import find_fixtures, read_wav, read_labels, segment_stream, segment_fixed, score
+from synthetic_audio import SAMPLE_RATE, voiced_tone
+
+
+def voiced(seconds, rng, amplitude=0.1):
+    """A speech-like word: harmonic series at ~140 Hz with a smooth envelope."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * voiced_tone(seconds, rng.uniform(120, 160)) * np.sin(np.pi * t / seconds)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE))
+
+
+def phrase(words, rng, gap_seconds=0.12):
+    parts = []
+    for i in range(words):
+        if i:
+            parts.append(silence(gap_seconds))
+        parts.append(voiced(0.33, rng))
+    return np.concatenate(parts)
+
+
+def with_noise(samples, rng):
+    return (samples + 0.002 * rng.standard_normal(len(samples))).astype(np.float32)
+
+
+def stream(segmenter, samples, block=1024):
+    """Feed samples in capture-sized blocks, like audio_capture and evaluate_segmentation."""
+    utterances = []
+    for end in range(block, len(samples) + block, block):
+        offset = segmenter.keep_from()
+        utterances += segmenter.feed(samples[offset:end], offset)
+    return utterances + segmenter.flush()
+
+
+def test_pause_ends_utterance():
+    rng = np.random.default_rng(1)
+    first, second = phrase(4, rng), phrase(3, rng)
+    samples = with_noise(np.concatenate([silence(1.0), first, silence(1.0), second, silence(1.0)]), rng)
+    first_start = SAMPLE_RATE
+    first_end = first_start + len(first)
+    second_start = first_end + SAMPLE_RATE
+    second_end = second_start + len(second)
+
+    utterances = stream(UtteranceSegmenter(SAMPLE_RATE), samples)
+
+    assert len(utterances) == 2
+    (start1, end1), (start2, end2) = utterances
+    # Pre-roll and tail keep a little audio around the speech, never the whole pause
+    assert first_start - 0.3 * SAMPLE_RATE <= start1 <= first_start
+    assert first_end <= end1 <= first_end + 0.3 * SAMPLE_RATE
+    assert second_start - 0.3 * SAMPLE_RATE <= start2 <= second_start
+    assert second_end <= end2 <= second_end + 0.3 * SAMPLE_RATE
+
+
+def test_short_gaps_do_not_end_utterance():
+    rng = np.random.default_rng(2)
+    samples = with_noise(np.concatenate([silence(1.0), phrase(8, rng, gap_seconds=0.2), silence(1.0)]), rng)
+
+    assert len(stream(UtteranceSegmenter(SAMPLE_RATE), samples)) == 1
+
+
+def test_long_utterance_split_at_pause():
+    rng = np.random.default_rng(3)
+    speech = phrase(30, rng)
+    samples = with_noise(np.concatenate([silence(1.0), speech, silence(1.0)]), rng)
+    segmenter = UtteranceSegmenter(SAMPLE_RATE, max_utterance_seconds=5.0)
+
+    utterances = stream(segmenter, samples)
+
+    assert len(utterances) >= 3
+    for start, end in utterances:
+        assert end - start <= segmenter.max_samples
+    # Consecutive pieces join up, and every split falls in a gap between words
+    word_period = int(0.33 * SAMPLE_RATE) + int(0.12 * SAMPLE_RATE)
+    for (_, cut), (start, _) in zip(utterances, utterances[1:]):
+        assert cut == start
+        assert (cut - SAMPLE_RATE) % word_period >= int(0.33 * SAMPLE_RATE)
+
+
+def test_feeding_across_calls_matches_one_feed():
+    rng = np.random.default_rng(4)
+    samples = with_noise(np.concatenate([
+        silence(1.0), phrase(5, rng), silence(0.8), phrase(2, rng), silence(1.5), phrase(6, rng), silence(0.5),
+    ]), rng)
+
+    whole = UtteranceSegmenter(SAMPLE_RATE)
+    expected = whole.feed(samples, 0) + whole.flush()
+    assert len(expected) == 3
+    # The noise floor is updated once per feed, so a boundary may move by a frame or two
+    tolerance = 2 * whole.hop_length
+    for block in (160, 1024, 4000):
+        utterances = stream(UtteranceSegmenter(SAMPLE_RATE), samples, block)
+        assert len(utterances) == len(expected)
+        for (start, end), (expected_start, expected_end) in zip(utterances, expected):
+            assert abs(start - expected_start) <= tolerance
+            assert abs(end - expected_end) <= tolerance
+
+
+def test_silence_and_noise_produce_nothing():
+    rng = np.random.default_rng(5)
+    samples = with_noise(silence(5.0), rng)
+
+    assert stream(UtteranceSegmenter(SAMPLE_RATE), samples) == []
+
+
+def test_committed_fixture_beats_fixed_chunks():
+    fixtures = find_fixtures(os.path.join(os.path.dirname(__file__), '..', 'segmentation_fixtures'))
+    assert fixtures
+    for path, label_path in fixtures:
+        samples, sample_rate = read_wav(path)
+        speech = read_labels(label_path, sample_rate, len(samples))
+        segmented = score(segment_stream(samples, sample_rate), speech)
+        fixed = score(segment_fixed(samples, sample_rate), speech)
+        assert segmented['hit_samples'] == segmented['speech_samples']
+        assert segmented['cuts_in_speech'] < fixed['cuts_in_speech']
+        assert segmented['bytes'] < fixed['bytes']
@@ -0,0 +1,45 @@
+import json
+import os
+from A2SL import sprite
+from A2SL.clip_index import Clip
+from A2SL.sprite import FingerspellSprite, build_sprite
+
+DURATIONS = {'A': 1.0, 'B': 1.25, 'C': 0.5, '1': 2.0}
+
+
+class LetterIndex:
+    def lookup(self, word):
+        if word not in DURATIONS:
+            return None
+        return Clip(word, 'assets', f'/clips/{word}.mp4', f'/clip/assets/{word}.mp4')
+
+
+def test_build_sprite(tmp_path, monkeypatch):
+    joined = []
+
+    def concat_clips(paths, output_path):
+        joined.append(paths)
+        with open(output_path, 'wb') as f:
+            f.write(b'sprite')
+        return False
+
+    monkeypatch.setattr(sprite, 'concat_clips', concat_clips)
+    monkeypatch.setattr(sprite, 'read_duration', lambda path: DURATIONS[os.path.basename(path)[:-4]])
+
+    table = build_sprite(LetterIndex(), str(tmp_path))
+
+    # Letters, then digits; characters without a clip are left out
+    assert joined == [['/clips/A.mp4', '/clips/B.mp4', '/clips/C.mp4', '/clips/1.mp4']]
+    assert table['segments'] == {'A': (0.0, 1.0), 'B': (1.0, 2.25), 'C': (2.25, 2.75), '1': (2.75, 4.75)}
+    assert table['duration'] == 4.75
+    assert table['url'].startswith('/clip/sprites/') and table['url'].endswith('/fingerspell.mp4')
+    assert (tmp_path / 'fingerspell.mp4').read_bytes() == b'sprite'
+    assert json.loads((tmp_path / 'fingerspell.json').read_text())['url'] == table['url']
+
+    loaded = FingerspellSprite.load(str(tmp_path))
+    assert loaded.spell('cab1') == ((2.25, 2.75), (0.0, 1.0), (1.0, 2.25), (2.75, 4.75))
+    assert loaded.spell('abz') is None
+
+
+def test_missing_sprite(tmp_path):
+    assert FingerspellSprite.load(str(tmp_path)) is None
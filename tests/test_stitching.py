@@ -0,0 +1,146 @@
+import os
+import threading
+import pytest
+from A2SL import stitching
+from A2SL.clip_index import Clip
+from A2SL.mp4 import VideoFormat
+
+HD = VideoFormat('avc1', 1280, 720, 500000, 66, 31, b'hd')
+HD_OTHER_ENCODER = VideoFormat('avc1', 1280, 720, 1000000, 66, 32, b'hd2')
+SMALL = VideoFormat('avc1', 960, 540, 1000000, 66, 31, b'small')
+
+
+@pytest.fixture
+def ffmpeg(monkeypatch):
+    """Record ffmpeg commands instead of running them; clip formats come from ``formats``."""
+    commands = []
+    formats = {}
+    monkeypatch.setattr(stitching, 'read_video_format', lambda path: formats[path.rsplit('/', 1)[-1]])
+    monkeypatch.setattr(stitching, '_run_ffmpeg', commands.append)
+    return commands, formats
+
+
+def test_matching_clips_are_stream_copied(ffmpeg):
+    commands, formats = ffmpeg
+    formats.update({'Hello.mp4': HD, 'World.mp4': HD})
+
+    assert stitching.concat_clips(['/clips/Hello.mp4', '/clips/World.mp4'], '/tmp/out.mp4') is False
+    (cmd,) = commands
+    assert cmd[cmd.index('-c') + 1] == 'copy'
+    assert cmd[cmd.index('-f') + 1] == 'concat'
+
+
+@pytest.mark.parametrize('other', [SMALL, HD_OTHER_ENCODER])
+def test_mismatched_clips_are_reencoded_to_the_common_format(ffmpeg, other):
+    commands, formats = ffmpeg
+    formats.update({'Hello.mp4': HD, 'L.mp4': other, 'World.mp4': HD})
+
+    assert stitching.concat_clips(['/clips/Hello.mp4', '/clips/L.mp4', '/clips/World.mp4'], '/tmp/out.mp4') is True
+    (cmd,) = commands
+    assert '-c' not in cmd
+    assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i'] == ['/clips/Hello.mp4', '/clips/L.mp4', '/clips/World.mp4']
+    graph = cmd[cmd.index('-filter_complex') + 1]
+    assert graph.count('scale=1280:720') == 3
+    assert graph.endswith('[v0][v1][v2]concat=n=3:v=1:a=0[out]')
+    assert cmd[cmd.index('-video_track_timescale') + 1] == '500000'
+    assert cmd[cmd.index('-profile:v') + 1] == 'baseline'
+    assert cmd[cmd.index('-level') + 1] == '3.1'
+
+
+def clips(*names):
+    return [Clip(name, 'assets', f'/clips/{name}.mp4', f'/clip/{name}.mp4') for name in names]
+
+
+@pytest.fixture
+def concat(monkeypatch):
+    """Replace concat_clips with one that writes the clip names and can be held mid-build."""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+    release.set()
+
+    def concat_clips(paths, output_path):
+        calls.append(paths)
+        started.set()
+        release.wait(5)
+        with open(output_path, 'w') as f:
+            f.write(' '.join(paths))
+        return False
+
+    monkeypatch.setattr(stitching, 'concat_clips', concat_clips)
+    return calls, started, release
+
+
+def test_concurrent_requests_share_one_build(tmp_path, concat):
+    calls, started, release = concat
+    cache = stitching.SentenceVideoCache(str(tmp_path))
+    sentence = clips('Hello', 'World')
+    release.clear()
+    paths = []
+    threads = [threading.Thread(target=lambda: paths.append(cache.get(sentence))) for _ in range(4)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [['/clips/Hello.mp4', '/clips/World.mp4']]
+    assert len(set(paths)) == 1 and len(paths) == 4
+    assert open(paths[0]).read() == '/clips/Hello.mp4 /clips/World.mp4'
+    assert (cache.builds, cache.hits) == (1, 3)
+    assert os.listdir(tmp_path) == [os.path.basename(paths[0])]
+
+
+def test_key_depends_on_clip_order():
+    key = stitching.SentenceVideoCache.key
+    assert key(clips('Hello', 'World')) == key(clips('Hello', 'World'))
+    assert key(clips('Hello', 'World')) != key(clips('World', 'Hello'))
+    assert key(clips('A', 'BC')) != key(clips('AB', 'C'))
+
+
+def test_builds_beyond_max_builds_are_refused(tmp_path, concat):
+    calls, started, release = concat
+    cache = stitching.SentenceVideoCache(str(tmp_path), max_builds=1)
+    release.clear()
+    thread = threading.Thread(target=cache.get, args=(clips('Hello'),))
+    thread.start()
+    assert started.wait(5)
+
+    with pytest.raises(stitching.StitchingBusy):
+        cache.get(clips('World'))
+    release.set()
+    thread.join(5)
+
+    assert cache.stats()['rejected'] == 1
+    # The slot is free again once the first build is done
+    assert os.path.exists(cache.get(clips('World')))
+
+
+def test_failed_build_leaves_nothing_behind(tmp_path, monkeypatch):
+    def concat_clips(paths, output_path):
+        open(output_path, 'w').close()
+        raise RuntimeError("ffmpeg failed")
+
+    monkeypatch.setattr(stitching, 'concat_clips', concat_clips)
+    cache = stitching.SentenceVideoCache(str(tmp_path), max_builds=1)
+    with pytest.raises(RuntimeError):
+        cache.get(clips('Hello'))
+
+    assert os.listdir(tmp_path) == []
+    assert cache._build_slots.acquire(blocking=False)
+
+
+def test_least_recently_used_videos_are_evicted(tmp_path, concat):
+    cache = stitching.SentenceVideoCache(str(tmp_path), max_bytes=40)
+    first = cache.get(clips('Hello'))
+    second = cache.get(clips('World'))
+    os.utime(first, (1, 1))
+    os.utime(second, (2, 2))
+    # Using the first video again makes the second the oldest
+    assert cache.get(clips('Hello')) == first
+    cache.get(clips('Thanks'))
+
+    assert os.path.exists(first)
+    assert not os.path.exists(second)
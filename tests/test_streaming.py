@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from A2SL import streaming
+from A2SL.resolver import SignResolver
+from A2SL.streaming import SAMPLE_RATE, StreamingSession
+
+
+@pytest.fixture
+def session(monkeypatch, fake_index):
+    resolver = SignResolver(fake_index(['Hello', 'World', 'Thank You']))
+    monkeypatch.setattr(streaming, 'get_resolver', lambda: resolver)
+    return StreamingSession(step_seconds=0.5, max_window_seconds=10.0)
+
+
+def pcm(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype='<i2').tobytes()
+
+
+def timed(*words):
+    """Hypothesis with one word every half second from the start of the window."""
+    return [{'word': word, 'start': 0.5 * i, 'end': 0.5 * i + 0.4} for i, word in enumerate(words)]
+
+
+def decode(session, *words, final=False):
+    samples, prompt, final = session.start_decode(final)
+    return session.finish_decode(samples, timed(*words), final)
+
+
+def stable(messages):
+    return [word for message in messages if message['stable'] for word in message['words']]
+
+
+def test_only_the_agreed_prefix_is_committed(session):
+    session.add(pcm(1.0))
+    messages = decode(session, 'Hello', 'word')
+    assert stable(messages) == []
+    assert messages == [{'words': ['Hello', 'Word'], 'videos': ['/clip/Hello.mp4', ''], 'stable': False}]
+
+    session.add(pcm(1.0))
+    # Agrees on "hello" (despite case and punctuation) but not on what follows
+    messages = decode(session, 'hello,', 'world', 'thank')
+    assert stable(messages) == ['Hello']
+    assert messages[-1] == {'words': ['World', 'Thank'], 'videos': ['/clip/World.mp4', ''], 'stable': False}
+    assert session.stable_words == ['hello,']
+    # The next window starts after the committed word
+    assert len(session.window) == 2 * SAMPLE_RATE - int(0.4 * SAMPLE_RATE)
+
+
+def test_committed_words_are_never_retracted(session):
+    session.add(pcm(1.0))
+    decode(session, 'hello', 'world')
+    session.add(pcm(1.0))
+    decode(session, 'hello', 'world', 'thank')
+    assert session.stable_words == ['hello', 'world']
+
+    # Later decodes only see audio after the stable words, which go in as the prompt
+    session.add(pcm(1.0))
+    _, prompt, _ = session.start_decode()
+    assert prompt == 'hello world'
+    messages = session.finish_decode(session.window, timed('think', 'you'), False)
+    assert stable(messages) == []
+    assert session.stable_words == ['hello', 'world']
+
+    session.add(pcm(1.0))
+    messages = decode(session, 'thank', 'you')
+    assert stable(messages) == []
+    messages = decode(session, 'thank', 'you')
+    assert stable(messages) == ['Thank you']
+    assert session.stable_words == ['hello', 'world', 'thank', 'you']
+
+
+def test_final_flush_commits_the_tail(session):
+    session.add(pcm(1.0))
+    decode(session, 'hello', 'world')
+    session.add(pcm(1.0))
+    messages = decode(session, 'world', 'thank', 'you', final=True)
+
+    assert messages == [{'words': ['World', 'Thank you'], 'videos': ['/clip/World.mp4', '/clip/Thank You.mp4'], 'stable': True}]
+    assert session.stable_words == ['world', 'thank', 'you']
+    assert session.previous == []
+    assert len(session.window) == 0
+
+
+def test_full_window_is_committed(session):
+    session.add(pcm(10.0))
+    samples, _, final = session.start_decode()
+    assert final
+    assert stable(session.finish_decode(samples, timed('hello'), final)) == ['Hello']
+
+
+def test_backlog_limit_drops_blocks():
+    session = StreamingSession(max_backlog_seconds=1.0)
+    assert session.add(pcm(0.75))
+    assert not session.add(pcm(0.5))
+    assert session.dropped_samples == SAMPLE_RATE // 2
+    assert len(session.window) == int(0.75 * SAMPLE_RATE)
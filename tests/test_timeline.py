@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from A2SL.resolver import SignResolver
+from A2SL.timeline import build_timeline
+from A2SL.vad import trim_silence
+from synthetic_audio import voiced_tone
+
+
+class FakeManifest:
+    by_url = {'/clip/Hello.mp4': {'duration': 1.292}}
+
+
+def timed(*words):
+    return [{'word': word, 'start': start, 'end': end} for word, start, end in words]
+
+
+def test_words_map_to_clips(fake_index):
+    resolver = SignResolver(fake_index(['Hello', 'World']))
+    words = timed(('Hello,', 0.5, 0.9), ('big', 1.0, 1.2), ('world.', 1.25, 1.7))
+
+    assert build_timeline(words, resolver) == [
+        {'word': 'Hello', 'clip': '/clip/Hello.mp4', 't_start': 0.5, 't_end': 0.9},
+        {'word': 'Big', 'clip': '', 't_start': 1.0, 't_end': 1.2},
+        {'word': 'World', 'clip': '/clip/World.mp4', 't_start': 1.25, 't_end': 1.7},
+    ]
+
+
+def test_phrase_spans_its_words(fake_index):
+    resolver = SignResolver(fake_index(['Thank You', 'Hello']))
+    # Stray punctuation from the decoder gets no entry and doesn't shift the words after it
+    words = timed(('Hello', 0.1, 0.4), ('-', 0.4, 0.45), ('thank', 0.5, 0.7), ('you', 0.72, 0.9123))
+
+    timeline = build_timeline(words, resolver, FakeManifest())
+
+    assert timeline == [
+        {'word': 'Hello', 'clip': '/clip/Hello.mp4', 't_start': 0.1, 't_end': 0.4, 'clip_duration': 1.292},
+        {'word': 'Thank you', 'clip': '/clip/Thank You.mp4', 't_start': 0.5, 't_end': 0.912, 'clip_duration': None},
+    ]
+
+
+def test_vad_offset_is_added_back(monkeypatch):
+    transcribe = pytest.importorskip('A2SL.transcribe', exc_type=ImportError)
+    sample_rate = 16000
+    tone = 0.1 * voiced_tone(1.0, sample_rate=sample_rate)
+    samples = np.concatenate([np.zeros(2 * sample_rate), tone, np.zeros(sample_rate)]).astype(np.float32)
+    samples += 0.002 * np.random.default_rng(0).standard_normal(len(samples)).astype(np.float32)
+
+    class FakeModel:
+        def transcribe(self, audio, **options):
+            self.seconds = len(audio) / sample_rate
+            return {'segments': [{'words': [{'word': ' Hello', 'start': 0.2, 'end': 0.8}]}]}
+
+    model = FakeModel()
+    monkeypatch.setattr(transcribe, 'get_model', lambda: model)
+    monkeypatch.setattr(transcribe, '_vad_enabled', lambda: True)
+
+    (word,) = transcribe.transcribe_words(samples, vad=True)
+
+    # The model only saw the trimmed audio; timestamps count from the original start
+    _, info = trim_silence(samples, sample_rate)
+    assert 1.7 <= info['start'] <= 2.0
+    assert model.seconds == pytest.approx(info['end'] - info['start'])
+    assert word == {'word': 'Hello', 'start': pytest.approx(0.2 + info['start']), 'end': pytest.approx(0.8 + info['start'])}
@@ -0,0 +1,110 @@
+import json
+import os
+import time
+import numpy as np
+from A2SL.transcription_cache import TranscriptionCache
+
+OPTIONS = {'language': 'en', 'word_timestamps': True}
+
+
+def audio(seed=0, seconds=0.5):
+    return (0.1 * np.random.default_rng(seed).standard_normal(int(seconds * 16000))).astype(np.float32)
+
+
+def entry(key, text):
+    return {'key': key, 'text': text}
+
+
+def test_key_covers_audio_model_and_options():
+    samples = audio()
+    key = TranscriptionCache.make_key(samples, 'base.en', OPTIONS)
+
+    assert key == TranscriptionCache.make_key(samples.copy(), 'base.en', dict(reversed(OPTIONS.items())))
+    assert key != TranscriptionCache.make_key(audio(seed=1), 'base.en', OPTIONS)
+    assert key != TranscriptionCache.make_key(samples, 'small.en', OPTIONS)
+    assert key != TranscriptionCache.make_key(samples, 'base.en', {**OPTIONS, 'language': 'de'})
+    assert key != TranscriptionCache.make_key(samples[:-1], 'base.en', OPTIONS)
+
+
+def test_key_ignores_differences_below_int16():
+    steps = np.random.default_rng(0).integers(-3000, 3000, 8000)
+    samples = ((steps + 0.25) / 32767).astype(np.float32)
+    nudged = ((steps + 0.5) / 32767).astype(np.float32)
+    # Out-of-range samples clip to full scale either way
+    clipped = samples.copy()
+    clipped[0] = 1.0
+    louder = samples.copy()
+    louder[0] = 3.0
+
+    assert TranscriptionCache.make_key(nudged, 'base.en', OPTIONS) == TranscriptionCache.make_key(samples, 'base.en', OPTIONS)
+    assert TranscriptionCache.make_key(louder, 'base.en', OPTIONS) == TranscriptionCache.make_key(clipped, 'base.en', OPTIONS)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TranscriptionCache(max_entries=2)
+    cache.put('a', entry('a', 'one'))
+    cache.put('b', entry('b', 'two'))
+    assert cache.get('a') == entry('a', 'one')
+
+    # "b" is now the least recently used
+    cache.put('c', entry('c', 'three'))
+    assert cache.get('b') is None
+    assert cache.get('a') == entry('a', 'one')
+    assert cache.get('c') == entry('c', 'three')
+
+    stats = cache.stats()
+    assert stats['memory_entries'] == 2
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (3, 0, 1)
+    assert stats['hit_rate'] == 0.75
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    TranscriptionCache(directory=str(tmp_path)).put('a', entry('a', 'one'))
+
+    cache = TranscriptionCache(directory=str(tmp_path))
+    assert cache.get('a') == entry('a', 'one')
+    assert cache.get('a') == entry('a', 'one')
+    assert (cache.stats()['disk_hits'], cache.stats()['memory_hits']) == (1, 1)
+
+
+def test_disk_size_accounting(tmp_path):
+    cache = TranscriptionCache(directory=str(tmp_path))
+    cache.put('a', entry('a', 'one'))
+    cache.put('b', entry('b', 'two'))
+    # Rewriting an entry replaces its size
+    cache.put('a', entry('a', 'one, longer'))
+
+    on_disk = sum(os.path.getsize(path) for path in tmp_path.iterdir())
+    assert cache.stats()['disk_bytes'] == on_disk
+    assert TranscriptionCache(directory=str(tmp_path)).stats()['disk_bytes'] == on_disk
+    assert not [path for path in tmp_path.iterdir() if path.suffix != '.json']
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    size = len(json.dumps(entry('a', 'one')))
+    cache = TranscriptionCache(max_entries=1, directory=str(tmp_path), max_disk_bytes=3 * size)
+    for age, key in enumerate('abc'):
+        cache.put(key, entry(key, 'one'))
+        # Entries written or read earlier have older modification times
+        stamp = time.time() - 100 + age
+        os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+
+    # Reading "a" from disk makes it the most recently used
+    assert cache.get('a') == entry('a', 'one')
+    # Going over the limit trims the tier to 90% of it, oldest entries first
+    cache.put('d', entry('d', 'one'))
+
+    assert sorted(path.stem for path in tmp_path.iterdir()) == ['a', 'd']
+    assert cache.stats()['disk_bytes'] == 2 * size
+
+
+def test_expired_disk_entries_are_removed(tmp_path):
+    cache = TranscriptionCache(max_entries=1, directory=str(tmp_path), ttl_seconds=60)
+    cache.put('a', entry('a', 'one'))
+    cache.put('b', entry('b', 'two'))
+    stale = time.time() - 120
+    os.utime(tmp_path / 'a.json', (stale, stale))
+
+    assert cache.get('a') is None
+    assert not (tmp_path / 'a.json').exists()
+    assert cache.stats()['disk_bytes'] == os.path.getsize(tmp_path / 'b.json')
@@ -0,0 +1,75 @@
+import numpy as np
+from A2SL.vad import SAMPLE_RATE, HOP_SECONDS, frame_signal, frame_features, speech_frames, trim_silence
+from synthetic_audio import voiced_tone
+
+
+def voiced(seconds, f0=140.0, amplitude=0.1):
+    return (amplitude * voiced_tone(seconds, f0, sample_rate=SAMPLE_RATE)).astype(np.float32)
+
+
+def noise(seconds, level=0.002, seed=0):
+    return (level * np.random.default_rng(seed).standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+
+
+def test_frame_signal_shape_and_padding():
+    frames = frame_signal(np.arange(1000, dtype=np.float32), 400, 160)
+    assert frames.shape == (4, 400)
+    assert frames[1, 0] == 160
+
+    short = frame_signal(np.ones(100, dtype=np.float32), 400, 160)
+    assert short.shape == (1, 400)
+    assert short[0, 99] == 1 and short[0, 100] == 0
+
+
+def test_voiced_frames_are_speech_and_silence_is_not():
+    samples = np.concatenate([noise(1.0, seed=1), voiced(1.0) + noise(1.0, seed=2), noise(1.0, seed=3)])
+    speech = speech_frames(frame_features(samples), hangover_frames=0)
+
+    frames_per_second = round(1 / HOP_SECONDS)
+    assert not speech[:frames_per_second - 5].any()
+    assert speech[frames_per_second + 5:2 * frames_per_second - 5].all()
+    assert not speech[2 * frames_per_second + 5:].any()
+
+
+def test_white_noise_is_not_speech():
+    # Loud, but spectrally flat
+    samples = noise(2.0, level=0.1)
+    assert not speech_frames(frame_features(samples), hangover_frames=0).any()
+
+
+def test_speech_from_start_to_end_is_kept():
+    # No quiet frames to estimate a noise floor from
+    samples = voiced(1.0) + noise(1.0)
+    speech = speech_frames(frame_features(samples), hangover_frames=0)
+    assert speech.mean() > 0.9
+
+
+def test_hangover_extends_speech():
+    samples = np.concatenate([noise(1.0, seed=1), voiced(0.5) + noise(0.5, seed=2), noise(1.0, seed=3)])
+    features = frame_features(samples)
+    tight = speech_frames(features, hangover_frames=0)
+    padded = speech_frames(features, hangover_frames=20)
+    assert padded.sum() == tight.sum() + 40
+    assert (padded >= tight).all()
+
+
+def test_trim_silence_keeps_speech():
+    samples = np.concatenate([noise(1.5, seed=1), voiced(1.0) + noise(1.0, seed=2), noise(2.0, seed=3)])
+    trimmed, info = trim_silence(samples)
+
+    assert not info['silent']
+    # Within the hangover (0.2 s) of the speech, never inside it
+    assert 1.2 <= info['start'] <= 1.5
+    assert 2.5 <= info['end'] <= 2.8
+    assert len(trimmed) == round((info['end'] - info['start']) * SAMPLE_RATE)
+    assert abs(info['removed_seconds'] - (4.5 - len(trimmed) / SAMPLE_RATE)) < 1e-9
+
+
+def test_trim_silence_without_speech():
+    trimmed, info = trim_silence(noise(2.0))
+    assert len(trimmed) == 0
+    assert info['silent']
+    assert info['removed_seconds'] == 2.0
+
+    trimmed, info = trim_silence(np.zeros(0, dtype=np.float32))
+    assert len(trimmed) == 0 and info['silent']